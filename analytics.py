@@ -0,0 +1,138 @@
+import pandas as pd
+
+# ডেইলি কিউব: প্রতি আর্টিস্ট/দিন/প্রোডাক্ট/জব টাইপ (সাথে ফিল্টারের কলামগুলো) এক রো
+CUBE_DIMS = ['Name', 'date', 'Product', 'Job Type', 'Team', 'Shift', 'Employee Type']
+CUBE_MEASURES = ['Orders', 'Time', 'SQM']
+FILTER_COLS = ['Team', 'Shift', 'Employee Type', 'Product']
+
+
+def build_cube(df):
+    dims = [c for c in CUBE_DIMS if c in df.columns]
+    return df.groupby(dims, observed=True, dropna=False).agg(
+        Orders=('date', 'size'),
+        Time=('Time', 'sum'),
+        SQM=('SQM', 'sum')
+    ).reset_index()
+
+
+# নতুন রো এলে পুরো কিউব না বানিয়ে শুধু নতুন রো গুলোর কিউব যোগ করা
+def update_cube(cube, new_rows):
+    if new_rows.empty:
+        return cube
+    return merge_cubes([cube, build_cube(new_rows)])
+
+
+# একাধিক কিউব (যেমন কয়েক মাসের) একসাথে করা
+def merge_cubes(cubes):
+    dims = [c for c in CUBE_DIMS if c in cubes[0].columns]
+    merged = pd.concat(cubes, ignore_index=True)
+    for col in dims:
+        if isinstance(cubes[0][col].dtype, pd.CategoricalDtype):
+            merged[col] = merged[col].astype('category')
+    return merged.groupby(dims, observed=True, dropna=False)[CUBE_MEASURES].sum().reset_index()
+
+
+# সাইডবারের গ্লোবাল ফিল্টার (df_raw বা কিউব দুটোতেই চলে)
+def filter_frame(frame, start_date, end_date, selections):
+    mask = (frame['date'] >= pd.Timestamp(start_date)) & (frame['date'] <= pd.Timestamp(end_date))
+    for col, value in selections.items():
+        if value != "All":
+            mask &= (frame[col] == value)
+    return frame[mask]
+
+
+# প্রতি (Product, Job Type) এর জন্য মোট কাজ / ম্যান-ডে (একজন আর্টিস্টের একদিন)
+def man_day_avgs(cube):
+    per_day = cube.groupby(['Product', 'Job Type', 'Name', 'date'], observed=True)['Orders'].sum()
+    if per_day.empty:
+        return {}
+    totals = per_day.groupby(level=['Product', 'Job Type'], observed=True).agg(['sum', 'size'])
+    return {key: round(row['sum'] / row['size'], 2) for key, row in totals.iterrows()}
+
+
+def calculate_man_day_avg(avgs, p_name, j_type="Live Job"):
+    return avgs.get((p_name, j_type), 0.0)
+
+
+def orders_by(cube, col):
+    return cube.groupby(col, observed=True)['Orders'].sum()
+
+
+def total_orders(cube):
+    return int(cube['Orders'].sum())
+
+
+# Team & Artist Summary টেবিলের প্রোডাক্ট কাউন্ট কলাম
+PRODUCT_COUNT_COLS = {
+    'FP': 'Floorplan Queue',
+    'MRP': 'Measurement Queue',
+    'CAD': 'Autocad Queue',
+    'UA': 'Urban Angles',
+    'VanBree': 'Van Bree Media',
+}
+IDLE_MINUTES_PER_DAY = 400
+
+
+# প্রতি রো তে Rework/প্রোডাক্টের 0/1 কলাম, যাতে গ্রুপ প্রতি lambda না চালিয়ে একবারে sum করা যায়
+def _with_indicators(df, keys, extra_cols):
+    cols = list(dict.fromkeys(keys + extra_cols))
+    indicators = {'Rework': (df['Job Type'] == 'Rework').to_numpy()}
+    for col, product in PRODUCT_COUNT_COLS.items():
+        indicators[col] = (df['Product'] == product).to_numpy()
+    return df[cols].assign(**indicators)
+
+
+def team_summary(df):
+    keys = ['Team', 'Shift']
+    work = _with_indicators(df, keys, ['Name', 'Ticket ID', 'Time', 'SQM'])
+    return work.groupby(keys, observed=True).agg(
+        Present=('Name', 'nunique'),
+        Orders=('Ticket ID', 'size'),  # সব রো; Ticket ID খালি/নাম্বার না হলে (Int64 এ NA) বাদ পড়ে না
+        Time=('Time', 'sum'),
+        Rework=('Rework', 'sum'),
+        FP=('FP', 'sum'),
+        MRP=('MRP', 'sum'),
+        CAD=('CAD', 'sum'),
+        UA=('UA', 'sum'),
+        VanBree=('VanBree', 'sum'),
+        SQM=('SQM', 'sum')
+    ).reset_index()
+
+
+def artist_breakdown(df):
+    keys = ['Name', 'Team', 'Shift']
+    work = _with_indicators(df, keys, ['Ticket ID', 'Time', 'SQM', 'date'])
+    artist_brk = work.groupby(keys, observed=True).agg(
+        Order=('Ticket ID', 'size'),
+        Time=('Time', 'sum'),
+        Rework=('Rework', 'sum'),
+        FP=('FP', 'sum'),
+        MRP=('MRP', 'sum'),
+        UA=('UA', 'sum'),
+        CAD=('CAD', 'sum'),
+        VanBree=('VanBree', 'sum'),
+        SQM=('SQM', 'sum'),
+        days=('date', 'nunique')
+    ).reset_index()
+
+    artist_brk['Idle'] = ((artist_brk['days'] * IDLE_MINUTES_PER_DAY) - artist_brk['Time']).clip(lower=0)
+    return artist_brk
+
+
+# Dashboard এর কার্ড ও Overview চার্টের সব ভিউ (ফিল্টার করা কিউব থেকে)
+def dashboard_views(cube, start_date, end_date, selections):
+    cube_f = filter_frame(cube, start_date, end_date, selections)
+    return {
+        "cube": cube_f,
+        "avgs": man_day_avgs(cube_f),
+        "total": total_orders(cube_f),
+        "by_product": orders_by(cube_f, 'Product'),
+        "by_name": orders_by(cube_f, 'Name'),
+        "by_date": orders_by(cube_f, 'date'),
+        "by_shift": orders_by(cube_f, 'Shift'),
+    }
+
+
+def rt_link(ticket_id):
+    return f"https://tickets.bright-river.cc/Ticket/Display.html?id={ticket_id}"
+
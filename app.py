@@ -1,214 +1,164 @@
+import perf  # সবার আগে, যাতে বাকি ইমপোর্টের সময়ও কোল্ড স্টার্টে ধরা পড়ে
 import streamlit as st
 import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-import plotly.express as px
 from datetime import datetime
 import json
 
+import analytics
+import cache_warmer
+import data_loader
+import exporter
+import fetch_scheduler
+import filter_index
+import month_archive
+import paged_table
+import precompute
+import shortfall_writer
+import sql_backend
+import summary_index
+import tracking_rules
+import view_cache
+
+run_timer = perf.RunTimer()
+run_timer.mark("imports")
+
 # --- ১. পেজ সেটিংস ও স্মার্ট ডিজাইন ---
 st.set_page_config(page_title="Performance Analytics", layout="wide")
 
 # আধুনিক ক্লিন CSS (আপনার আগের স্টাইলটিই রাখা হয়েছে)
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap');
-    html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
-
-    /* ১. পেজ লোড হওয়ার অ্যানিমেশন (fadeInUp) */
-    @keyframes fadeInUp {
-        from { opacity: 0; transform: translateY(40px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    .main .block-container { animation: fadeInUp 0.8s ease-out; }
-
-    /* ২. প্রিমিয়াম ড্যাশবোর্ড হেডার */
-    .dashboard-header-premium {
-        background: linear-gradient(135deg, #0f172a 0%, #1e293b 100%) !important;
-        color: white !important; padding: 25px 15px !important;
-        border-radius: 12px !important; margin-bottom: 25px !important;
-        text-align: center !important; border-bottom: 4px solid #3b82f6;
-    }
-
-    /* ৩. আধুনিক কালারফুল মেট্রিক কার্ড (Dashboard) */
-    .metric-card-v3 {
-        background: white !important; padding: 15px !important;
-        border-radius: 10px !important; text-align: center !important;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05) !important;
-        transition: all 0.3s ease-in-out !important;
-        border-top: 6px solid #ccc; height: 125px;
-        display: flex; flex-direction: column; justify-content: center;
-        animation: fadeInUp 1s ease-out;
-    }
-    .metric-card-v3:hover { transform: translateY(-8px) !important; box-shadow: 0 12px 24px rgba(0, 0, 0, 0.1) !important; }
-    .metric-card-v3 small { color: #64748b !important; font-weight: 700; text-transform: uppercase; font-size: 11px; }
-    .metric-card-v3 h2 { color: #1e293b !important; font-size: 30px !important; margin: 5px 0 0 0 !important; font-weight: 800; }
-
-    /* ৪. কার্ডের জন্য কালার বর্ডার থিম */
-    .border-rework { border-top-color: #ef4444 !important; background: #fff5f5 !important; }
-    .border-fp { border-top-color: #3b82f6 !important; background: #f0f7ff !important; }
-    .border-mrp { border-top-color: #10b981 !important; background: #f0fdf4 !important; }
-    .border-cad { border-top-color: #f59e0b !important; background: #fffbeb !important; }
-    .border-ua { border-top-color: #8b5cf6 !important; background: #f5f3ff !important; }
-    .border-vb { border-top-color: #06b6d4 !important; background: #ecfeff !important; }
-    .border-total { border-top-color: #64748b !important; background: #f8fafc !important; }
-
-    /* ৫. আধুনিক গ্লাস-বক্স ট্যাব ডিজাইন */
-    [data-baseweb="tab-list"] {
-        background: rgba(241, 245, 249, 0.5) !important;
-        backdrop-filter: blur(8px); border-radius: 12px !important;
-        padding: 6px !important; gap: 10px !important;
-        border: 1px solid rgba(226, 232, 240, 0.8); margin-bottom: 20px;
-    }
-    .stTabs [data-baseweb="tab"] {
-        background-color: transparent !important; border-radius: 10px !important;
-        padding: 8px 20px !important; font-weight: 600 !important;
-        color: #64748b !important; border: none !important; transition: all 0.3s ease !important;
-    }
-    .stTabs [aria-selected="true"] {
-        background-color: white !important; color: #3b82f6 !important;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08) !important; transform: scale(1.02);
-    }
-    .stTabs [data-baseweb="tab-highlight"] { background-color: transparent !important; }
-
-    /* ৬. ছোট মেট্রিক বক্স (Artist Deep-Dive এর জন্য) */
-    .metric-box {
-        padding: 10px; border-radius: 10px; text-align: center; margin-bottom: 10px;
-        box-shadow: 2px 2px 5px rgba(0,0,0,0.05); border-left: 5px solid #ccc;
-        transition: all 0.3s ease; cursor: pointer;
-    }
-    .metric-box:hover { transform: translateY(-5px); box-shadow: 0 10px 15px rgba(0, 0, 0, 0.1); }
-    .cl-rework { background-color: #fee2e2; border-left-color: #ef4444; }
-    .cl-fp { background-color: #e0f2fe; border-left-color: #3b82f6; }
-    .cl-mrp { background-color: #dcfce7; border-left-color: #10b981; }
-    .cl-cad { background-color: #fef9c3; border-left-color: #f59e0b; }
-    .cl-ua { background-color: #f3e8ff; border-left-color: #8b5cf6; }
-    .cl-vb { background-color: #ccfbf1; border-left-color: #06b6d4; }
-    .cl-total { background-color: #f1f5f9; border-left-color: #64748b; }
-    /* সব পেজের জন্য লাইট প্রিমিয়াম হেডার */
-    .premium-header-light {
-        background: linear-gradient(90deg, #f8fafc 0%, #eff6ff 100%) !important;
-        padding: 22px 28px !important;
-        border-radius: 15px !important;
-        border-left: 8px solid #3b82f6 !important;
-        margin-bottom: 25px !important;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.05) !important;
-    }
-    .premium-header-light h2 {
-        color: #1e293b !important;
-        font-weight: 800 !important;
-        margin: 0 !important;
-        font-size: 26px !important;
-    }
-    .premium-header-light p {
-        color: #64748b !important;
-        margin: 5px 0 0 0 !important;
-        font-size: 14px !important;
-        font-weight: 500 !important;
-    }
-</style>
-    """, unsafe_allow_html=True)
+# CSS ফাইল static/ ফোল্ডার থেকে সার্ভ হয়: ব্রাউজার একবার নামিয়ে ক্যাশ রাখে, প্রতি রানে শুধু ছোট @import ট্যাগ যায়
+st.html('<style>@import url("app/static/style.css");</style>')
+
+# অ্যাডমিন (URL এ ?admin=<ADMIN_TOKEN>): সাইডবারে পারফরম্যান্স প্যানেল; সাথে &profile=1 দিলে এই রানের পুরো কল প্রোফাইল
+def is_admin():
+    try:
+        token = st.secrets.get("ADMIN_TOKEN")
+    except Exception:
+        return False
+    return bool(token) and st.query_params.get("admin") == token
+
+admin = is_admin()
+profile_requested = admin and bool(st.query_params.get("profile"))
+profiler = perf.Profiler().start() if profile_requested else None
+profiler_busy = profile_requested and profiler is None  # অন্য সেশনের রান তখন প্রোফাইল হচ্ছে
 
 # --- ২. ডাটা কানেকশন ফাংশনস ---
 
+# সব সেশনের জন্য একটি ক্লায়েন্ট: HTTP কানেকশন পুল (থ্রেড-সেফ) ও খোলা শিটের হ্যান্ডেল ক্যাশ সহ
 @st.cache_resource
 def get_gspread_client():
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+    import sheets_client  # gspread শুধু শিট থেকে আনতে হলেই লোড হবে (স্ন্যাপশট থাকলে লাগে না)
     creds_info = json.loads(st.secrets["JSON_KEY"])
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_info, scope)
-    return gspread.authorize(creds)
+    return sheets_client.connect(creds_info)
 
-# ডাটা লোডিং ফাংশন (তারিখের এরর এবং কলামের নামের অমিল ফিক্স করা হয়েছে)
-@st.cache_data(ttl=86400, persist="disk")
+# ডাটা লোডিং: লোকাল Arrow স্ন্যাপশট থেকে memory-map করা হয়, তাই সব প্রসেস একই কপি শেয়ার করে
 def get_data(sheet_id):
-    client = get_gspread_client()
-    spreadsheet = client.open_by_key(sheet_id)
-    df = pd.DataFrame(spreadsheet.worksheet("DATA").get_all_records())
-    
-    # কলামের নাম ক্লিন করা
-    df.columns = [c.strip() for c in df.columns]
-    
-    # জানুয়ারি শিটের "Team name" থাকলে সেটাকে "Team" করা
-    if 'Team name' in df.columns:
-        df = df.rename(columns={'Team name': 'Team'})
-
-    # তারিখ কনভার্ট করা এবং খালি রো (NaN) মুছে ফেলা
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    df = df.dropna(subset=['date']) 
-    df['date'] = df['date'].dt.date
-    
-    # নিউমেরিক কনভার্সন
-    df['Time'] = pd.to_numeric(df['Time'], errors='coerce').fillna(0)
-    df['SQM'] = pd.to_numeric(df['SQM'], errors='coerce').fillna(0)
-    
-    text_cols = ['Product', 'Job Type', 'Employee Type', 'Team', 'Name', 'Shift']
-    for col in text_cols:
-        if col in df.columns: 
-            df[col] = df[col].astype(str).str.strip()
-    return df
-
-# নতুন শিটে (Shortfall Analysis) ডাটা সেভ করার ফাংশন
-def write_to_shortfall_sheet(sheet_id, worksheet_name, data_list):
+    return data_loader.load_data(get_gspread_client, sheet_id)
+
+# ফিল্টার ইনডেক্স ও ক্যাটালগ: প্রতি ডাটা ভার্সনে একবার বানানো হয়
+@st.cache_resource(max_entries=8)
+def get_filter_index(version, _df_raw):
+    return filter_index.build_index(_df_raw)
+
+# Tracking System এর ফ্ল্যাগ (নিয়মের টেবিল থেকে): প্রতি ডাটা ভার্সনে পুরো ডাটার উপর একবারই হিসাব হয়
+@st.cache_resource(max_entries=8)
+def get_tracking_flags(version, _df_raw):
+    return tracking_rules.evaluate(_df_raw)
+
+# ডিরাইভড ভিউ (টেবিল, মেট্রিক, ট্র্যাকিং লিস্ট) এর শেয়ারড LRU ক্যাশ - সব সেশন একই ক্যাশ ব্যবহার করে
+@st.cache_resource
+def get_view_cache():
+    return view_cache.ViewCache()
+
+# একাধিক মাস: শিটগুলো একসাথে থ্রেড পুলে লোড হয়, জোড়া লাগানো ফ্রেম ভার্সন অনুযায়ী ক্যাশ থাকে
+@st.cache_resource(max_entries=4)
+def get_combined_data(version, _frames):
+    return data_loader.combine_months(_frames)
+
+def get_data_for(sources):
+    if len(sources) == 1:
+        return get_data(next(iter(sources.values())))
+    frames = data_loader.load_many(get_gspread_client, sources)
+    return get_combined_data(data_loader.combined_version(frames), frames)
+
+# ডেইলি কিউব (Name, date, Product, Job Type) - Dashboard এর সব মেট্রিক এখান থেকে
+def get_cube(sources):
+    cubes = [data_loader.load_cube(sheet_id, get_data(sheet_id)) for sheet_id in sources.values()]
+    return cubes[0] if len(cubes) == 1 else analytics.merge_cubes(cubes)
+
+# Shortfall শিটে লেখার ব্যাকগ্রাউন্ড কিউ (জার্নাল সহ, তাই API এরর হলেও এন্ট্রি হারাবে না)
+@st.cache_resource
+def get_shortfall_writer():
+    return shortfall_writer.ShortfallWriter(get_gspread_client).start()
+
+# নতুন শিটে (Shortfall Analysis) ডাটা সেভ করার ফাংশন - এক বা একাধিক রো কিউতে দেওয়া হয়
+def write_to_shortfall_sheet(sheet_id, worksheet_name, data_rows):
     try:
-        client = get_gspread_client()
-        spreadsheet = client.open_by_key(sheet_id)
-        worksheet = spreadsheet.worksheet(worksheet_name)
-        worksheet.append_row(data_list)
+        get_shortfall_writer().enqueue(sheet_id, worksheet_name, data_rows)
         return True
     except Exception as e:
         st.error(f"Error writing to sheet: {e}")
         return False
 
 # Monthly Summary ডাটা (আপনার নতুন Monthly Efficiency শিট থেকে)
-@st.cache_data(ttl=86400, persist="disk") 
 def get_summary_data():
-    client = get_gspread_client()
-    sheet_id = "1hFboFpRmst54yVUfESFAZE_UgNdBsaBAmHYA-9z5eJE" 
-    spreadsheet = client.open_by_key(sheet_id)
-    df_s = pd.DataFrame(spreadsheet.worksheet("FINAL SUMMARY").get_all_records())
-    
-    # কলামের নামগুলো ক্লিন করা (সব বড় হাতের এবং অতিরিক্ত স্পেস রিমুভ)
-    df_s.columns = [" ".join(c.split()).upper() for c in df_s.columns]
-    
-    # কলাম কনভার্ট করা
-    num_cols = [
-        'FLOORPLAN', 'MEASUREMENT', 'AUTOCAD', 'URBAN ANGLES', 'VANBREEMEDIA', 'RE_WORK', 
-        'LIVE ORDER', 'FP TIME', 'MRP TIME', 'CAD TIME', 'URBAN ANGLES TIME', 'RE_WORK TIME', 
-        'WORKING TIME', 'AVG TIME', 'FP AVG', 'MRP AVG', 'CAD AVG', 'TUESDAY TO FRIDAY AVG', 'SATURDAY TO MONDAY'
-    ]
-    for col in num_cols:
-        if col in df_s.columns:
-            df_s[col] = pd.to_numeric(df_s[col], errors='coerce').fillna(0)
-    return df_s
+    return data_loader.load_summary_data(get_gspread_client)
+
+# Monthly Summary এর (ইউজার, মাস, রোল) যোগফল ও র‍্যাঙ্ক: প্রতি সামারি ভার্সনে একবারই বানানো হয়
+@st.cache_resource(max_entries=2)
+def get_summary_index(version, _df_summary):
+    return summary_index.build_index(_df_summary)
+
+# Force Refresh: শুধু দেখা শিট গুলো, আর শুধু শিট বদলে থাকলে (modifiedTime); তখন সেই শিটের ভিউ গুলোও বাদ যায়
+def refresh_sources(sources):
+    changed = [label for label, sheet_id in sources.items()
+               if data_loader.refresh_data_if_changed(get_gspread_client, sheet_id)]
+    for label in changed:
+        get_view_cache().invalidate(data_loader.data_key(sources[label]))
+        get_gspread_client().forget(sources[label])
+    st.toast(f"Reloaded: {', '.join(changed)}" if changed else "Data is already up to date.")
+
+def refresh_summary():
+    changed = data_loader.refresh_summary_if_changed(get_gspread_client)
+    st.toast("Monthly Summary reloaded." if changed else "Monthly Summary is already up to date.")
+
+# ব্যাকগ্রাউন্ড ক্যাশ ওয়ার্মার (প্রসেস প্রতি একটি): অ্যাপ চালুর সময় ও শিফটের আগে সব শিট নতুন করে নামিয়ে রাখে
+@st.cache_resource
+def get_cache_warmer():
+    return cache_warmer.CacheWarmer(get_gspread_client).start()
 
 # --- ৩. মেইন অ্যাপ লজিক ---
 
+warmer = get_cache_warmer()
+run_timer.mark("setup")
+
 try:
     # ন্যাভিগেশন
     st.sidebar.markdown("## Navigation")
     page = st.sidebar.radio("Go to", ["Dashboard", "Monthly Summary", "Tracking System"])
+    run_timer.page = page
     st.sidebar.markdown("---")
 
         # --- ম্যানুয়াল রিফ্রেশ বাটন ---
     st.sidebar.markdown("---") # একটি ডিভাইডার লাইন
-    if st.sidebar.button("🔄 Force Refresh Data", help="Click here to get refresh Data"):
-        # ১. সব ক্যাশ ডাটা ক্লিয়ার করবে
-        st.cache_data.clear()
-        
+    force_refresh = st.sidebar.button("🔄 Force Refresh Data", help="Click here to get refresh Data")
+    if force_refresh:
+        # ১. শিট রিফ্রেশ নিচে হয় (কোন শিট দেখা হচ্ছে জানার পরে), শুধু সেই শিট গুলোর জন্য
         # ২. সেশন স্টেট ক্লিয়ার করবে (যদি ব্যবহার করে থাকেন)
         if 'raw_data' in st.session_state:
             del st.session_state.raw_data
-        
-        # ৩. অ্যাপটি নতুন করে রান করবে
-        st.rerun()
+    if warmer.last_run:
+        st.sidebar.caption(f"Data pre-loaded at {datetime.fromtimestamp(warmer.last_run):%d %b %H:%M}")
+    if warmer.last_error:
+        st.sidebar.caption(f"⚠️ Pre-load failed: {warmer.last_error}")
 
     # ডাটা লোডিং (Dashboard এবং Tracking এর জন্য)
     if page == "Dashboard" or page == "Tracking System":
         # ১. ডাটা সোর্স অপশন
         st.sidebar.markdown("##  Data Selection")
         
-        # ড্রপডাউনে একটি 'Manual Input' অপশন যোগ করা হয়েছে
-        options = ["January 2026", "December 2025", "Connect New Sheet (Manual)"]
+        # ড্রপডাউনে একটি 'Manual Input' এবং একাধিক মাস একসাথে দেখার অপশন যোগ করা হয়েছে
+        options = list(data_loader.DATA_SOURCES) + ["Combine Months", "Connect New Sheet (Manual)"]
         selected_option = st.sidebar.selectbox("Select Data Month", options)
 
         # ২. লজিক: যদি ম্যানুয়াল সিলেক্ট করা হয় তবে ইনপুট বক্স দেখাবে
@@ -219,45 +169,63 @@ try:
             if not active_sheet_id:
                 st.sidebar.info(" Please paste the Google Sheet ID above.")
                 st.stop() # আইডি না দেওয়া পর্যন্ত নিচের কোড চলবে না
+            active_sources = {selected_month: active_sheet_id}
+        elif selected_option == "Combine Months":
+            month_sel = st.sidebar.multiselect("Months to combine", list(data_loader.DATA_SOURCES), default=list(data_loader.DATA_SOURCES))
+            if not month_sel:
+                st.sidebar.info(" Please select at least one month.")
+                st.stop()
+            active_sources = {m: data_loader.DATA_SOURCES[m] for m in month_sel}
+            selected_month = " + ".join(month_sel)
         else:
             # আগের সেভ করা আইডিগুলো
-            data_sources = {
-                "January 2026": "1lQJQkXNvsdnN8pwsI4QhctS7Pk0M0D6FVklLvYKPNmc",
-                "December 2025": "1e-3jYxjPkXuxkAuSJaIJ6jXU0RT1LemY6bBQbCTX_6Y"
-            }
-            active_sheet_id = data_sources[selected_option]
+            active_sources = {selected_option: data_loader.DATA_SOURCES[selected_option]}
             selected_month = selected_option
 
         # ডাটা লোড করা
-        df_raw = get_data(active_sheet_id)
+        if force_refresh:
+            refresh_sources(active_sources)
+        df_raw = get_data_for(active_sources)
+        run_timer.mark("data_load")
+        f_index = get_filter_index(data_loader.data_version(df_raw), df_raw)
+        catalog = f_index["catalog"]
         
         st.sidebar.markdown("## Global Filters")
-        start_date = st.sidebar.date_input("Start Date", df_raw['date'].min())
-        end_date = st.sidebar.date_input("End Date", df_raw['date'].max())
+        start_date = st.sidebar.date_input("Start Date", catalog["date_min"].date())
+        end_date = st.sidebar.date_input("End Date", catalog["date_max"].date())
         
-        team_list = ["All"] + sorted(df_raw['Team'].unique().tolist())
+        team_list = ["All"] + catalog["values"]["Team"]
         team_selected = st.sidebar.selectbox("Team Name", team_list)
-        shift_selected = st.sidebar.selectbox("Shift", ["All"] + sorted(df_raw['Shift'].unique().tolist()))
+        shift_selected = st.sidebar.selectbox("Shift", ["All"] + catalog["values"]["Shift"])
         emp_type_selected = st.sidebar.selectbox("Employee Type", ["All", "Artist", "QC"])
         product_selected_global = st.sidebar.selectbox("Product Filter", ["All", "Floorplan Queue", "Measurement Queue", "Autocad Queue", "Rework", "Urban Angles", "Van Bree Media"])
 
         # ফিল্টারিং লজিক
-        mask = (df_raw['date'] >= start_date) & (df_raw['date'] <= end_date)
-        if team_selected != "All": mask &= (df_raw['Team'] == team_selected)
-        if shift_selected != "All": mask &= (df_raw['Shift'] == shift_selected)
-        if emp_type_selected != "All": mask &= (df_raw['Employee Type'] == emp_type_selected)
-        if product_selected_global != "All": mask &= (df_raw['Product'] == product_selected_global)
-        df = df_raw[mask].copy()
-
-        def calculate_man_day_avg(target_df, p_name, j_type="Live Job"):
-            subset = target_df[(target_df['Product'] == p_name) & (target_df['Job Type'] == j_type)]
-            if subset.empty: return 0.0
-            total_tasks = len(subset)
-            man_days = subset.groupby(['Name', 'date']).size().shape[0]
-            return round(total_tasks / man_days, 2) if man_days > 0 else 0.0
+        filter_sel = {"Team": team_selected, "Shift": shift_selected,
+                      "Employee Type": emp_type_selected, "Product": product_selected_global}
+        views = get_view_cache()
+        v_key = view_cache.view_key(data_loader.data_version(df_raw), start_date, end_date, filter_sel)
+        rows = views.get_or_compute(
+            "rows", v_key, lambda: filter_index.filter_positions(f_index, start_date, end_date, filter_sel))
+        df = df_raw.take(rows)
+
+        # cron জবের (precompute.py) ফলাফল এই ডাটা ভার্সনের হলে নতুন করে হিসাব না করে সেখান থেকে স্লাইস করা হয়
+        results = None
+        if len(active_sources) == 1:
+            results = precompute.load_results(next(iter(active_sources.values())), data_loader.data_version(df_raw))
+        full_range = start_date == catalog["date_min"].date() and end_date == catalog["date_max"].date()
+        # DuckDB ব্যাকএন্ড df_raw এর বদলে এই স্ন্যাপশট ফাইলগুলো সরাসরি কুয়েরি করে
+        sql_keys = [data_loader.data_key(sheet_id) for sheet_id in active_sources.values()]
+
+        def precomputed_table(name):
+            return precompute.slice_summary(results[name], full_range, filter_sel) if results is not None else None
+
+        run_timer.mark("filter")
 
     # --- ৪. ড্যাশবোর্ড পেজ (আগের সব ফিচার সহ) ---
     if page == "Dashboard":
+        import plotly.express as px  # Plotly শুধু চার্ট থাকা পেজে লোড হবে
+        import charts
         # ১. লাইট প্রিমিয়াম হেডার (Dashboard)
         st.markdown(f"""
             <div class="premium-header-light">
@@ -266,17 +234,31 @@ try:
             </div>
         """, unsafe_allow_html=True)
         
+        # ডেইলি কিউব (প্রতি ডাটা ভার্সনে একবার বানানো) থেকে সব মেট্রিক নেওয়া হবে
+        if results is not None:
+            # প্রি-কম্পিউট করা এই ডাটা ভার্সনের কিউব থেকে, আলাদা করে কিউব লোড বা ডাটা স্ক্যান লাগে না
+            dash = views.get_or_compute(
+                "dashboard", v_key, lambda: precompute.dashboard_views(results, full_range, start_date, end_date, filter_sel))
+        elif sql_backend.enabled():
+            # DuckDB ব্যাকএন্ড: পুরো ডাটার উপর মাল্টি-থ্রেড কুয়েরি (ফলাফল pandas এর মতোই)
+            dash = views.get_or_compute(
+                "dashboard", v_key, lambda: sql_backend.dashboard_views(df_raw, start_date, end_date, filter_sel, sql_keys))
+        else:
+            dash = views.get_or_compute(
+                "dashboard", v_key, lambda: analytics.dashboard_views(get_cube(active_sources), start_date, end_date, filter_sel))
+        cube_f, avgs = dash["cube"], dash["avgs"]
+
         # ২. নতুন ৭টি কালারফুল মেট্রিক কার্ড
         m1, m2, m3, m4, m5, m6, m7 = st.columns(7)
         
         dash_stats = [
-            {"label": "Rework AVG", "val": calculate_man_day_avg(df, "Floorplan Queue", "Rework"), "cls": "border-rework"},
-            {"label": "FP AVG", "val": calculate_man_day_avg(df, "Floorplan Queue", "Live Job"), "cls": "border-fp"},
-            {"label": "MRP AVG", "val": calculate_man_day_avg(df, "Measurement Queue", "Live Job"), "cls": "border-mrp"},
-            {"label": "CAD AVG", "val": calculate_man_day_avg(df, "Autocad Queue", "Live Job"), "cls": "border-cad"},
-            {"label": "UA AVG", "val": calculate_man_day_avg(df, "Urban Angles", "Live Job"), "cls": "border-ua"},
-            {"label": "Van Bree AVG", "val": calculate_man_day_avg(df, "Van Bree Media", "Live Job"), "cls": "border-vb"},
-            {"label": "Total Order", "val": len(df), "cls": "border-total"}
+            {"label": "Rework AVG", "val": analytics.calculate_man_day_avg(avgs, "Floorplan Queue", "Rework"), "cls": "border-rework"},
+            {"label": "FP AVG", "val": analytics.calculate_man_day_avg(avgs, "Floorplan Queue", "Live Job"), "cls": "border-fp"},
+            {"label": "MRP AVG", "val": analytics.calculate_man_day_avg(avgs, "Measurement Queue", "Live Job"), "cls": "border-mrp"},
+            {"label": "CAD AVG", "val": analytics.calculate_man_day_avg(avgs, "Autocad Queue", "Live Job"), "cls": "border-cad"},
+            {"label": "UA AVG", "val": analytics.calculate_man_day_avg(avgs, "Urban Angles", "Live Job"), "cls": "border-ua"},
+            {"label": "Van Bree AVG", "val": analytics.calculate_man_day_avg(avgs, "Van Bree Media", "Live Job"), "cls": "border-vb"},
+            {"label": "Total Order", "val": dash["total"], "cls": "border-total"}
         ]
         
         cols_list = [m1, m2, m3, m4, m5, m6, m7]
@@ -290,7 +272,7 @@ try:
                 """, unsafe_allow_html=True)
 
         st.markdown("<br>", unsafe_allow_html=True)
-        tab1, tab2, tab3 = st.tabs(["📉 Overview", " Team & Artist Summary", " Artist Analysis"])
+        tab1, tab2, tab3, tab4 = st.tabs(["📉 Overview", " Team & Artist Summary", " Artist Analysis", "📈 Monthly Trend"])
 
         with tab1:
             # --- প্রথম রো: প্রোডাক্ট লোড এবং লিডারবোর্ড ---
@@ -303,7 +285,8 @@ try:
                 all_specs = ["Floorplan Queue", "Measurement Queue", "Autocad Queue", "Urban Angles", "Van Bree Media", "Rework"]
                 
                 # বর্তমান ফিল্টার করা ডাটা থেকে কাউন্ট নেওয়া
-                actual_counts = df['Product'].value_counts().reset_index()
+                actual_counts = dash["by_product"].reset_index(name='count')
+                actual_counts['Product'] = actual_counts['Product'].astype(str)
                 actual_counts.columns = ['Product', 'count']
                 
                 # সব স্পেক সহ একটি বেস ডাটাফ্রেম তৈরি
@@ -337,7 +320,7 @@ try:
 
             with c4:
                 st.markdown("##### Top Performers (Rank)")
-                tops = df.groupby('Name').size().sort_values(ascending=False).head(5)
+                tops = dash["by_name"].sort_values(ascending=False).head(5)
                 
                 for i, (name, count) in enumerate(tops.items()):
                     rank_color = "#f59e0b" if i == 0 else "#94a3b8" if i == 1 else "#3b82f6"
@@ -361,19 +344,21 @@ try:
             
             with c1:
                 st.markdown("##### Production Trend (Volume over Time)")
-                trend_df = df.groupby('date').size().reset_index(name='Orders')
-                fig_trend = px.area(trend_df, x='date', y='Orders', markers=True, color_discrete_sequence=['#3b82f6'])
+                trend_df = dash["by_date"].reset_index(name='Orders')
+                fig_trend = charts.area(trend_df, x='date', y='Orders', color_discrete_sequence=['#3b82f6'])
                 fig_trend.update_layout(hovermode="x unified", plot_bgcolor='rgba(0,0,0,0)', 
                                         margin=dict(t=10, b=10, l=10, r=10), height=350)
                 st.plotly_chart(fig_trend, width="stretch")
             
             with c2:
                 st.markdown("##### Shift Distribution")
-                shift_df = df['Shift'].value_counts().reset_index()
+                shift_df = dash["by_shift"].reset_index(name='count')
                 fig_shift = px.pie(shift_df, values='count', names='Shift', hole=0.5,
                                   color_discrete_sequence=px.colors.qualitative.Pastel)
                 fig_shift.update_layout(margin=dict(t=10, b=10, l=10, r=10), height=350, showlegend=True)
                 st.plotly_chart(fig_shift, width="stretch")
+        run_timer.mark("overview_charts")
+
         with tab2:
             # --- ১. টিম সামারি টেবিল (এটি এখন শুধুমাত্র Tab 2 তে থাকবে) ---
             st.markdown("""
@@ -382,20 +367,15 @@ try:
                 </div>
             """, unsafe_allow_html=True)
             
-            team_sum = df.groupby(['Team', 'Shift']).agg(
-                Present=('Name', 'nunique'), 
-                Orders=('Ticket ID', 'count'), 
-                Time=('Time', 'sum'),
-                Rework=('Job Type', lambda x: (x == 'Rework').sum()),
-                FP=('Product', lambda x: (x == 'Floorplan Queue').sum()),
-                MRP=('Product', lambda x: (x == 'Measurement Queue').sum()),
-                CAD=('Product', lambda x: (x == 'Autocad Queue').sum()),
-                UA=('Product', lambda x: (x == 'Urban Angles').sum()),
-                VanBree=('Product', lambda x: (x == 'Van Bree Media').sum()),
-                SQM=('SQM', 'sum')
-            ).reset_index()
+            team_sum = precomputed_table("team_sum")
+            if team_sum is None and sql_backend.enabled():
+                team_sum = views.get_or_compute(
+                    "team_sum", v_key, lambda: sql_backend.team_summary(df_raw, start_date, end_date, filter_sel, sql_keys))
+            elif team_sum is None:
+                team_sum = views.get_or_compute("team_sum", v_key, lambda: analytics.team_summary(df))
             
             st.dataframe(team_sum.sort_values(by='Orders', ascending=False), width="stretch", hide_index=True)
+            exporter.download_buttons(team_sum, "team_summary", v_key)
             
             st.markdown("<br>", unsafe_allow_html=True)
             
@@ -406,33 +386,23 @@ try:
                 </div>
             """, unsafe_allow_html=True)
             
-            artist_brk = df.groupby(['Name', 'Team', 'Shift']).agg(
-                Order=('Ticket ID', 'count'), 
-                Time=('Time', 'sum'), 
-                Rework=('Job Type', lambda x: (x == 'Rework').sum()),
-                FP=('Product', lambda x: (x == 'Floorplan Queue').sum()),
-                MRP=('Product', lambda x: (x == 'Measurement Queue').sum()),
-                UA=('Product', lambda x: (x == 'Urban Angles').sum()),
-                CAD=('Product', lambda x: (x == 'Autocad Queue').sum()),
-                VanBree=('Product', lambda x: (x == 'Van Bree Media').sum()),
-                SQM=('SQM', 'sum'),
-                days=('date', 'nunique')
-            ).reset_index()
-            
-            artist_brk['Idle'] = (artist_brk['days'] * 400) - artist_brk['Time']
-            artist_brk['Idle'] = artist_brk['Idle'].apply(lambda x: max(0, x))
+            artist_brk = precomputed_table("artist_brk")
+            if artist_brk is None and sql_backend.enabled():
+                artist_brk = views.get_or_compute(
+                    "artist_brk", v_key, lambda: sql_backend.artist_breakdown(df_raw, start_date, end_date, filter_sel, sql_keys))
+            elif artist_brk is None:
+                artist_brk = views.get_or_compute("artist_brk", v_key, lambda: analytics.artist_breakdown(df))
             
-            st.dataframe(
-                artist_brk.sort_values(by='Order', ascending=False), 
-                width="stretch", 
-                hide_index=True, 
-                height=750 
-            )
+            paged_table.show(artist_brk, "artist_brk", cache=views, cache_key=v_key, sort_col='Order', ascending=False)
+            exporter.download_buttons(artist_brk, "artist_summary", v_key)
+        run_timer.mark("team_artist_tables")
 
         with tab3:
             u_names = sorted(df['Name'].unique().tolist())
             a_sel = st.selectbox("Select Artist", u_names, key="dash_artist_tab3_v2")
             a_df = df[df['Name'] == a_sel]
+            a_cube = cube_f[cube_f['Name'] == a_sel]
+            a_avgs = analytics.man_day_avgs(a_cube)
             
             st.markdown(f"####  Performance Insights: {a_sel}")
             
@@ -440,12 +410,12 @@ try:
             i1, i2, i3, i4, i5, i6, i7 = st.columns(7)
             
             # ক্যালকুলেশন
-            r_avg = calculate_man_day_avg(a_df, "Floorplan Queue", "Rework")
-            f_avg = calculate_man_day_avg(a_df, "Floorplan Queue")
-            m_avg = calculate_man_day_avg(a_df, "Measurement Queue")
-            c_avg = calculate_man_day_avg(a_df, "Autocad Queue")
-            u_avg = calculate_man_day_avg(a_df, "Urban Angles")
-            v_avg = calculate_man_day_avg(a_df, "Van Bree Media")
+            r_avg = analytics.calculate_man_day_avg(a_avgs, "Floorplan Queue", "Rework")
+            f_avg = analytics.calculate_man_day_avg(a_avgs, "Floorplan Queue")
+            m_avg = analytics.calculate_man_day_avg(a_avgs, "Measurement Queue")
+            c_avg = analytics.calculate_man_day_avg(a_avgs, "Autocad Queue")
+            u_avg = analytics.calculate_man_day_avg(a_avgs, "Urban Angles")
+            v_avg = analytics.calculate_man_day_avg(a_avgs, "Van Bree Media")
             
             i1.markdown(f'<div class="metric-box cl-rework"><small>Rework Avg</small><br><b>{r_avg}</b></div>', unsafe_allow_html=True)
             i2.markdown(f'<div class="metric-box cl-fp"><small>FP Avg</small><br><b>{f_avg}</b></div>', unsafe_allow_html=True)
@@ -453,7 +423,7 @@ try:
             i4.markdown(f'<div class="metric-box cl-cad"><small>CAD Avg</small><br><b>{c_avg}</b></div>', unsafe_allow_html=True)
             i5.markdown(f'<div class="metric-box cl-ua"><small>UA Avg</small><br><b>{u_avg}</b></div>', unsafe_allow_html=True)
             i6.markdown(f'<div class="metric-box cl-vb"><small>VB Avg</small><br><b>{v_avg}</b></div>', unsafe_allow_html=True)
-            i7.markdown(f'<div class="metric-box cl-total"><small>Total Jobs</small><br><b>{len(a_df)}</b></div>', unsafe_allow_html=True)
+            i7.markdown(f'<div class="metric-box cl-total"><small>Total Jobs</small><br><b>{analytics.total_orders(a_cube)}</b></div>', unsafe_allow_html=True)
 
             # অ্যাক্টিভিটি লগ চার্ট (পুরানো ডাটা ফেরত আনা হয়েছে)
             cll, crr = st.columns(2)
@@ -464,12 +434,12 @@ try:
                 dist_data = {
                     "Category": ["Rework", "FP", "MRP", "CAD", "UA", "VB"],
                     "Count": [
-                        len(a_df[a_df['Job Type'] == 'Rework']),
-                        len(a_df[(a_df['Product'] == 'Floorplan Queue') & (a_df['Job Type'] == 'Live Job')]),
-                        len(a_df[(a_df['Product'] == 'Measurement Queue') & (a_df['Job Type'] == 'Live Job')]),
-                        len(a_df[(a_df['Product'] == 'Autocad Queue') & (a_df['Job Type'] == 'Live Job')]),
-                        len(a_df[(a_df['Product'] == 'Urban Angles') & (a_df['Job Type'] == 'Live Job')]),
-                        len(a_df[(a_df['Product'] == 'Van Bree Media') & (a_df['Job Type'] == 'Live Job')])
+                        analytics.total_orders(a_cube[a_cube['Job Type'] == 'Rework']),
+                        analytics.total_orders(a_cube[(a_cube['Product'] == 'Floorplan Queue') & (a_cube['Job Type'] == 'Live Job')]),
+                        analytics.total_orders(a_cube[(a_cube['Product'] == 'Measurement Queue') & (a_cube['Job Type'] == 'Live Job')]),
+                        analytics.total_orders(a_cube[(a_cube['Product'] == 'Autocad Queue') & (a_cube['Job Type'] == 'Live Job')]),
+                        analytics.total_orders(a_cube[(a_cube['Product'] == 'Urban Angles') & (a_cube['Job Type'] == 'Live Job')]),
+                        analytics.total_orders(a_cube[(a_cube['Product'] == 'Van Bree Media') & (a_cube['Job Type'] == 'Live Job')])
                     ]
                 }
                 
@@ -502,11 +472,11 @@ try:
                 st.subheader("SQM vs Time Efficiency")
                 
                 # ১. ডাটা প্রিপারেশন এবং লিঙ্ক তৈরি
-                a_plot_df = a_df.copy()
+                a_plot_df = charts.thin_points(a_df, "SQM", "Time", color="Product").copy()
                 a_plot_df['RT_Link'] = a_plot_df['Ticket ID'].apply(lambda x: f"https://tickets.bright-river.cc/Ticket/Display.html?id={x}")
 
                 # ২. স্কেটার প্লট তৈরি
-                fig_s = px.scatter(
+                fig_s = charts.scatter(
                     a_plot_df, 
                     x="SQM", 
                     y="Time", 
@@ -522,6 +492,8 @@ try:
 
                 # ৩. চার্ট ডিসপ্লে (on_select="rerun" ব্যবহার করে)
                 selection = st.plotly_chart(fig_s, use_container_width=True, on_select="rerun", key="sqm_efficiency_chart")
+                if len(a_plot_df) < len(a_df):
+                    st.caption(f"Showing {len(a_plot_df):,} of {len(a_df):,} tickets (downsampled)")
 
                 # ৪. বাটন দেখানোর নিরাপদ লজিক (Error handling সহ)
                 if selection and "selection" in selection:
@@ -569,46 +541,46 @@ try:
                     display_cols.insert(idx, 'RT Link')
 
             # ডাটাফ্রেমটি ডিসপ্লে করা
-            st.dataframe(
-                log_df[display_cols].sort_values('date', ascending=False),
-                column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open")},
-                use_container_width=True, 
-                hide_index=True
+            paged_table.show(
+                log_df[display_cols], "artist_log", cache=views, cache_key=v_key + (a_sel,),
+                sort_col='date', ascending=False,
+                column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open"),
+                               "date": st.column_config.DateColumn("date")}
             )
+            exporter.download_buttons(log_df[display_cols], "artist_log", v_key + (a_sel,))
+        run_timer.mark("artist_analysis")
+
+        with tab4:
+            # বন্ধ মাসগুলো আর্কাইভ থেকে (শুধু দরকারি মাস ও কলাম), চলতি মাস লোড করা ডাটা থেকে
+            t_by = st.radio("Trend for", ["Artist", "Team"], horizontal=True, key="trend_by")
+            t_col = 'Name' if t_by == "Artist" else 'Team'
+            t_sel = st.selectbox(f"Select {t_by}", sorted(df_raw[t_col].astype(str).unique().tolist()), key="trend_sel")
+            open_frames = {label: get_data(sheet_id) for label, sheet_id in active_sources.items()
+                           if not data_loader.is_archived(sheet_id)}
+            t_key = (month_archive.version(), data_loader.combined_version(open_frames), t_col, t_sel)
+            trend = views.get_or_compute("trend", t_key, lambda: month_archive.production_trend(t_col, t_sel, open_frames))
+            if trend.empty:
+                st.info("No monthly data yet for this selection.")
+            else:
+                fig_trend = px.bar(trend, x='month', y='Orders', text='Orders', height=350,
+                                   hover_data=['MoM %', 'YoY %'], title=f"Monthly Orders: {t_sel}")
+                fig_trend.update_xaxes(type='category')
+                st.plotly_chart(fig_trend, use_container_width=True)
+                st.dataframe(trend, use_container_width=True, hide_index=True,
+                             column_config={"Time": st.column_config.NumberColumn("Time", format="%.0f")})
+        run_timer.mark("monthly_trend")
+
     # --- ৫. Monthly Summary (সম্পূর্ণ নতুন শিট থেকে) ---
     elif page == "Monthly Summary":
+        import plotly.express as px
+        if force_refresh:
+            refresh_summary()
         df_summary = get_summary_data()
-        df_summary.columns = [" ".join(c.split()).upper() for c in df_summary.columns]
-        col_role = 'ARTIST/ QC' if 'ARTIST/ QC' in df_summary.columns else 'ARTIST/QC'
+        s_index = get_summary_index(data_loader.data_version(df_summary), df_summary)
+        run_timer.mark("summary_load")
 
         # --- আধুনিক স্লিক CSS ---
-        st.markdown("""
-            <style>
-            .compact-header {
-                background: linear-gradient(90deg, #1e293b 0%, #334155 100%);
-                color: white; padding: 12px 25px; border-radius: 15px; margin-bottom: 20px;
-                display: flex; justify-content: space-between; align-items: center;
-            }
-            /* মেইন ৪টি কার্ডের জন্য স্পেশাল ডিজাইন */
-            .main-metric-card {
-                background: #ffffff; border-radius: 15px; padding: 20px;
-                border: 1px solid #e2e8f0; box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.05);
-                text-align: center; height: 170px; display: flex; flex-direction: column;
-                justify-content: center; align-items: center; transition: 0.3s;
-            }
-            .main-metric-card:hover { transform: translateY(-5px); box-shadow: 0 10px 15px rgba(0,0,0,0.05); }
-            
-            .score-circle-v2 {
-                background: #f8fafc; border-radius: 50%; width: 75px; height: 75px;
-                display: flex; align-items: center; justify-content: center;
-                border: 4px solid #3b82f6; margin-bottom: 5px; color: #1e293b;
-            }
-            .info-card-sleek {
-                padding: 10px; border-radius: 12px; text-align: center;
-                border: 1px solid rgba(0,0,0,0.05);
-            }
-            </style>
-        """, unsafe_allow_html=True)
+        st.html('<style>@import url("app/static/summary.css");</style>')
 
         # Monthly Summary-র জন্য নতুন লাইট হেডার
         st.markdown("""
@@ -623,8 +595,7 @@ try:
         with top_col1:
             st.markdown("#####  Leaderboard Analysis")
             l_type_sum = st.radio("Show Top 10 for:", ["ARTIST", "QC"], horizontal=True, key="role_top_v24")
-            top_filt = df_summary[df_summary[col_role].str.strip().str.upper() == l_type_sum]
-            top_10_df = top_filt.groupby('USER NAME ALL')['LIVE ORDER'].sum().sort_values(ascending=False).head(10).reset_index()
+            top_10_df = summary_index.leaderboard(s_index, l_type_sum)
             fig_top_bar = px.bar(top_10_df, x='LIVE ORDER', y='USER NAME ALL', orientation='h', text='LIVE ORDER', height=300, color='LIVE ORDER', color_continuous_scale='Blues')
             fig_top_bar.update_layout(showlegend=False, margin=dict(t=10, b=10), yaxis={'categoryorder':'total ascending'})
             st.plotly_chart(fig_top_bar, use_container_width=True)
@@ -632,20 +603,20 @@ try:
         with top_col2:
             st.markdown("#####  Selection & Controls")
             l_role = st.selectbox("Identify Role", ["ARTIST", "QC"], index=0 if l_type_sum=="ARTIST" else 1)
-            names_list = sorted(df_summary[df_summary[col_role].str.strip().str.upper() == l_role]['USER NAME ALL'].unique().tolist())
+            names_list = summary_index.names_for(s_index, l_role)
             a_sel = st.selectbox(f"Choose {l_role}", names_list, key="sum_a_v24")
-            m_list_all = sorted(df_summary['MONTH'].unique().tolist(), reverse=True)
+            m_list_all = s_index["months"]
             m_sel = st.multiselect("Filter Months", m_list_all, key="sum_m_v24")
 
         # ডাটা ফিল্টারিং
-        s_df = df_summary[df_summary['USER NAME ALL'] == a_sel]
-        if m_sel: s_df = s_df[s_df['MONTH'].isin(m_sel)]
+        s_sel = summary_index.lookup(s_index, a_sel, m_sel)
         
-        if not s_df.empty:
+        if s_sel is not None:
+            s_tot = s_sel["totals"]
             # ক্যালকুলেশনস
-            total_days = s_df['DAY'].sum() if s_df['DAY'].sum() > 0 else 1
-            fp_mrp_avg = (s_df['FLOORPLAN'].sum() + s_df['MEASUREMENT'].sum()) / total_days
-            daily_time_avg = s_df['WORKING TIME'].sum() / total_days
+            total_days = s_tot['DAY'] if s_tot['DAY'] > 0 else 1
+            fp_mrp_avg = (s_tot['FLOORPLAN'] + s_tot['MEASUREMENT']) / total_days
+            daily_time_avg = s_tot['WORKING TIME'] / total_days
             perf_score = min(100, int((fp_mrp_avg / 5 * 50) + (daily_time_avg / 390 * 50)))
             
             # ৩. মেইন স্কোর কার্ডস (আপনার চাহিদা অনুযায়ী আগের সেই সুন্দর স্টাইল)
@@ -662,7 +633,7 @@ try:
             with sc2:
                 st.markdown(f'''<div class="main-metric-card">
                     <small style="color:#64748b; font-weight:bold;">MONTHLY VOLUME</small>
-                    <h1 style="margin:5px 0; color:#1e293b;">{int(s_df["LIVE ORDER"].sum())}</h1>
+                    <h1 style="margin:5px 0; color:#1e293b;">{int(s_tot["LIVE ORDER"])}</h1>
                     <small style="color:#64748b;">Total Orders Completed</small>
                 </div>''', unsafe_allow_html=True)
 
@@ -685,20 +656,16 @@ try:
             k_cols = st.columns(7)
             
             # র‍্যাঙ্কিং লজিক
-            a_type = s_df[col_role].iloc[0]
-            r_base = df_summary[(df_summary['MONTH'] == m_sel[0]) & (df_summary[col_role] == a_type)] if len(m_sel) == 1 else df_summary[df_summary[col_role] == a_type]
-            r_list = r_base.groupby('USER NAME ALL')['LIVE ORDER'].sum().sort_values(ascending=False)
-            try: r_idx = r_list.index.get_loc(a_sel) + 1; r_badge = f"#{r_idx}"
-            except: r_badge = "N/A"
+            r_badge = f"#{s_sel['rank']}" if s_sel["rank"] else "N/A"
 
             kpi_data = [
                 {"label": "Rank", "val": r_badge, "cls": "cl-total"},
-                {"label": "Floorplan", "val": int(s_df["FLOORPLAN"].sum()), "cls": "cl-fp"},
-                {"label": "Measurement", "val": int(s_df["MEASUREMENT"].sum()), "cls": "cl-mrp"},
-                {"label": "AutoCAD", "val": int(s_df["AUTOCAD"].sum()), "cls": "cl-cad"},
-                {"label": "UA", "val": int(s_df["URBAN ANGLES"].sum()), "cls": "cl-ua"},
-                {"label": "VanBree", "val": int(s_df.get("VANBREEMEDIA", pd.Series([0])).sum()), "cls": "cl-vb"},
-                {"label": "Rework", "val": int(s_df["RE_WORK"].sum()), "cls": "cl-rework"}
+                {"label": "Floorplan", "val": int(s_tot["FLOORPLAN"]), "cls": "cl-fp"},
+                {"label": "Measurement", "val": int(s_tot["MEASUREMENT"]), "cls": "cl-mrp"},
+                {"label": "AutoCAD", "val": int(s_tot["AUTOCAD"]), "cls": "cl-cad"},
+                {"label": "UA", "val": int(s_tot["URBAN ANGLES"]), "cls": "cl-ua"},
+                {"label": "VanBree", "val": int(s_tot.get("VANBREEMEDIA", 0)), "cls": "cl-vb"},
+                {"label": "Rework", "val": int(s_tot["RE_WORK"]), "cls": "cl-rework"}
             ]
             for i, item in enumerate(kpi_data):
                 k_cols[i].markdown(f'<div class="info-card-sleek {item["cls"]}"><small>{item["label"]}</small><br><b>{item["val"]}</b></div>', unsafe_allow_html=True)
@@ -708,10 +675,10 @@ try:
             c_a, c_b = st.columns(2)
             spec_colors = {"FP": "#3b82f6", "MRP": "#10b981", "CAD": "#f59e0b", "UA": "#8b5cf6", "VB": "#06b6d4", "RW": "#f43f5e"}
             with c_a:
-                v_df = pd.DataFrame({"Spec": ["FP", "MRP", "CAD", "UA", "VB", "RW"], "Val": [s_df['FLOORPLAN'].sum()/total_days, s_df['MEASUREMENT'].sum()/total_days, s_df['AUTOCAD'].sum()/total_days, s_df['URBAN ANGLES'].sum()/total_days, s_df.get('VANBREEMEDIA', pd.Series([0])).sum()/total_days, s_df['RE_WORK'].sum()/total_days]})
+                v_df = pd.DataFrame({"Spec": ["FP", "MRP", "CAD", "UA", "VB", "RW"], "Val": [s_tot['FLOORPLAN']/total_days, s_tot['MEASUREMENT']/total_days, s_tot['AUTOCAD']/total_days, s_tot['URBAN ANGLES']/total_days, s_tot.get('VANBREEMEDIA', 0)/total_days, s_tot['RE_WORK']/total_days]})
                 st.plotly_chart(px.bar(v_df, x="Spec", y="Val", color="Spec", color_discrete_map=spec_colors, text_auto='.2f', height=350, title="Order Avg Distribution"), use_container_width=True)
             with c_b:
-                def get_t(t, o): return round(s_df[t].sum() / s_df[o].sum(), 2) if s_df[o].sum() > 0 else 0
+                def get_t(t, o): return round(s_tot[t] / s_tot[o], 2) if s_tot[o] > 0 else 0
                 t_df = pd.DataFrame({"Spec": ["FP", "MRP", "CAD", "UA", "RW"], "Time": [get_t('FP TIME','FLOORPLAN'), get_t('MRP TIME','MEASUREMENT'), get_t('CAD TIME','AUTOCAD'), get_t('URBAN ANGLES TIME','URBAN ANGLES'), get_t('RE_WORK TIME','RE_WORK')]})
                 st.plotly_chart(px.bar(t_df, x="Spec", y="Time", color="Spec", color_discrete_map=spec_colors, text_auto='.1f', height=350, title="Avg Processing Time (Min)"), use_container_width=True)
 
@@ -723,6 +690,7 @@ try:
                 'URBAN ANGLES TIME', 'RE_WORK TIME', 'WORKING TIME', 
                 'TUESDAY TO FRIDAY AVG', 'SATURDAY TO MONDAY', 'FP/MRP AVG'
             ]
+            s_df = summary_index.records(s_index, df_summary, a_sel, m_sel)
             available_cols = [c for c in target_cols if c in s_df.columns]
             st.dataframe(s_df[available_cols], use_container_width=True, hide_index=True)
 
@@ -738,14 +706,30 @@ try:
         """, unsafe_allow_html=True)
 
         TARGET_SHEET_ID = "1tt-y8QozVy6VU9epGW337UNn763nwu_87df6xkpadp4"
-        tdf = df.copy()
-        tdf['RT Link'] = tdf['Ticket ID'].apply(lambda x: f"https://tickets.bright-river.cc/Ticket/Display.html?id={x}")
-
-        if 'selected_ticket' not in st.session_state:
-            st.session_state.selected_ticket = None
+        if results is not None:
+            tracking = views.get_or_compute("tracking", v_key, lambda: precompute.slice_tracking(results, rows))
+        else:
+            flags = get_tracking_flags(data_loader.data_version(df_raw), df_raw)
+            tracking = views.get_or_compute("tracking", v_key, lambda: tracking_rules.tracking_lists(df_raw, flags, rows))
+        run_timer.mark("tracking_lists")
+
+        if 'selected_tickets' not in st.session_state:
+            st.session_state.selected_tickets = []
+
+        # আগের সাবমিট করা রো গুলো এখনো শিটে যাওয়ার অপেক্ষায় থাকলে বা লেখা না গেলে দেখানো
+        writer = get_shortfall_writer()
+        if writer.pending_count():
+            st.caption(f"⏳ {writer.pending_count()} row(s) waiting to be written to the Shortfall sheet.")
+        if writer.last_error:
+            st.warning(f"Shortfall sheet write failed and will be retried: {writer.last_error}")
+        if writer.dead_count():
+            st.error(f"{writer.dead_count()} row(s) could not be written to the Shortfall sheet after "
+                     f"{shortfall_writer.MAX_ATTEMPTS} attempts. They are saved in {writer.dead_path}.")
 
         t_tab1, t_tab2, t_tab3 = st.tabs([" Short In Progress", " Spending More Time", " High Time vs SQM"])
         cols_to_show = ['Ticket ID', 'RT Link', 'Name', 'Time', 'SQM', 'Floor', 'Labels', 'Product', 'Team']
+        if 'Source Month' in df.columns:
+            cols_to_show.append('Source Month')
 
         # --- ড্রপডাউন লিস্টসমূহ ---
         sip_reasons = [
@@ -773,103 +757,132 @@ try:
             "Late in office"
         ]
 
+        def shortfall_date(row):
+            return row['date'].strftime('%d-%b-%Y').lstrip('0')
+
         # --- ট্যাব ১: Short In Progress ---
         with t_tab1:
-            st.info(" Tip: Selecting a table row will automatically populate the ID in the box below.")
-            sip_mask = (((tdf['Employee Type'] == 'QC') & (tdf['Time'] < 2)) | 
-                        ((tdf['Employee Type'] == 'Artist') & (
-                            ((tdf['Product'] == 'Floorplan Queue') & (tdf['Time'] <= 15)) | 
-                            ((tdf['Product'] == 'Measurement Queue') & (tdf['Time'] < 5))
-                        )))
-            sip_df = tdf[sip_mask].copy()
+            st.info(" Tip: Selecting table rows will automatically populate the IDs in the box below. You can select several rows.")
+            sip_df = tracking["sip"]
+            sip_idx = tracking["index"]["sip"]
             
-            event = st.dataframe(sip_df[cols_to_show], column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open")},
-                                 width="stretch", hide_index=True, on_select="rerun", selection_mode="single-row")
+            picked = paged_table.show(sip_df[cols_to_show], "sip", cache=views, cache_key=v_key, selectable=True,
+                                      column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open")})
+            exporter.download_buttons(sip_df[cols_to_show], "short_in_progress", v_key)
 
-            if event and event.selection.rows:
-                st.session_state.selected_ticket = sip_df.iloc[event.selection.rows[0]]['Ticket ID']
+            if len(picked):
+                st.session_state.selected_tickets = picked['Ticket ID'].dropna().tolist()
 
             st.markdown("---")
             with st.expander(" Action: Add to Shortfall Sheet", expanded=True):
                 with st.form("sip_form"):
-                    t_list = list(sip_df['Ticket ID'].unique())
-                    default_idx = t_list.index(st.session_state.selected_ticket) if st.session_state.selected_ticket in t_list else 0
+                    t_list = sip_idx.ticket_ids
+                    default_ids = [t for t in st.session_state.selected_tickets if t in sip_idx]
                     
                     c1, c2 = st.columns([1, 2])
-                    t_id = c1.selectbox("Select Ticket ID", t_list, index=default_idx)
+                    t_ids = c1.multiselect("Select Ticket ID(s)", t_list, default=default_ids)
                     comment = c2.selectbox("Reason for Short IP", sip_reasons)
                     
                     if st.form_submit_button("Submit to Short Inprogress"):
-                        row = sip_df[sip_df['Ticket ID'] == t_id].iloc[0]
-                        # Status (index 3) খালি রাখা হয়েছে ("")
-                        formatted_date = row['date'].strftime('%d-%b-%Y').lstrip('0')
-                        data = [str(t_id), row['Name'], formatted_date, "", row['Team'], comment]
-                        if write_to_shortfall_sheet(TARGET_SHEET_ID, "Short Inprogress", data):
-                            st.success(f"Ticket #{t_id} reported successfully!")
-                            st.session_state.selected_ticket = None
+                        data = []
+                        for t_id in t_ids:
+                            row = sip_idx.row(t_id)
+                            # Status (index 3) খালি রাখা হয়েছে ("")
+                            data.append([str(t_id), row['Name'], shortfall_date(row), "", row['Team'], comment])
+                        if not data:
+                            st.warning("Please select at least one Ticket ID.")
+                        elif write_to_shortfall_sheet(TARGET_SHEET_ID, "Short Inprogress", data):
+                            st.success(f"{len(data)} ticket(s) queued for the Shortfall sheet: " + ", ".join(f"#{t}" for t in t_ids))
+                            st.session_state.selected_tickets = []
 
         # --- ট্যাব ২: Spending More Time ---
         with t_tab2:
-            smt_mask = (((tdf['Employee Type'] == 'QC') & (tdf['Time'] > 20)) | 
-                        ((tdf['Employee Type'] == 'Artist') & (
-                            ((tdf['Product'] == 'Floorplan Queue') & (tdf['Time'] >= 150)) | 
-                            ((tdf['Product'] == 'Measurement Queue') & (tdf['Time'] > 40))
-                        )))
-            smt_df = tdf[smt_mask].copy()
+            smt_df = tracking["smt"]
+            smt_idx = tracking["index"]["smt"]
             
-            event_smt = st.dataframe(smt_df[cols_to_show], column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open")},
-                                     width="stretch", hide_index=True, on_select="rerun", selection_mode="single-row")
+            picked_smt = paged_table.show(smt_df[cols_to_show], "smt", cache=views, cache_key=v_key, selectable=True,
+                                          column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open")})
+            exporter.download_buttons(smt_df[cols_to_show], "spending_more_time", v_key)
 
-            if event_smt and event_smt.selection.rows:
-                st.session_state.selected_ticket = smt_df.iloc[event_smt.selection.rows[0]]['Ticket ID']
+            if len(picked_smt):
+                st.session_state.selected_tickets = picked_smt['Ticket ID'].dropna().tolist()
 
             with st.expander(" Action: Report High Time", expanded=True):
                 with st.form("smt_form"):
-                    s_list = list(smt_df['Ticket ID'].unique())
-                    s_idx = s_list.index(st.session_state.selected_ticket) if st.session_state.selected_ticket in s_list else 0
+                    s_list = smt_idx.ticket_ids
+                    s_default = [t for t in st.session_state.selected_tickets if t in smt_idx]
                     
                     c1, c2, c3 = st.columns(3)
-                    t_id_smt = c1.selectbox("Select Ticket ID", s_list, index=s_idx)
+                    t_ids_smt = c1.multiselect("Select Ticket ID(s)", s_list, default=s_default)
                     extra_t = c2.number_input("Extra Time (Min)", min_value=0)
                     obs = c3.selectbox("Reason", smt_reasons)
                     tl_note = st.text_area("Additional Observation")
                     
                     if st.form_submit_button("Submit Analysis"):
-                        row_smt = smt_df[smt_df['Ticket ID'] == t_id_smt].iloc[0]
-                        formatted_date_smt = row_smt['date'].strftime('%d-%b-%Y').lstrip('0')
-                        data_smt = [str(t_id_smt), row_smt['Name'], formatted_date_smt, row_smt['Team'], str(row_smt['Time']), str(extra_t), f"{obs} {tl_note}".strip()]
-                        if write_to_shortfall_sheet(TARGET_SHEET_ID, "Spending More Time", data_smt):
-                            st.success(f"Analysis for Ticket #{t_id_smt} saved!")
+                        data_smt = []
+                        for t_id_smt in t_ids_smt:
+                            row_smt = smt_idx.row(t_id_smt)
+                            data_smt.append([str(t_id_smt), row_smt['Name'], shortfall_date(row_smt), row_smt['Team'], str(row_smt['Time']), str(extra_t), f"{obs} {tl_note}".strip()])
+                        if not data_smt:
+                            st.warning("Please select at least one Ticket ID.")
+                        elif write_to_shortfall_sheet(TARGET_SHEET_ID, "Spending More Time", data_smt):
+                            st.success(f"Analysis for {len(data_smt)} ticket(s) queued for the Shortfall sheet.")
 
         # --- ট্যাব ৩: High Time vs SQM ---
         with t_tab3:
-            hts_mask = (tdf['Time'] > (tdf['SQM'] + 15)) & (~smt_mask)
-            hts_df = tdf[hts_mask].copy()
+            hts_df = tracking["hts"]
+            hts_idx = tracking["index"]["hts"]
             
-            event_hts = st.dataframe(hts_df[cols_to_show], column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open")},
-                                     width="stretch", hide_index=True, on_select="rerun", selection_mode="single-row")
+            picked_hts = paged_table.show(hts_df[cols_to_show], "hts", cache=views, cache_key=v_key, selectable=True,
+                                          column_config={"RT Link": st.column_config.LinkColumn("RT", display_text="Open")})
+            exporter.download_buttons(hts_df[cols_to_show], "high_time_vs_sqm", v_key)
 
-            if event_hts and event_hts.selection.rows:
-                st.session_state.selected_ticket = hts_df.iloc[event_hts.selection.rows[0]]['Ticket ID']
+            if len(picked_hts):
+                st.session_state.selected_tickets = picked_hts['Ticket ID'].dropna().tolist()
 
             with st.expander(" Action: Report SMT (Time vs SQM)", expanded=True):
                 with st.form("hts_form"):
-                    h_list = list(hts_df['Ticket ID'].unique())
-                    h_idx = h_list.index(st.session_state.selected_ticket) if st.session_state.selected_ticket in h_list else 0
+                    h_list = hts_idx.ticket_ids
+                    h_default = [t for t in st.session_state.selected_tickets if t in hts_idx]
                     
                     ca, cb, cc = st.columns(3)
-                    t_id_hts = ca.selectbox("Select Ticket ID", h_list, index=h_idx)
+                    t_ids_hts = ca.multiselect("Select Ticket ID(s)", h_list, default=h_default)
                     e_time = cb.number_input("Extra Time (vs SQM)", min_value=0)
                     reason = cc.selectbox("Reason", smt_reasons)
                     note = st.text_area("Analysis Note")
                     
                     if st.form_submit_button("Submit to SMT Sheet"):
-                        row_hts = hts_df[hts_df['Ticket ID'] == t_id_hts].iloc[0]
-                        formatted_date_hts = row_hts['date'].strftime('%d-%b-%Y').lstrip('0')
-                        data_hts = [str(t_id_hts), row_hts['Name'], formatted_date_hts, row_hts['Team'], str(row_hts['Time']), str(e_time), f"{reason} {note}".strip()]
-                        if write_to_shortfall_sheet(TARGET_SHEET_ID, "Spending More Time", data_hts): 
-                            st.success(f"Ticket #{t_id_hts} Analysis Saved!")
-
+                        data_hts = []
+                        for t_id_hts in t_ids_hts:
+                            row_hts = hts_idx.row(t_id_hts)
+                            data_hts.append([str(t_id_hts), row_hts['Name'], shortfall_date(row_hts), row_hts['Team'], str(row_hts['Time']), str(e_time), f"{reason} {note}".strip()])
+                        if not data_hts:
+                            st.warning("Please select at least one Ticket ID.")
+                        elif write_to_shortfall_sheet(TARGET_SHEET_ID, "Spending More Time", data_hts): 
+                            st.success(f"{len(data_hts)} ticket(s) Analysis queued for the Shortfall sheet.")
+
+except fetch_scheduler.SheetsUnavailable as e:
+    st.warning(f"Google Sheets is rate-limiting requests right now. Please try again in a minute. ({e})")
 except Exception as e:
     st.error(f"Error: {e}")
-
+finally:
+    # st.stop() হলেও প্রোফাইলার বন্ধ হবে
+    if profiler is not None:
+        st.session_state.last_profile = profiler.stop()
+        profiler = None
+
+# প্রতি রানের টাইমিং ও মেমরি রিপোর্ট বাজেটের সাথে লগ হয় (PERF_LOG_PATH এ JSON লাইন)
+timing = run_timer.finish()
+if admin:
+    with st.sidebar.expander("⏱ Performance (admin)"):
+        st.json(timing)
+        if profiler_busy:
+            st.caption("Profiler busy: another rerun is being profiled. Try again in a moment.")
+        if "last_profile" in st.session_state:
+            profile_text, profile_stats = st.session_state.last_profile
+            st.download_button("Download profile (.prof)", profile_stats, file_name="rerun.prof")
+            st.download_button("Download profile (text)", profile_text, file_name="rerun.txt")
+        elif not profiler_busy:
+            st.caption("Add &profile=1 to the URL to profile one rerun.")
+    if st.query_params.get("profile"):
+        del st.query_params["profile"]  # শুধু একটি রান প্রোফাইল হবে
@@ -0,0 +1,80 @@
+import re
+import time
+
+# gspread এর যে অংশগুলো অ্যাপ ব্যবহার করে শুধু সেগুলো, মেমরিতে রাখা ডাটা থেকে (কোনো নেটওয়ার্ক নেই)
+
+
+class FakeWorksheet:
+    def __init__(self, values=None, records=None, latency=0.0):
+        self.records = records
+        if values is None and records:
+            # get_all_values() এর মতো: হেডার সহ সব সেল স্ট্রিং
+            header = list(records[0])
+            values = [header] + [[str(r.get(h, "")) for h in header] for r in records]
+        self.values = values if values is not None else []
+        self.latency = latency  # প্রতি API কলে কৃত্রিম দেরি (সেকেন্ড)
+        self.appended = []
+
+    def _call(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get_all_values(self):
+        self._call()
+        return self.values
+
+    def get_all_records(self):
+        self._call()
+        return self.records if self.records is not None else [dict(zip(self.values[0], r)) for r in self.values[1:]]
+
+    def batch_get(self, ranges):
+        self._call()
+        out = []
+        for rng in ranges:
+            start, end = re.match(r"[A-Z]*(\d+)(?::[A-Z]*(\d*))?$", rng).groups()
+            stop = int(end) if end else (int(start) if end is None else None)
+            out.append(self.values[int(start) - 1:stop])
+        return out
+
+    def append_rows(self, rows, **kwargs):
+        self._call()
+        self.appended.extend(rows)
+        self.values.extend(rows)
+
+    @property
+    def row_count(self):
+        return len(self.values)
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheets, latency=0.0):
+        self.worksheets = worksheets
+        self.latency = latency
+        self.modified_time = "2026-01-01T00:00:00.000Z"
+
+    def worksheet(self, title):
+        return self.worksheets[title]
+
+    def get_lastUpdateTime(self):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.modified_time
+
+    def touch(self):
+        self.modified_time = f"{time.time():.6f}"
+
+
+class FakeClient:
+    def __init__(self, spreadsheets, latency=0.0):
+        self.spreadsheets = spreadsheets
+        self.latency = latency
+        self.calls = 0
+
+    def open_by_key(self, key):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.spreadsheets[key]
+
+    def forget(self, key=None):
+        pass
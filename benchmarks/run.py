@@ -0,0 +1,195 @@
+# অফলাইন বেঞ্চমার্ক: Google এ না গিয়ে নকল gspread ও সিনথেটিক ডাটা দিয়ে প্রতিটি ধাপের সময় মাপা
+#
+#   python benchmarks/run.py --rows 10k 100k 1m --out bench.json
+#   python benchmarks/run.py --rows 100k --baseline bench.json   # ধীর হলে exit code 1
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SNAPSHOT_DIR", tempfile.mkdtemp(prefix="bench-snapshots-"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import plotly.express as px  # noqa: E402
+
+import analytics  # noqa: E402
+import charts  # noqa: E402
+import data_loader  # noqa: E402
+import filter_index  # noqa: E402
+import snapshot_store  # noqa: E402
+import sql_backend  # noqa: E402
+import tracking_rules  # noqa: E402
+from benchmarks import synthetic  # noqa: E402
+from benchmarks.fake_gspread import FakeClient, FakeSpreadsheet, FakeWorksheet  # noqa: E402
+
+DATA_SHEET = "bench-data"
+SUMMARY_SHEET = "bench-summary"
+NOISE_FLOOR = 0.005  # এর চেয়ে ছোট পার্থক্য (সেকেন্ড) রিগ্রেশন ধরা হবে না
+
+
+def parse_rows(text):
+    text = text.lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def timed(fn, repeat, setup=None):
+    times, result = [], None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, {"best_s": round(min(times), 6), "mean_s": round(sum(times) / len(times), 6)}
+
+
+def make_client(rows):
+    data_ws = FakeWorksheet(synthetic.data_values(rows))
+    summary_ws = FakeWorksheet(records=synthetic.summary_records())
+    return FakeClient({
+        DATA_SHEET: FakeSpreadsheet({"DATA": data_ws}),
+        SUMMARY_SHEET: FakeSpreadsheet({"FINAL SUMMARY": summary_ws}),
+    })
+
+
+def build_charts(dash, df):
+    figs = [
+        px.bar(dash["by_product"].reset_index(name='count'), x='count', y='Product', orientation='h'),
+        charts.area(dash["by_date"].reset_index(name='Orders'), x='date', y='Orders'),
+        px.pie(dash["by_shift"].reset_index(name='count'), values='count', names='Shift', hole=0.5),
+    ]
+    # সবচেয়ে বেশি টিকেটের আর্টিস্টের স্কেটার (Artist Analysis ট্যাবের মতো)
+    top = dash["by_name"].idxmax()
+    a_df = charts.thin_points(df[df['Name'] == top], "SQM", "Time", color="Product").copy()
+    a_df['RT_Link'] = a_df['Ticket ID'].map(analytics.rt_link)
+    figs.append(charts.scatter(a_df, x="SQM", y="Time", size="Time", color="Product",
+                               custom_data=['Ticket ID', 'RT_Link']))
+    return sum(len(fig.to_json()) for fig in figs)
+
+
+def bench(rows, repeat):
+    client = make_client(rows)
+    stages = {}
+    key = data_loader.data_key(DATA_SHEET)
+
+    (df, meta, _), stages["get_data_parse"] = timed(lambda: data_loader.fetch_data(client, DATA_SHEET), repeat)
+    _, stages["snapshot_write"] = timed(lambda: snapshot_store.write_snapshot(key, df, meta), repeat)
+    (df, meta), stages["snapshot_read"] = timed(lambda: snapshot_store.read_snapshot(key), repeat,
+                                                setup=snapshot_store._mapped.clear)
+
+    # ডেল্টা সিঙ্ক: শিটে ০.১% নতুন রো যোগ হলে
+    ws = client.spreadsheets[DATA_SHEET].worksheet("DATA")
+    extra = synthetic.data_values(max(1, rows // 1000), seed=1)[1:]
+
+    def add_rows():
+        del ws.values[rows + 1:]
+        ws.values.extend(extra)
+        client.spreadsheets[DATA_SHEET].touch()
+        snapshot_store.write_snapshot(key, df, meta)
+
+    _, stages["delta_sync"] = timed(
+        lambda: data_loader.sync_data(client, DATA_SHEET, df, meta, {}), repeat, setup=add_rows)
+
+    f_index, stages["filter_index_build"] = timed(lambda: filter_index.build_index(df), repeat)
+    catalog = f_index["catalog"]
+    start, end = catalog["date_min"], catalog["date_max"]
+    selections = {"Team": catalog["values"]["Team"][0], "Shift": "All", "Employee Type": "Artist", "Product": "All"}
+    positions, stages["sidebar_filter"] = timed(
+        lambda: filter_index.filter_positions(f_index, start, end, selections), repeat)
+    _, stages["sidebar_filter_dates_only"] = timed(
+        lambda: filter_index.filter_positions(f_index, start, end, {}), repeat)
+    df_f = df.take(positions)
+
+    cube, stages["cube_build"] = timed(lambda: analytics.build_cube(df), repeat)
+
+    def man_day():
+        dash = analytics.dashboard_views(cube, start, end, selections)
+        for product in analytics.PRODUCT_COUNT_COLS.values():
+            analytics.calculate_man_day_avg(dash["avgs"], product)
+        return dash
+
+    dash, stages["man_day_avg"] = timed(man_day, repeat)
+    _, stages["team_sum"] = timed(lambda: analytics.team_summary(df_f), repeat)
+    _, stages["artist_brk"] = timed(lambda: analytics.artist_breakdown(df_f), repeat)
+    flags, stages["tracking_flags"] = timed(lambda: tracking_rules.evaluate(df), repeat)
+    _, stages["tracking_lists"] = timed(lambda: tracking_rules.tracking_lists(df, flags, positions), repeat)
+    chart_bytes, stages["charts"] = timed(lambda: build_charts(dash, df_f), repeat)
+    # DuckDB ইনস্টল থাকলে একই হিসাবগুলো SQL ব্যাকএন্ডে
+    if importlib.util.find_spec("duckdb") is not None:
+        _, stages["sql_dashboard"] = timed(lambda: sql_backend.dashboard_views(df, start, end, selections), repeat)
+        _, stages["sql_team_sum"] = timed(lambda: sql_backend.team_summary(df, start, end, selections), repeat)
+        _, stages["sql_artist_brk"] = timed(lambda: sql_backend.artist_breakdown(df, start, end, selections), repeat)
+    _, stages["summary_parse"] = timed(lambda: data_loader.fetch_summary_data(client, SUMMARY_SHEET), repeat)
+
+    return {
+        "rows": rows,
+        "parsed_rows": len(df),
+        "filtered_rows": int(len(positions)),
+        "chart_json_bytes": chart_bytes,
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+        "stages": stages,
+    }
+
+
+# বেসলাইনের চেয়ে tolerance এর বেশি ধীর হওয়া ধাপগুলো
+def regressions(results, baseline, tolerance):
+    base = {r["rows"]: r["stages"] for r in baseline["results"]}
+    found = []
+    for result in results:
+        for stage, timing in result["stages"].items():
+            old = base.get(result["rows"], {}).get(stage)
+            if old is None:
+                continue
+            if timing["best_s"] > old["best_s"] * (1 + tolerance) and timing["best_s"] - old["best_s"] > NOISE_FLOOR:
+                found.append({"rows": result["rows"], "stage": stage, "baseline_s": old["best_s"], "current_s": timing["best_s"]})
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for the analytics app")
+    parser.add_argument("--rows", nargs="+", default=["10k", "100k", "1m"], help="DATA sheet sizes, e.g. 10k 1m 10m")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.rows:
+        rows = parse_rows(size)
+        result = bench(rows, args.repeat)
+        results.append(result)
+        slowest = sorted(result["stages"].items(), key=lambda kv: -kv[1]["best_s"])[:3]
+        print(f"{rows:>10,} rows: " + ", ".join(f"{k} {v['best_s'] * 1000:.1f} ms" for k, v in slowest))
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = regressions(results, json.load(f), args.tolerance)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['rows']:,} rows {r['stage']}: {r['baseline_s']:.4f}s -> {r['current_s']:.4f}s")
+
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
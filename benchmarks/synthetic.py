@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+# আসল DATA শিটের মতো কলাম ও কার্ডিনালিটি (নাম/টিম/প্রোডাক্ট এর সংখ্যা ও অনুপাত)
+DATA_HEADER = ['date', 'Ticket ID', 'Name', 'Team name', 'Shift', 'Employee Type', 'Product',
+               'Job Type', 'Time', 'SQM', 'Floor', 'Labels']
+PRODUCTS = {
+    'Floorplan Queue': 0.55, 'Measurement Queue': 0.2, 'Autocad Queue': 0.08,
+    'Urban Angles': 0.07, 'Van Bree Media': 0.05, 'Rework': 0.05,
+}
+SHIFTS = {'Morning': 0.4, 'Evening': 0.35, 'Night': 0.25}
+EMPLOYEE_TYPES = {'Artist': 0.85, 'QC': 0.15}
+JOB_TYPES = {'Live Job': 0.9, 'Rework': 0.1}
+LABELS = ['', 'German', 'Priority', 'Re-upload', 'Multi roof']
+TEAMS = 15
+
+SUMMARY_HEADER = [
+    'USER NAME ALL', 'ARTIST/ QC', 'MONTH', 'DAY', 'FLOORPLAN', 'MEASUREMENT', 'AUTOCAD', 'URBAN ANGLES',
+    'VANBREEMEDIA', 'RE_WORK', 'LIVE ORDER', 'FP TIME', 'MRP TIME', 'CAD TIME', 'URBAN ANGLES TIME',
+    'RE_WORK TIME', 'WORKING TIME', 'AVG TIME', 'FP AVG', 'MRP AVG', 'CAD AVG',
+    'TUESDAY TO FRIDAY AVG', 'SATURDAY TO MONDAY',
+]
+
+
+def _pick(rng, weights, n):
+    p = np.array(list(weights.values()), dtype=float)
+    return rng.choice(len(weights), size=n, p=p / p.sum()).astype(np.int8)
+
+
+def _lookup(values):
+    return np.array(list(values), dtype=object)
+
+
+# প্রতি আর্টিস্ট দিনে ~২০-৩০টি টিকেট করে, তাই রো বাড়লে নামও বাড়ে (সর্বোচ্চ ১৫০০)
+def artist_count(rows, days=31):
+    return int(min(1500, max(40, rows / (days * 25))))
+
+
+# get_all_values() এর মতো রো এর লিস্ট (হেডার সহ), কিন্তু ভেতরে প্রতিটি কলাম ছোট numpy কোড/নাম্বার হিসেবে থাকে
+# স্ট্রিং এর লিস্ট শুধু যে রেঞ্জ চাওয়া হয় (batch_get এর চাঙ্ক) সেটার জন্য বানানো হয়, তাই ১ কোটি রো তেও কয়েকশো MB
+class SheetValues:
+    def __init__(self, header, rows, columns, extra=None):
+        self.header = list(header)
+        self.rows = rows
+        self.columns = columns  # (কোড/নাম্বার array, start:stop -> স্ট্রিং array) এর লিস্ট
+        self.extra = list(extra or [])  # append_rows এ যোগ হওয়া রো
+
+    def __len__(self):
+        return 1 + self.rows + len(self.extra)
+
+    def _body(self, start, stop):
+        if start >= stop:
+            return []
+        cols = [fmt(values[start:stop]) for values, fmt in self.columns]
+        return np.column_stack(cols).tolist()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            index = item + len(self) if item < 0 else item
+            if not 0 <= index < len(self):
+                raise IndexError(item)
+            return self[index:index + 1][0]
+        start, stop, step = item.indices(len(self))
+        if step != 1:
+            raise ValueError("step slices are not supported")
+        out = [list(self.header)] if start == 0 and stop > 0 else []
+        out += self._body(max(start, 1) - 1, min(stop, self.rows + 1) - 1)
+        out += [list(r) for r in self.extra[max(start - self.rows - 1, 0):max(stop - self.rows - 1, 0)]]
+        return out
+
+    # run.py এর মতো শুধু শেষ থেকে কেটে ফেলা (del values[k:]) সাপোর্ট করে
+    def __delitem__(self, item):
+        if not isinstance(item, slice) or item.stop is not None or item.step is not None:
+            raise ValueError("only del values[k:] is supported")
+        start = item.indices(len(self))[0]
+        if start <= self.rows:
+            self.rows = max(start - 1, 0)
+            self.extra = []
+        else:
+            del self.extra[start - self.rows - 1:]
+
+    def __iter__(self):
+        for start in range(0, len(self), 10_000):
+            yield from self[start:start + 10_000]
+
+    def append(self, row):
+        self.extra.append(row)
+
+    def extend(self, rows):
+        self.extra.extend(rows)
+
+
+# DATA শিট: get_all_values() যেমন দেয় তেমন স্ট্রিংয়ের রো (হেডার সহ), কলাম numpy তে বানানো
+def data_values(rows, month="2026-01", seed=0, blank_every=500):
+    rng = np.random.default_rng(seed)
+    artists = artist_count(rows)
+    artist = rng.integers(0, artists, rows).astype(np.int32)
+    day = rng.integers(0, 31, rows).astype(np.int8)
+    if blank_every:
+        day[::blank_every] = -1  # শিটে কিছু খালি তারিখের রো থাকে (লুকআপের শেষে '')
+    start = np.datetime64(f"{month}-01")
+    dates = _lookup(pd.DatetimeIndex(start + np.arange(31).astype('timedelta64[D]')).strftime('%m/%d/%Y').tolist() + [''])
+    names = _lookup(f"Artist {a}" for a in range(artists))
+    teams = _lookup(f"Team {a % TEAMS}" for a in range(artists))  # আর্টিস্ট একটি টিমেই থাকে
+    ticket = np.arange(rows, dtype=np.int64)
+
+    columns = [
+        (day, lambda v: dates[v]),
+        (ticket, lambda v: (100000 + v).astype(str)),
+        (artist, lambda v: names[v]),
+        (artist, lambda v: teams[v]),
+        (_pick(rng, SHIFTS, rows), lambda v: _lookup(SHIFTS)[v]),
+        (_pick(rng, EMPLOYEE_TYPES, rows), lambda v: _lookup(EMPLOYEE_TYPES)[v]),
+        (_pick(rng, PRODUCTS, rows), lambda v: _lookup(PRODUCTS)[v]),
+        (_pick(rng, JOB_TYPES, rows), lambda v: _lookup(JOB_TYPES)[v]),
+        (np.round(rng.gamma(2.0, 25.0, rows), 1), lambda v: v.astype(str)),
+        (np.round(rng.gamma(2.0, 30.0, rows), 2), lambda v: v.astype(str)),
+        (rng.integers(1, 5, rows).astype(np.int8), lambda v: v.astype(str)),
+        (rng.integers(0, len(LABELS), rows).astype(np.int8), lambda v: _lookup(LABELS)[v]),
+    ]
+    return SheetValues(DATA_HEADER, rows, columns)
+
+
+# FINAL SUMMARY শিট: get_all_records() এর মতো dict এর লিস্ট
+def summary_records(artists=300, months=("January 2026", "December 2025"), seed=1):
+    rng = np.random.default_rng(seed)
+    records = []
+    for month in months:
+        for a in range(artists):
+            counts = rng.integers(0, 400, len(SUMMARY_HEADER) - 4).tolist()
+            records.append(dict(zip(SUMMARY_HEADER, [f"Artist {a}", 'QC' if a % 7 == 0 else 'Artist', month,
+                                                     int(rng.integers(15, 26))] + counts)))
+    return records
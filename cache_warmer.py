@@ -0,0 +1,108 @@
+import datetime
+import os
+import threading
+import time
+
+import data_loader
+import snapshot_store
+
+# শিফট শুরুর আগে কখন কখন সব শিট নতুন করে নামানো হবে (সার্ভারের লোকাল টাইম, "HH:MM" কমা দিয়ে)
+WARM_TIMES = os.environ.get("CACHE_WARM_TIMES", "05:30,13:30,21:30")
+STARTUP_MARGIN = 3600  # অ্যাপ চালুর সময় যে স্ন্যাপশটের TTL এর এর চেয়ে কম বাকি, সেটাও নামানো হবে
+STARTUP_SLOT = 600  # একসাথে চালু হওয়া রেপ্লিকা গুলোর মধ্যে এই কয়েক সেকেন্ডের স্লটে একটিই চালুর ওয়ার্ম করবে
+LOCK_MAX_AGE = 2 * 86400
+
+
+def parse_times(spec):
+    times = []
+    for part in spec.split(","):
+        part = part.strip()
+        if part:
+            hour, minute = part.split(":")
+            times.append(datetime.time(int(hour), int(minute)))
+    return sorted(times)
+
+
+# এখনকার পরের নির্ধারিত সময়
+def next_run(now, times):
+    for day in range(2):
+        date = now.date() + datetime.timedelta(days=day)
+        for t in times:
+            run_at = datetime.datetime.combine(date, t)
+            if run_at > now:
+                return run_at
+    return None
+
+
+# ব্যাকগ্রাউন্ড ওয়ার্মার: চালুর সময় এবং প্রতিটি নির্ধারিত সময়ে DATA_SOURCES এর সব শিট + FINAL SUMMARY চেক করে, বদলালে নতুন করে নামায়
+class CacheWarmer:
+    def __init__(self, get_client, sources=None, summary_sheet_id=data_loader.SUMMARY_SHEET_ID, times=WARM_TIMES):
+        self.get_client = get_client
+        self.sources = dict(data_loader.DATA_SOURCES if sources is None else sources)
+        self.summary_sheet_id = summary_sheet_id
+        self.times = parse_times(times)
+        self._thread = None
+        self.last_run = None
+        self.next_run = None
+        self.last_error = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        startup = datetime.datetime.fromtimestamp(time.time() // STARTUP_SLOT * STARTUP_SLOT)
+        if self._claim_slot(startup, "warm-startup"):
+            self.warm(only_stale=True)
+        while self.times:
+            self.next_run = next_run(datetime.datetime.now(), self.times)
+            time.sleep(max(0.0, (self.next_run - datetime.datetime.now()).total_seconds()))
+            # একাধিক প্রসেস চললে প্রতিটি স্লটে শুধু একটি প্রসেস শিট নামাবে
+            if self._claim_slot(self.next_run):
+                self.warm()
+
+    def _claim_slot(self, run_at, prefix="warm"):
+        os.makedirs(snapshot_store.SNAPSHOT_DIR, exist_ok=True)
+        for name in os.listdir(snapshot_store.SNAPSHOT_DIR):
+            path = os.path.join(snapshot_store.SNAPSHOT_DIR, name)
+            if name.startswith("warm-") and name.endswith(".lock"):
+                try:
+                    if time.time() - os.path.getmtime(path) > LOCK_MAX_AGE:
+                        os.remove(path)
+                except OSError:
+                    pass
+        path = os.path.join(snapshot_store.SNAPSHOT_DIR, f"{prefix}-{run_at:%Y%m%d%H%M}.lock")
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            return False
+
+    # only_stale=True হলে শুধু যেগুলোর স্ন্যাপশট নেই বা শীঘ্রই মেয়াদ শেষ হবে
+    # শিট না বদলালে শুধু modifiedTime চেক হয় (স্ন্যাপশটের TTL আবার শুরু), বদলালে পুরো রিলোড ও কিউব
+    def warm(self, only_stale=False):
+        errors = []
+        for label, sheet_id in self.sources.items():
+            try:
+                if data_loader.is_archived(sheet_id):
+                    # বন্ধ মাস: শুধু ARCHIVE_CHECK_INTERVAL পর পর modifiedTime চেক, বদলালে আবার আর্কাইভ হয়
+                    data_loader.load_data(self.get_client, sheet_id)
+                    continue
+                if only_stale and not data_loader.needs_refresh(data_loader.data_key(sheet_id), margin=STARTUP_MARGIN):
+                    continue
+                if data_loader.refresh_data_if_changed(self.get_client, sheet_id):
+                    data_loader.load_cube(sheet_id, data_loader.load_data(self.get_client, sheet_id))
+            except Exception as e:
+                errors.append(f"{label}: {e}")
+
+        try:
+            summary = data_loader.summary_key(self.summary_sheet_id)
+            if not only_stale or data_loader.needs_refresh(summary, margin=STARTUP_MARGIN):
+                data_loader.refresh_summary_if_changed(self.get_client, self.summary_sheet_id)
+        except Exception as e:
+            errors.append(f"FINAL SUMMARY: {e}")
+
+        self.last_run = time.time()
+        self.last_error = "; ".join(errors) or None
@@ -0,0 +1,49 @@
+import numpy as np
+import plotly.express as px
+
+WEBGL_POINTS = 1000  # এর বেশি পয়েন্ট হলে SVG এর বদলে WebGL ট্রেস
+MAX_POINTS = 5000  # এর বেশি পয়েন্ট ব্রাউজারে পাঠানো হবে না (লেভেল-অফ-ডিটেইল ডাউনস্যাম্পলিং)
+
+
+# স্কেটার: x/y প্লেনকে গ্রিডে ভাগ করে প্রতি ঘরে (প্রতি রঙের জন্য) একটি পয়েন্ট রাখা, তাই আউটলায়ার গুলো থেকে যায়
+def thin_points(df, x, y, limit=MAX_POINTS, color=None):
+    if len(df) <= limit:
+        return df
+    groups = df[color].astype('category').cat.codes.to_numpy() if color else np.zeros(len(df), dtype=int)
+    bins = max(1, int(np.sqrt(limit / max(1, len(np.unique(groups))))))
+
+    def cell(values):
+        values = values.to_numpy(dtype=float)
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        scaled = (values - lo) / (hi - lo) if hi > lo else np.zeros(len(values))
+        return np.minimum((scaled * bins).astype(int), bins - 1)
+
+    key = (groups.astype(np.int64) * bins + cell(df[x])) * bins + cell(df[y])
+    _, first = np.unique(key, return_index=True)
+    return df.iloc[np.sort(first)]
+
+
+# টাইম সিরিজ: প্রতি বাকেটের সর্বনিম্ন ও সর্বোচ্চ পয়েন্ট রাখা, তাই স্পাইক হারায় না
+def thin_series(df, x, y, limit=MAX_POINTS):
+    if len(df) <= limit:
+        return df
+    df = df.sort_values(x)
+    buckets = np.arange(len(df)) * (limit // 2) // len(df)
+    values = df[y].reset_index(drop=True)
+    grouped = values.groupby(buckets)
+    keep = np.union1d(grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy())
+    return df.iloc[keep]
+
+
+def scatter(df, x, y, **kwargs):
+    render_mode = "webgl" if len(df) > WEBGL_POINTS else "auto"
+    return px.scatter(df, x=x, y=y, render_mode=render_mode, **kwargs)
+
+
+def area(df, x, y, **kwargs):
+    plot_df = thin_series(df, x, y)
+    if len(plot_df) <= WEBGL_POINTS:
+        return px.area(plot_df, x=x, y=y, markers=True, **kwargs)
+    fig = px.line(plot_df, x=x, y=y, render_mode="webgl", **kwargs)
+    fig.update_traces(fill='tozeroy')
+    return fig
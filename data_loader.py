@@ -0,0 +1,439 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import analytics
+import fetch_scheduler
+import month_archive
+import perf
+import schema
+import snapshot_store
+
+DATA_TTL = 21600  # এর পরে DATA শিট পুরোটা আবার নামানো হবে (সিঙ্কে যোগ হওয়া রো এর পরের এডিট ধরার জন্য)
+SYNC_INTERVAL = 300  # এই সময় পর পর শিট বদলেছে কিনা চেক করে নতুন রো আনা হবে
+ARCHIVE_CHECK_INTERVAL = 3600  # বন্ধ মাসের শিট এই সময় পর পর শুধু modifiedTime দিয়ে চেক হয়
+OVERLAP_ROWS = 50  # শেষের এতগুলো রো আবার মিলিয়ে দেখা হয়, না মিললে পুরো রিলোড
+BLOCK_ROWS = 10000  # আগের রো এর এডিট ধরতে প্রতি সিঙ্কে এতগুলো রো এর একটি ব্লক মিলিয়ে দেখা হয়
+CHUNK_ROWS = int(os.environ.get("SHEETS_CHUNK_ROWS", "20000"))  # পুরো শিট নামানোর সময় প্রতি রিকোয়েস্টে এতগুলো রো
+# আগের সেভ করা মাসের শিট আইডিগুলো
+DATA_SOURCES = {
+    "January 2026": "1lQJQkXNvsdnN8pwsI4QhctS7Pk0M0D6FVklLvYKPNmc",
+    "December 2025": "1e-3jYxjPkXuxkAuSJaIJ6jXU0RT1LemY6bBQbCTX_6Y"
+}
+SOURCE_LABELS = {sheet_id: label for label, sheet_id in DATA_SOURCES.items()}
+SUMMARY_SHEET_ID = "1hFboFpRmst54yVUfESFAZE_UgNdBsaBAmHYA-9z5eJE"
+
+
+def data_key(sheet_id):
+    return f"data-{sheet_id}"
+
+
+def cube_key(sheet_id):
+    return f"cube-{sheet_id}"
+
+
+def summary_key(sheet_id=SUMMARY_SHEET_ID):
+    return f"summary-{sheet_id}"
+
+
+# ডাটা ক্লিনিং ও টাইপ কনভার্সন schema.py এর DATA_SCHEMA অনুযায়ী
+def clean_data(df, date_formats=None):
+    return schema.apply_schema(df, schema.DATA_SCHEMA, date_formats)
+
+
+def _pad_rows(rows, width):
+    return [list(r[:width]) + [""] * (width - len(r)) for r in rows]
+
+
+def _rows_hash(rows):
+    return hashlib.sha1(json.dumps(rows).encode()).hexdigest()
+
+
+def _col_letter(n):
+    letters = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _last_update_time(spreadsheet):
+    # Drive API থেকে শুধু modifiedTime আনা হয় (ডাটা নামানোর চেয়ে অনেক সস্তা)
+    try:
+        with perf.stage("sheets_check"):
+            return spreadsheet.get_lastUpdateTime()
+    except Exception:
+        return None
+
+
+def _sync_meta(header, source_rows, tail_rows, fetched_at, date_formats, block_hashes):
+    return {
+        "fetched_at": fetched_at,
+        "schema_version": schema.SCHEMA_VERSION,
+        "header": header,
+        "date_formats": date_formats,
+        "source_rows": source_rows,
+        "tail_hash": _rows_hash(tail_rows[-OVERLAP_ROWS:]),
+        "block_hashes": block_hashes,
+    }
+
+
+# পুরো BLOCK_ROWS এর ব্লকগুলোর হ্যাশ hashes এ যোগ হয়, অসম্পূর্ণ শেষ অংশ ফেরত (পরের চাঙ্কের সাথে জোড়া লাগবে)
+def _hash_blocks(rows, hashes):
+    full = len(rows) - len(rows) % BLOCK_ROWS
+    hashes.extend(_rows_hash(rows[i:i + BLOCK_ROWS]) for i in range(0, full, BLOCK_ROWS))
+    return rows[full:]
+
+
+# শিটের রো গুলো CHUNK_ROWS করে নামানো; প্রতিটি চাঙ্ক (header সহ প্যাড করা রো) আলাদা করে দেওয়া হয়
+# API একটি রেঞ্জের শেষের খালি রো বাদ দেয়, তাই মাঝের খালি রো গুলো পরের চাঙ্কে ডাটা পেলে ফিরিয়ে দেওয়া হয়
+def _iter_chunks(worksheet, chunk_rows=CHUNK_ROWS):
+    with perf.stage("sheets_fetch"):
+        header_range, body = worksheet.batch_get(["1:1", f"2:{chunk_rows + 1}"])
+    header = list(header_range[0]) if header_range else []
+    if not header:
+        return
+    start, blank = 2, 0
+    while True:
+        if body:
+            yield header, [[""] * len(header)] * blank + _pad_rows(body, len(header))
+            blank = 0
+        blank += chunk_rows - len(body)
+        start += chunk_rows
+        # row_count ক্যাশ করা মেটাডাটা থেকে (পুরনো হতে পারে), তাই পুরো চাঙ্ক এলে আরও দেখা হয়
+        if start > worksheet.row_count and len(body) < chunk_rows:
+            return
+        with perf.stage("sheets_fetch"):
+            body = worksheet.batch_get([f"{start}:{start + chunk_rows - 1}"])[0]
+
+
+# পুরো DATA শিট নামানো: চাঙ্ক ধরে, প্রতিটি চাঙ্ক সাথে সাথে টাইপ করা কলামে রূপান্তর (খালি তারিখের রো বাদ)
+# তাই একসাথে শুধু একটি চাঙ্কের স্ট্রিং মেমরিতে থাকে, পুরো শিটের লিস্ট/ডিক্ট নয়
+def fetch_data(client, sheet_id):
+    spreadsheet = client.open_by_key(sheet_id)
+    modified_time = _last_update_time(spreadsheet)
+
+    header, frames, source_rows, tail, date_formats = [], [], 0, [], {}
+    block, block_hashes = [], []
+    for header, rows in _iter_chunks(spreadsheet.worksheet("DATA")):
+        with perf.stage("parse"):
+            chunk = pd.DataFrame(rows, columns=header)
+            # তারিখের ফরম্যাট প্রথম চাঙ্ক থেকে, সব চাঙ্কে একই (পুরো কলাম একসাথে পার্স করার মতো ফলাফল)
+            date_formats = schema.guess_date_formats(chunk, schema.DATA_SCHEMA, date_formats)
+            frames.append(clean_data(chunk, date_formats))
+            del chunk
+        source_rows += len(rows)
+        tail = (tail + rows)[-OVERLAP_ROWS:]
+        block = _hash_blocks(block + rows, block_hashes)
+        del rows
+
+    with perf.stage("parse"):
+        if frames:
+            df = schema.concat_all(frames, schema.DATA_SCHEMA) if len(frames) > 1 else frames[0]
+        else:
+            df = clean_data(pd.DataFrame(columns=header))
+    return df, _sync_meta(header, source_rows, tail, time.time(), date_formats, block_hashes), modified_time
+
+
+# শুধু শেষ সিঙ্কের পরে যোগ হওয়া রো আনা; আগের রো এডিট হলে None রিটার্ন করে (তখন পুরো রিলোড)
+# শেষের OVERLAP_ROWS টি রো প্রতিবার মেলানো হয়; শিট বদলালে তার পরের সিঙ্কগুলোতে একটি করে ব্লক (পুরো লোডের হ্যাশের সাথে),
+# যতক্ষণ না সব ব্লক একবার দেখা হয়। পুরো লোডের পরে সিঙ্কে যোগ হওয়া রো এর এডিট শুধু DATA_TTL এর রিলোডে ধরা পড়ে
+def sync_data(client, sheet_id, df, meta, state):
+    key = data_key(sheet_id)
+    spreadsheet = client.open_by_key(sheet_id)
+    modified_time = _last_update_time(spreadsheet)
+    changed = modified_time is None or modified_time != state.get("modified_time")
+    cursor = state.get("verify_block", 0)
+    if not changed and not state.get("unverified"):
+        snapshot_store.write_state(key, {**_check_state(key, modified_time), "verify_block": cursor})
+        return df
+
+    header = meta["header"]
+    synced_rows = meta["source_rows"]
+    if "date_formats" not in meta or "block_hashes" not in meta:
+        return None  # পুরনো স্ন্যাপশটে তারিখের ফরম্যাট/ব্লক হ্যাশ নেই, একবার পুরো রিলোড
+    hashes = meta["block_hashes"]
+    unverified = len(hashes) if changed else state["unverified"]
+    # শেষের OVERLAP_ROWS টি রো সহ আনা হয় (শিটের রো ২ থেকে ডাটা শুরু)
+    start_row = max(2, synced_rows + 2 - OVERLAP_ROWS)
+    overlap = synced_rows + 2 - start_row
+    last_col = _col_letter(len(header))
+    ranges = ["1:1", f"A{start_row}:{last_col}"]
+    block = cursor % len(hashes) if unverified else None
+    if block is not None:
+        first = 2 + block * BLOCK_ROWS
+        ranges.append(f"A{first}:{last_col}{first + BLOCK_ROWS - 1}")
+
+    worksheet = spreadsheet.worksheet("DATA")
+    with perf.stage("sheets_fetch"):
+        head_range, body_range, *sample = worksheet.batch_get(ranges)
+    if _pad_rows(head_range, len(header)) != [header] or len(head_range[0]) > len(header):
+        return None
+    if sample:
+        block_rows = _pad_rows(sample[0], len(header))
+        block_rows += [[""] * len(header)] * (BLOCK_ROWS - len(block_rows))  # API শেষের খালি রো বাদ দেয়
+        if _rows_hash(block_rows) != hashes[block]:
+            return None
+
+    rows = _pad_rows(body_range, len(header))
+    if len(rows) < overlap or _rows_hash(rows[:overlap]) != meta["tail_hash"]:
+        return None
+
+    new_rows = rows[overlap:]
+    if new_rows:
+        new_df = pd.DataFrame(new_rows, columns=header)
+        # পুরো লোডের সময় ঠিক করা তারিখের ফরম্যাটেই নতুন রো পার্স করা (শিটে আগে তারিখ না থাকলে এখন অনুমান)
+        date_formats = schema.guess_date_formats(new_df, schema.DATA_SCHEMA, meta["date_formats"])
+        new_df = clean_data(new_df, date_formats)
+        df = schema.concat_frames(df, new_df, schema.DATA_SCHEMA)
+        new_meta = _sync_meta(header, synced_rows + len(new_rows), rows, meta["fetched_at"], date_formats, hashes)
+        snapshot_store.write_snapshot(key, df, new_meta)
+        df = snapshot_store.read_snapshot(key)[0]
+
+    state = {"checked_at": time.time(), "modified_time": modified_time, "verify_block": cursor}
+    if block is not None:
+        state.update(verify_block=block + 1, unverified=unverified - 1)
+    snapshot_store.write_state(key, state)
+    return df
+
+
+# Monthly Summary ডাটা (Monthly Efficiency শিট থেকে)
+def fetch_summary_data(client, sheet_id=SUMMARY_SHEET_ID):
+    spreadsheet = client.open_by_key(sheet_id)
+    with perf.stage("sheets_fetch"):
+        values = spreadsheet.worksheet("FINAL SUMMARY").get_all_values()
+    # get_all_records এর মতো প্রতি রোতে ডিক্ট না বানিয়ে সরাসরি সেলের ভ্যালু থেকে (নাম্বার স্কিমায় কনভার্ট হয়)
+    df_s = pd.DataFrame(_pad_rows(values[1:], len(values[0])), columns=values[0]) if values else pd.DataFrame()
+
+    df_s = schema.apply_schema(df_s, schema.SUMMARY_SCHEMA)
+    return df_s
+
+
+def _fresh_snapshot(key, ttl):
+    snap = snapshot_store.read_snapshot(key)
+    if snap is None or snap[1].get("schema_version") != schema.SCHEMA_VERSION:
+        return None
+    # TTL শেষ পুরো লোড থেকে, অথবা তারপর শিট একবারও বদলায়নি বলে যাচাই হলে (verified_at) সেখান থেকে
+    if ttl is not None:
+        loaded_at = max(snap[1].get("fetched_at", 0), snapshot_store.read_state(key).get("verified_at", 0))
+        if time.time() - loaded_at > ttl:
+            return None
+    return snap
+
+
+# শিট থেকে আনা শিডিউলারের মাধ্যমে (একই শিটের একসাথে আসা রিকোয়েস্ট একটি ফেচে, রেট লিমিট ও রিট্রাই সহ)
+# কোটা শেষ হলে পুরনো স্ন্যাপশট থাকলে সেটাই দেখানো হয়
+def _scheduled(key, fn):
+    try:
+        return fetch_scheduler.SCHEDULER.run(key, fn)
+    except fetch_scheduler.SheetsUnavailable:
+        stale = snapshot_store.read_snapshot(key)
+        if stale is None or stale[1].get("schema_version") != schema.SCHEMA_VERSION:
+            raise
+        return stale[0]
+
+
+# স্ন্যাপশট থাকলে সেটাই memory-map করে দেওয়া, না থাকলে শিট থেকে এনে একবার লেখা
+def _load_snapshot(key, fetch, ttl):
+    snap = _fresh_snapshot(key, ttl)
+    if snap is not None:
+        return snap[0]
+
+    def refresh():
+        # অপেক্ষার মধ্যে অন্য থ্রেড/প্রসেস হয়তো লিখে ফেলেছে
+        snap = _fresh_snapshot(key, ttl)
+        if snap is None:
+            snapshot_store.write_snapshot(key, fetch(), {"schema_version": schema.SCHEMA_VERSION})
+            snap = snapshot_store.read_snapshot(key)
+        return snap[0]
+
+    return _scheduled(key, refresh)
+
+
+# বন্ধ মাসের শিট (DATA_SOURCES এ থাকলে) হলে তার লেবেল, নাহলে None
+def _closed_month(sheet_id):
+    label = SOURCE_LABELS.get(sheet_id)
+    return label if label is not None and month_archive.is_closed(label) else None
+
+
+def is_archived(sheet_id):
+    label = _closed_month(sheet_id)
+    return label is not None and month_archive.month_id(label) in month_archive.months()
+
+
+def _reload_data(client, sheet_id):
+    key = data_key(sheet_id)
+    df, meta, modified_time = fetch_data(client, sheet_id)
+    meta = snapshot_store.write_snapshot(key, df, {**meta, "modified_time": modified_time})
+    label = _closed_month(sheet_id)
+    if label is not None:
+        month_archive.write_month(label, df, meta)  # বন্ধ মাস: এরপর শিট থেকে আর নামানো হয় না
+    snapshot_store.write_state(key, {"checked_at": time.time(), "modified_time": modified_time})
+    return snapshot_store.read_snapshot(key)[0]
+
+
+def _sync_or_reload(get_client, sheet_id, ttl, sync_interval):
+    key = data_key(sheet_id)
+    snap = _fresh_snapshot(key, ttl)
+    if snap is not None:
+        df, meta = snap
+        state = snapshot_store.read_state(key)
+        if time.time() - state.get("checked_at", 0) < sync_interval:
+            return df  # অপেক্ষার মধ্যে অন্য কেউ সিঙ্ক করে ফেলেছে
+        synced = sync_data(get_client(), sheet_id, df, meta, state)
+        if synced is not None:
+            return synced
+    return _reload_data(get_client(), sheet_id)
+
+
+# বন্ধ মাস: স্ন্যাপশট না থাকলে (বা স্কিমা বদলালে) আর্কাইভ থেকে আবার লেখা; আর্কাইভও না থাকলে/পুরনো স্কিমার হলে শিট থেকে একবার
+# তারপরও কেউ পুরনো মাস এডিট করতে পারে, তাই ARCHIVE_CHECK_INTERVAL পর পর modifiedTime মেলানো, বদলালে রিলোড (আর্কাইভ সহ)
+def _load_closed(get_client, sheet_id, label):
+    key = data_key(sheet_id)
+    if is_archived(sheet_id):
+        snap = _fresh_snapshot(key, None)
+        if snap is None:
+            archived = month_archive.read_month(label)
+            if archived is not None and archived[1].get("schema_version") == schema.SCHEMA_VERSION:
+                snapshot_store.write_snapshot(key, *archived)
+                snap = snapshot_store.read_snapshot(key)
+        if snap is not None:
+            if time.time() - snapshot_store.read_state(key).get("checked_at", 0) < ARCHIVE_CHECK_INTERVAL:
+                return snap[0]  # অপেক্ষার মধ্যে অন্য কেউ চেক করে ফেলেছে
+            modified_time = _last_update_time(get_client().open_by_key(sheet_id))
+            # Drive থেকে জানা না গেলে আগের ডাটাই, পরের চেকে আবার চেষ্টা
+            if modified_time is None or modified_time == snap[1].get("modified_time"):
+                snapshot_store.write_state(key, {"checked_at": time.time(),
+                                                 "modified_time": snap[1].get("modified_time")})
+                return snap[0]
+    return _reload_data(get_client(), sheet_id)
+
+
+# DATA শিট: SYNC_INTERVAL পর পর ডেল্টা সিঙ্ক, DATA_TTL পর পর (বা এডিট ধরা পড়লে) পুরো রিলোড
+# বন্ধ মাস memory-map করা স্ন্যাপশট থেকে (মেয়াদ নেই, শুধু ঘণ্টায় একবার modifiedTime চেক); Parquet আর্কাইভ শুধু ট্রেন্ড ও স্ন্যাপশট আবার বানানোর জন্য
+def load_data(get_client, sheet_id, ttl=DATA_TTL, sync_interval=SYNC_INTERVAL):
+    key = data_key(sheet_id)
+    label = _closed_month(sheet_id)
+    if label is not None:
+        snap = _fresh_snapshot(key, None)
+        checked_at = snapshot_store.read_state(key).get("checked_at", 0)
+        if snap is not None and is_archived(sheet_id) and time.time() - checked_at < ARCHIVE_CHECK_INTERVAL:
+            return snap[0]
+        return _scheduled(key, lambda: _load_closed(get_client, sheet_id, label))
+    snap = _fresh_snapshot(key, ttl)
+    if snap is not None and time.time() - snapshot_store.read_state(key).get("checked_at", 0) < sync_interval:
+        return snap[0]
+    return _scheduled(key, lambda: _sync_or_reload(get_client, sheet_id, ttl, sync_interval))
+
+
+# একাধিক মাসের শিট একসাথে (থ্রেড পুলে) লোড করা, মোট সময় প্রায় সবচেয়ে ধীর শিটের সমান
+def load_many(get_client, sources, max_workers=None):
+    with ThreadPoolExecutor(max_workers=max_workers or len(sources)) as pool:
+        futures = {label: pool.submit(load_data, get_client, sheet_id) for label, sheet_id in sources.items()}
+        return {label: future.result() for label, future in futures.items()}
+
+
+# মাসগুলো এক ফ্রেমে জোড়া লাগানো, প্রতিটি রোতে 'Source Month' কলাম সহ
+def combine_months(frames):
+    tagged = [
+        df.assign(**{'Source Month': pd.Categorical([label] * len(df))})
+        for label, df in frames.items()
+    ]
+    combined = schema.concat_all(
+        tagged, {**schema.DATA_SCHEMA, "category": schema.DATA_SCHEMA["category"] + ['Source Month']}
+    )
+    combined.attrs["version"] = combined_version(frames)
+    return combined
+
+
+def combined_version(frames):
+    return "+".join(f"{label}={data_version(df)}" for label, df in frames.items())
+
+
+# লোড করা ফ্রেমের ভার্সন (স্ন্যাপশট যতবার নতুন লেখা হয় বদলায়)
+def data_version(df):
+    return df.attrs.get("version")
+
+
+# ডেইলি কিউব: একই ডাটা ভার্সনের জন্য একবারই বানানো হয়, ডেল্টা সিঙ্কে শুধু নতুন রো যোগ হয়
+def load_cube(sheet_id, df):
+    data_snap = snapshot_store.read_snapshot(data_key(sheet_id))
+    generation = data_snap[1].get("fetched_at") if data_snap is not None else None
+
+    key = cube_key(sheet_id)
+    snap = snapshot_store.read_snapshot(key)
+    if snap is not None and snap[1].get("generation") == generation and snap[1].get("rows", 0) <= len(df):
+        cube, meta = snap
+        if meta["rows"] == len(df):
+            return cube
+        cube = analytics.update_cube(cube, df.iloc[meta["rows"]:])
+    else:
+        cube = analytics.build_cube(df)
+
+    snapshot_store.write_snapshot(key, cube, {"generation": generation, "rows": len(df)})
+    return snapshot_store.read_snapshot(key)[0]
+
+
+def load_summary_data(get_client, sheet_id=SUMMARY_SHEET_ID, ttl=DATA_TTL):
+    return _load_snapshot(summary_key(sheet_id), lambda: fetch_summary_data(get_client(), sheet_id), ttl)
+
+
+# স্ন্যাপশট নেই বা margin সেকেন্ডের মধ্যে TTL পার হয়ে যাবে
+def needs_refresh(key, ttl=DATA_TTL, margin=0):
+    return _fresh_snapshot(key, ttl - margin) is None
+
+
+# শিটের modifiedTime স্ন্যাপশটের পুরো লোডের সময়ের মতোই থাকলে (মাঝে ডেল্টা সিঙ্কও হয়নি) স্ন্যাপশট এখনো ঠিক আছে, TTL আবার শুরু
+def _check_state(key, modified_time):
+    state = {"checked_at": time.time(), "modified_time": modified_time}
+    snap = snapshot_store.read_snapshot(key)
+    if snap is not None and snap[1].get("modified_time") == modified_time:
+        state["verified_at"] = state["checked_at"]
+    return state
+
+
+# Force Refresh: শিটের modifiedTime আগের মতো থাকলে কিছুই নামানো হয় না; বদলালে পুরো রিলোড (পুরনো রো এর এডিট সহ)
+# রিটার্ন: নতুন করে নামানো হয়েছে কিনা
+def refresh_data_if_changed(get_client, sheet_id):
+    key = data_key(sheet_id)
+
+    def check():
+        if _fresh_snapshot(key, None) is not None:
+            client = get_client()
+            modified_time = _last_update_time(client.open_by_key(sheet_id))
+            if modified_time is not None and modified_time == snapshot_store.read_state(key).get("modified_time"):
+                snapshot_store.write_state(key, _check_state(key, modified_time))
+                return False
+        _reload_data(get_client(), sheet_id)
+        return True
+
+    return fetch_scheduler.SCHEDULER.run(f"{key}:refresh", check)
+
+
+def refresh_summary_if_changed(get_client, sheet_id=SUMMARY_SHEET_ID):
+    key = summary_key(sheet_id)
+
+    def check():
+        modified_time = _last_update_time(get_client().open_by_key(sheet_id))
+        state = snapshot_store.read_state(key)
+        if (_fresh_snapshot(key, None) is not None and modified_time is not None
+                and modified_time == state.get("modified_time")):
+            snapshot_store.write_state(key, _check_state(key, modified_time))
+            return False
+        _write_summary(get_client(), sheet_id, modified_time)
+        return True
+
+    return fetch_scheduler.SCHEDULER.run(f"{key}:refresh", check)
+
+
+def _write_summary(client, sheet_id, modified_time):
+    key = summary_key(sheet_id)
+    snapshot_store.write_snapshot(key, fetch_summary_data(client, sheet_id),
+                                  {"schema_version": schema.SCHEMA_VERSION, "modified_time": modified_time})
+    snapshot_store.write_state(key, {"checked_at": time.time(), "modified_time": modified_time})
+    return snapshot_store.read_snapshot(key)[0]
+
@@ -0,0 +1,146 @@
+import functools
+import os
+import secrets
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+import perf
+import snapshot_store
+
+# এক্সপোর্ট ফাইল ডিস্কে লেখা হয় (একই ভিউ আবার চাইলে সেই ফাইলটাই), EXPORT_TTL পরে মুছে যায়
+# static/ এর ভেতরে, তাই Streamlit এর স্ট্যাটিক সার্ভিং (enableStaticServing) ডিস্ক থেকেই ফাইলটা পাঠায়, সেশনের মেমরিতে আসে না
+# স্ট্যাটিক URL এ লগইন/সেশন চেক নেই, তাই ফাইলের নামে র‍্যান্ডম টোকেন: লিংক যে পেয়েছে শুধু সে-ই নামাতে পারে
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "exports")
+EXPORT_URL = "app/static/exports"
+EXPORT_TTL = 86400
+STATIC_MAX_BYTES = 200 * 1024 * 1024  # Streamlit এর স্ট্যাটিক সার্ভিং এর চেয়ে বড় ফাইলে 404 দেয়
+CHUNK_ROWS = 20_000  # একবারে এতগুলো রো ফাইলে লেখা হয়, পুরো ফাইল কখনো মেমরিতে থাকে না
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "XLSX": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+_files = {}  # (name, *key, fmt) -> এই প্রসেসে লেখা ফাইল
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _chunks(df):
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS]
+
+
+def write_csv(df, path):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:  # utf-8-sig: Excel এ বাংলা/ইউনিকোড ঠিক দেখায়
+        df.iloc[:0].to_csv(f, index=False, lineterminator="\r\n")
+        for chunk in _chunks(df):
+            chunk.to_csv(f, header=False, index=False, lineterminator="\r\n")
+
+
+def write_xlsx(df, path):
+    from openpyxl import Workbook  # শুধু XLSX এক্সপোর্টে লাগে
+
+    # write_only: রো গুলো সরাসরি ফাইলে যায়, পুরো শিট মেমরিতে বানানো হয় না
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Data")
+    ws.append([str(c) for c in df.columns])
+    for chunk in _chunks(df):
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append([v.to_pydatetime() if isinstance(v, pd.Timestamp) else v for v in row])
+    wb.save(path)
+
+
+def write_parquet(df, path):
+    writer = None
+    try:
+        for chunk in _chunks(snapshot_store.arrow_safe(df)):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+            writer.write_table(table.cast(writer.schema))
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+WRITERS = {"CSV": write_csv, "XLSX": write_xlsx, "Parquet": write_parquet}
+
+
+def _file_key(name, key, fmt):
+    return (name,) + tuple(key) + (fmt,)
+
+
+# ভিউটি আগে এক্সপোর্ট হয়ে থাকলে (আর ফাইল এখনো থাকলে) তার পাথ, নাহলে None
+def export_path(name, key, fmt):
+    path = _files.get(_file_key(name, key, fmt))
+    return path if path is not None and os.path.exists(path) else None
+
+
+# মেয়াদ শেষের ফাইল মোছা, আর যে ফাইল আর নেই তার ম্যাপ ও লক বাদ (নাহলে প্রতিটি ভিউয়ের লক চিরকাল থেকে যায়)
+def _cleanup(now):
+    for entry in os.scandir(EXPORT_DIR):
+        try:
+            if now - entry.stat().st_mtime > EXPORT_TTL:
+                os.remove(entry.path)
+        except OSError:
+            pass
+    with _locks_guard:
+        for file_key, path in list(_files.items()):
+            if not os.path.exists(path):
+                del _files[file_key]
+        for file_key, lock in list(_locks.items()):
+            if file_key not in _files and not lock.locked():
+                del _locks[file_key]
+
+
+# ভিউয়ের (নাম + ক্যাশ কী) ফাইল; একই ফাইল একসাথে কয়েকজন চাইলে একবারই লেখা হয়
+def export(df, name, key, fmt):
+    file_key = _file_key(name, key, fmt)
+    with _locks_guard:
+        lock = _locks.setdefault(file_key, threading.Lock())
+    with lock:
+        path = export_path(name, key, fmt)
+        if path is None:
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            _cleanup(time.time())
+            path = os.path.join(EXPORT_DIR, f"{name}-{secrets.token_urlsafe(24)}.{FORMATS[fmt][0]}")
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with perf.stage(f"export_{fmt.lower()}"):
+                WRITERS[fmt](df, tmp_path)
+            os.replace(tmp_path, path)
+            _files[file_key] = path
+    return path
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# প্রতি ফরম্যাটে একটি বাটন: ক্লিক করলে ফাইল তৈরি হয় (শুধু এই সেশনের রান অপেক্ষা করে), তারপর স্ট্যাটিক URL এর ডাউনলোড লিংক
+# ফাইল আগে থেকেই থাকলে (অন্য কেউ একই ভিউ এক্সপোর্ট করেছে) সরাসরি লিংক
+# STATIC_MAX_BYTES এর চেয়ে বড় ফাইল Streamlit এর নিজের ডাউনলোড বাটনে, ক্লিক করলে তবেই ডিস্ক থেকে পড়া হয়
+def download_buttons(df, name, key):
+    cols = st.columns(len(FORMATS) + 3)
+    for col, (fmt, (ext, mime)) in zip(cols, FORMATS.items()):
+        path = export_path(name, key, fmt)
+        if path is None and col.button(f"⬇️ {fmt}", key=f"{name}_export_{fmt}"):
+            with col, st.spinner(f"Preparing {fmt}..."):
+                path = export(df, name, key, fmt)
+        if path is None:
+            continue
+        if os.path.getsize(path) > STATIC_MAX_BYTES:
+            col.download_button(f"📥 {fmt}", data=functools.partial(_read, path), file_name=f"{name}.{ext}",
+                                mime=mime, key=f"{name}_download_{fmt}")
+        else:
+            col.markdown(f'<a href="{EXPORT_URL}/{os.path.basename(path)}" download="{name}.{ext}" type="{mime}">📥 {fmt}</a>',
+                         unsafe_allow_html=True)
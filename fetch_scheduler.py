@@ -0,0 +1,112 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+import google.auth.exceptions
+import requests
+from gspread.exceptions import APIError
+
+# Sheets API এর রিড কোটা প্রতি মিনিটে ৬০ (প্রতি ইউজার), তাই একটু কম রাখা
+READS_PER_MINUTE = float(os.environ.get("SHEETS_READS_PER_MINUTE", "50"))
+READ_BURST = int(os.environ.get("SHEETS_READ_BURST", "10"))
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 32.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# স্ট্যাটাস কোড ছাড়া যেসব নেটওয়ার্ক এরর আবার চেষ্টা করলে ঠিক হতে পারে
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    google.auth.exceptions.TransportError,
+)
+
+
+# কোটা/নেটওয়ার্ক এরর কয়েকবার চেষ্টার পরেও থেকে গেলে
+class SheetsUnavailable(Exception):
+    pass
+
+
+def _retryable(e):
+    if isinstance(e, (APIError, requests.exceptions.HTTPError)):
+        return getattr(e.response, "status_code", None) in RETRY_STATUS
+    return isinstance(e, TRANSIENT_ERRORS)
+
+
+# টোকেন বাকেট: মিনিটে rate টি টোকেন জমা হয় (সর্বোচ্চ burst), প্রতিটি API কল টোকেন খরচ করে
+class TokenBucket:
+    def __init__(self, per_minute=READS_PER_MINUTE, burst=READ_BURST):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost=1):
+        cost = min(cost, self.burst)  # burst এর বেশি টোকেন কখনো জমে না, তাই বেশি চাইলে চিরকাল অপেক্ষা করত
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    return
+                wait = (cost - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# একই শিটের জন্য একসাথে আসা রিকোয়েস্ট গুলো একটি ফেচেই মিলে যায় (single-flight), বাকিরা সেই ফলাফল পায়
+class FetchScheduler:
+    def __init__(self, bucket=None, max_attempts=MAX_ATTEMPTS):
+        self.bucket = bucket or TokenBucket()
+        self.max_attempts = max_attempts
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        self.retries = 0
+
+    def run(self, key, fn):
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = self._call(fn)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    # 429/5xx/নেটওয়ার্ক এরর হলে exponential backoff (jitter সহ) দিয়ে আবার চেষ্টা
+    # টোকেন এখানে নয়, sheets_client এ প্রতিটি আসল API কলে খরচ হয় (একটি ফেচে কয়টি কল হবে আগে জানা যায় না)
+    def _call(self, fn):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return fn()
+            except Exception as e:
+                if not _retryable(e):
+                    raise
+                if attempt == self.max_attempts:
+                    raise SheetsUnavailable(
+                        f"Google Sheets is busy or unreachable, tried {attempt} times: {e}") from e
+                self.retries += 1
+                time.sleep(min(MAX_DELAY, BASE_DELAY * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0))
+
+
+# প্রসেসের সব সেশন, ওয়ার্মার ও থ্রেড পুল এই একটি শিডিউলার ব্যবহার করে
+SCHEDULER = FetchScheduler()
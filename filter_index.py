@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+# সাইডবারের যে কলামগুলো দিয়ে ফিল্টার হয়
+INDEX_COLS = ['Team', 'Shift', 'Employee Type', 'Product']
+_EMPTY = np.array([], dtype=np.intp)
+
+
+# লোডের সময় একবার বানানো: তারিখ অনুযায়ী সাজানো রো পজিশন + প্রতিটি ভ্যালুর রো পজিশন
+def build_index(df):
+    dates = df['date'].to_numpy()
+    order = np.argsort(dates, kind='stable')
+    positions = {
+        col: {value: np.asarray(pos, dtype=np.intp) for value, pos in df.groupby(col, observed=True).indices.items()}
+        for col in INDEX_COLS if col in df.columns
+    }
+
+    # সাইডবারের উইজেটের জন্য ক্যাটালগ (আলাদা ভ্যালু ও তারিখের সীমা)
+    catalog = {
+        "date_min": df['date'].min(),
+        "date_max": df['date'].max(),
+        "values": {col: sorted(str(v) for v in values) for col, values in positions.items()},
+    }
+    return {"dates": dates, "order": order, "sorted_dates": dates[order], "positions": positions, "catalog": catalog}
+
+
+def filter_positions(index, start_date, end_date, selections):
+    start = pd.Timestamp(start_date).to_datetime64()
+    end = pd.Timestamp(end_date).to_datetime64()
+
+    # কোনো ভ্যালু সিলেক্ট থাকলে সবচেয়ে ছোট সেট থেকে শুরু করে intersection, তারপর তারিখ চেক
+    value_sets = sorted(
+        (index["positions"][col].get(value, _EMPTY) for col, value in selections.items() if value != "All"),
+        key=len,
+    )
+    if value_sets:
+        pos = value_sets[0]
+        for other in value_sets[1:]:
+            pos = np.intersect1d(pos, other, assume_unique=True)
+        dates = index["dates"][pos]
+        return pos[(dates >= start) & (dates <= end)]
+
+    # শুধু তারিখের ফিল্টার হলে সাজানো তারিখে বাইনারি সার্চ
+    lo = np.searchsorted(index["sorted_dates"], start, side='left')
+    hi = np.searchsorted(index["sorted_dates"], end, side='right')
+    return np.sort(index["order"][lo:hi])
+
+
+def filter_frame(df, index, start_date, end_date, selections):
+    return df.take(filter_positions(index, start_date, end_date, selections))
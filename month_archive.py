@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+from datetime import date, datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import perf
+import snapshot_store
+
+# বন্ধ হয়ে যাওয়া মাসগুলো এখানে Parquet হিসেবে থাকে: ARCHIVE_DIR/month=YYYY-MM/data.parquet
+ARCHIVE_DIR = os.environ.get(
+    "ARCHIVE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".archive")
+)
+COMPRESSION = "zstd"
+ROW_GROUP_SIZE = 100_000
+CLOSE_AFTER_DAYS = int(os.environ.get("ARCHIVE_CLOSE_AFTER_DAYS", "3"))  # মাস শেষের এত দিন পরে আর এডিট হয় না ধরা হয়
+PARTITIONING = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+META_KEY = b"archive_meta"
+
+
+# "December 2025" -> "2025-12"; অন্য ফরম্যাট হলে None
+def month_id(label):
+    try:
+        return datetime.strptime(label.strip(), "%B %Y").strftime("%Y-%m")
+    except ValueError:
+        return None
+
+
+def is_closed(label, today=None):
+    month = month_id(label)
+    if month is None:
+        return False
+    year, mon = map(int, month.split("-"))
+    next_month = date(year + mon // 12, mon % 12 + 1, 1)
+    return ((today or date.today()) - next_month).days >= CLOSE_AFTER_DAYS
+
+
+def partition_path(month):
+    return os.path.join(ARCHIVE_DIR, f"month={month}", "data.parquet")
+
+
+def months():
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    return sorted(name.split("=", 1)[1] for name in os.listdir(ARCHIVE_DIR)
+                  if name.startswith("month=") and os.path.exists(os.path.join(ARCHIVE_DIR, name, "data.parquet")))
+
+
+# আর্কাইভের ভার্সন (কোনো মাস নতুন করে লেখা হলে বদলায়), ট্রেন্ড ক্যাশের কী হিসেবে
+def version():
+    return "+".join(f"{m}@{os.stat(partition_path(m)).st_mtime_ns}" for m in months())
+
+
+# meta: মাসটির ডাটা স্ন্যাপশটের meta (স্কিমা ভার্সন, fetched_at ইত্যাদি), আর্কাইভ থেকে স্ন্যাপশট আবার বানাতে লাগে
+def write_month(label, df, meta=None):
+    path = partition_path(month_id(label))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(snapshot_store.arrow_safe(df), preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), META_KEY: json.dumps(meta or {}).encode()})
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table, tmp_path, compression=COMPRESSION, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp_path, path)
+
+
+# একটি মাস পুরোটা (df, meta); আর্কাইভে না থাকলে None
+# শুধু স্ন্যাপশট না থাকলে সেটা আবার লেখার জন্য, UI বন্ধ মাসও memory-map করা স্ন্যাপশট থেকেই পড়ে
+def read_month(label):
+    try:
+        with perf.stage("archive_read"):
+            table = pq.read_table(partition_path(month_id(label)))
+    except FileNotFoundError:
+        return None
+    meta = json.loads((table.schema.metadata or {}).get(META_KEY, b"{}"))
+    return table.to_pandas(), meta
+
+
+# কয়েক মাস মিলিয়ে পড়া: শুধু দরকারি মাসের ফোল্ডার (partition pruning) ও দরকারি কলাম (projection)
+# where: {কলাম: ভ্যালু}, Parquet এর row group স্ট্যাটিস্টিক্স দিয়েও বাদ পড়ে
+def scan(columns, month_ids=None, where=None):
+    available = months()
+    if month_ids is not None:
+        available = [m for m in available if m in set(month_ids)]
+    if not available:
+        return pd.DataFrame(columns=["month"] + list(columns))
+
+    dataset = ds.dataset([partition_path(m) for m in available], format="parquet",
+                         partitioning=PARTITIONING, partition_base_dir=ARCHIVE_DIR)
+    condition = None
+    for col, value in (where or {}).items():
+        term = ds.field(col) == value
+        condition = term if condition is None else condition & term
+    with perf.stage("archive_scan"):
+        table = dataset.to_table(columns=["month"] + list(columns), filter=condition)
+    return table.to_pandas()
+
+
+# আর্টিস্ট বা টিমের মাস অনুযায়ী প্রোডাকশন (Orders, Time) - আর্কাইভের মাসগুলো থেকে
+def monthly_production(by, value):
+    frame = scan(["Time"], where={by: value})
+    return production_by_month(frame)
+
+
+def production_by_month(frame):
+    out = frame.groupby("month", observed=True).agg(Orders=("Time", "size"), Time=("Time", "sum"))
+    return out.reset_index()
+
+
+# মাসের আগের মাসের তুলনায় (MoM) ও আগের বছরের একই মাসের তুলনায় (YoY) পরিবর্তন %
+def with_changes(monthly):
+    monthly = monthly.sort_values("month").reset_index(drop=True)
+    orders = monthly.set_index("month")["Orders"]
+    periods = pd.PeriodIndex(monthly["month"], freq="M")
+
+    def change(offset):
+        prev = orders.reindex((periods - offset).strftime("%Y-%m")).to_numpy()
+        return ((orders.to_numpy() - prev) / prev * 100).round(1)
+
+    monthly["MoM %"] = change(1)
+    monthly["YoY %"] = change(12)
+    return monthly
+
+
+# আর্কাইভের মাসগুলো + এখনো খোলা মাসগুলো (লোড করা ফ্রেম থেকে), মাসের ক্রমে MoM/YoY সহ
+def production_trend(by, value, open_frames=None):
+    parts = [monthly_production(by, value)]
+    archived = set(months())
+    for label, df in (open_frames or {}).items():
+        month = month_id(label)
+        if month is None or month in archived:
+            continue
+        rows = df.loc[df[by] == value, ["Time"]]
+        parts.append(production_by_month(rows.assign(month=month)))
+    return with_changes(pd.concat(parts, ignore_index=True))
@@ -0,0 +1,69 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZE = 50  # ব্রাউজারে একবারে এতগুলো রো পাঠানো হয়
+
+
+def _matches(col, text):
+    # categorical কলামে শুধু ক্যাটাগরি গুলো খোঁজা হয়, প্রতি রো তে স্ট্রিং বানাতে হয় না
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        hit = np.asarray(col.cat.categories.astype(str).str.contains(text, case=False, regex=False))
+        codes = col.cat.codes.to_numpy()
+        return (codes >= 0) & hit[np.maximum(codes, 0)]
+    return col.astype(str).str.contains(text, case=False, regex=False).to_numpy()
+
+
+# সার্চ ও সর্ট সার্ভারে: ফলাফল হিসেবে রো পজিশনের ক্রম (পুরো ফ্রেমের কপি নয়)
+def query_positions(df, search="", sort_col=None, ascending=True):
+    pos = np.arange(len(df))
+    text = search.strip()
+    if text:
+        mask = np.zeros(len(df), dtype=bool)
+        for col in df.columns:
+            mask |= _matches(df[col], text)
+        pos = pos[mask]
+    if sort_col in df.columns:
+        values = df[sort_col].iloc[pos].reset_index(drop=True)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # ক্যাটাগরির ক্রম কোন মাসগুলো জোড়া লাগানো হয়েছে তার উপর নির্ভর করে, তাই ভ্যালু অনুযায়ী সাজানো
+            values = values.cat.set_categories(values.cat.categories.sort_values())
+        order = values.sort_values(ascending=ascending, kind='stable').index
+        pos = pos[order.to_numpy()]
+    return pos
+
+
+# পেজ করা টেবিল: শুধু দৃশ্যমান পেজটি পাঠানো হয়; selectable হলে সিলেক্ট করা রো গুলো (DataFrame) রিটার্ন করে
+def show(df, key, cache=None, cache_key=(), sort_col=None, ascending=True, selectable=False,
+         column_config=None, page_size=PAGE_SIZE):
+    c1, c2, c3 = st.columns([3, 2, 1])
+    search = c1.text_input("Search", key=f"{key}_search", placeholder="Search all columns...")
+    cols = ["(none)"] + list(df.columns)
+    sort_col = c2.selectbox("Sort by", cols, index=cols.index(sort_col) if sort_col in cols else 0, key=f"{key}_sort")
+    ascending = c3.selectbox("Order", ["Desc", "Asc"], index=1 if ascending else 0, key=f"{key}_order") == "Asc"
+
+    query = (search.strip(), sort_col, ascending)
+    if cache is not None:
+        pos = cache.get_or_compute(f"table:{key}", tuple(cache_key) + query,
+                                   lambda: query_positions(df, *query))
+    else:
+        pos = query_positions(df, *query)
+
+    pages = max(1, -(-len(pos) // page_size))
+    # সার্চ/সর্ট বদলালে পেজ ১ থেকে শুরু (আর আগের সিলেকশন অন্য রো তে চলে যায় না)
+    sig = zlib.crc32(repr(query).encode())
+    page = 1
+    if pages > 1:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page_{sig}_{pages}")
+    start = (page - 1) * page_size
+    page_df = df.take(pos[start:start + page_size])
+    st.caption(f"Rows {min(start + 1, len(pos)):,}–{start + len(page_df):,} of {len(pos):,}")
+
+    if not selectable:
+        st.dataframe(page_df, column_config=column_config, width="stretch", hide_index=True)
+        return None
+    event = st.dataframe(page_df, column_config=column_config, width="stretch", hide_index=True,
+                         on_select="rerun", selection_mode="multi-row", key=f"{key}_grid_{sig}_{page}")
+    return page_df.iloc[event.selection.rows] if event and event.selection.rows else page_df.iloc[0:0]
@@ -0,0 +1,147 @@
+import contextlib
+import cProfile
+import io
+import json
+import logging
+import marshal
+import os
+import pstats
+import threading
+import time
+
+# app.py সবার আগে এটা ইমপোর্ট করে, তাই প্রথম রানের (কোল্ড স্টার্ট) সময় এখান থেকে গোনা হয়
+_PROCESS_START = time.perf_counter()
+COLD_START_BUDGET_MS = float(os.environ.get("COLD_START_BUDGET_MS", "4000"))
+RERUN_BUDGET_MS = float(os.environ.get("RERUN_BUDGET_MS", "800"))
+# প্রতি রানের রিপোর্ট এক লাইন JSON হিসেবে এখানে যোগ হয়
+PERF_LOG_PATH = os.environ.get(
+    "PERF_LOG_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".perf", "runs.jsonl")
+)
+# ফাইল এর চেয়ে বড় হলে runs.jsonl.1 নামে সরিয়ে নতুন ফাইল শুরু (শুধু শেষ একটি পুরনো ফাইল থাকে)
+PERF_LOG_MAX_BYTES = int(os.environ.get("PERF_LOG_MAX_BYTES", str(10 * 2**20)))
+
+log = logging.getLogger("perf")
+_cold = True
+_lock = threading.Lock()
+_local = threading.local()  # এই থ্রেডে চলা রানের টাইমার (data_loader এর ভেতরের ধাপগুলোর জন্য)
+_profile_lock = threading.Lock()  # প্রসেসে একসাথে একটিই cProfile চলতে পারে (Python 3.12+ এ দ্বিতীয় enable() এরর দেয়)
+
+
+def rss_mb():
+    # Linux এ বর্তমান RSS; অন্য OS এ None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# একটি স্ক্রিপ্ট রানের ধাপ অনুযায়ী সময় (ms) ও মেমরি (MB), শেষে বাজেটের সাথে মিলিয়ে লগ করা হয়
+class RunTimer:
+    def __init__(self, page=None):
+        global _cold
+        with _lock:
+            self.cold, _cold = _cold, False
+        self.page = page
+        self.started = _PROCESS_START if self.cold else time.perf_counter()
+        self._last = self.started
+        self._last_rss = rss_mb()
+        self.stages = {}
+        self.memory = {}
+        self.detail = {}
+        _local.timer = self
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._last) * 1000
+        self._last = now
+        rss = rss_mb()
+        if rss is not None and self._last_rss is not None:
+            self.memory[stage] = self.memory.get(stage, 0.0) + rss - self._last_rss
+        self._last_rss = rss
+
+    def add_detail(self, name, ms):
+        self.detail[name] = self.detail.get(name, 0.0) + ms
+
+    def report(self):
+        total = (self._last - self.started) * 1000
+        budget = COLD_START_BUDGET_MS if self.cold else RERUN_BUDGET_MS
+        return {
+            "kind": "cold" if self.cold else "rerun",
+            "page": self.page,
+            "stages_ms": {k: round(v, 1) for k, v in self.stages.items()},
+            "stages_mem_mb": {k: round(v, 1) for k, v in self.memory.items()},
+            "detail_ms": {k: round(v, 1) for k, v in self.detail.items()},
+            "rss_mb": round(self._last_rss, 1) if self._last_rss is not None else None,
+            "total_ms": round(total, 1),
+            "budget_ms": budget,
+            "over_budget": total > budget,
+        }
+
+    def finish(self, stage="page"):
+        self.mark(stage)
+        if getattr(_local, "timer", None) is self:
+            _local.timer = None
+        report = self.report()
+        level = logging.WARNING if report["over_budget"] else logging.INFO
+        log.log(level, "%s run %.0f ms (budget %.0f ms) %s", report["kind"], report["total_ms"],
+                report["budget_ms"], report["stages_ms"])
+        append_log(report)
+        return report
+
+
+# রানের ভেতরের নির্দিষ্ট কাজ (যেমন শিট থেকে আনা, স্ন্যাপশট পড়া) আলাদা করে মাপা; টাইমার না থাকলে কিছু করে না
+@contextlib.contextmanager
+def stage(name):
+    timer = getattr(_local, "timer", None)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timer is not None:
+            timer.add_detail(name, (time.perf_counter() - start) * 1000)
+
+
+def append_log(report, path=None):
+    path = path or PERF_LOG_PATH
+    record = json.dumps({"ts": time.time(), "pid": os.getpid(), **report})
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _lock:
+            try:
+                if os.path.getsize(path) >= PERF_LOG_MAX_BYTES:
+                    os.replace(path, f"{path}.1")
+            except FileNotFoundError:
+                pass
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(record + "\n")
+    except OSError as e:
+        log.warning("perf log not written: %s", e)
+
+
+# একটি রানের পুরো কল প্রোফাইল (শুধু স্ক্রিপ্ট থ্রেডের)
+# অন্য সেশন তখন প্রোফাইল করছে হলে start() None দেয়, অপেক্ষা করে না
+class Profiler:
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        if not _profile_lock.acquire(blocking=False):
+            return None
+        try:
+            self._profile.enable()
+        except ValueError:  # প্রসেসে অন্য কোনো প্রোফাইলার (যেমন ডিবাগার) চালু
+            _profile_lock.release()
+            return None
+        return self
+
+    def stop(self, top=40):
+        try:
+            self._profile.disable()
+        finally:
+            _profile_lock.release()
+        text = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=text)
+        raw = marshal.dumps(stats.stats)  # .prof ফাইল (snakeviz / pstats দিয়ে খোলা যায়)
+        stats.sort_stats("cumulative").print_stats(top)
+        return text.getvalue(), raw
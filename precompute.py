@@ -0,0 +1,151 @@
+# হেডলেস প্রি-কম্পিউট জব: প্রতিটি মাসের শিট get_data এর মতোই লোড করে মাস-ভিত্তিক ফলাফল গুলো আগে থেকে হিসাব করে রাখে
+# UI ডাটা ভার্সন (স্ন্যাপশট ফাইলের key@mtime) হুবহু মিললে এগুলো সরাসরি পড়ে, শুধু স্লাইস করে
+# বন্ধ মাসের স্ন্যাপশট শুধু শিট এডিট হলেই বদলায় (ঘণ্টায় একবার চেক), তাই সেগুলোতে প্রায় সবসময় কাজে লাগে; খোলা মাসে শুধু পরের ডেল্টা সিঙ্ক (SYNC_INTERVAL) পর্যন্ত,
+# তারপর জব আবার চলা পর্যন্ত UI নিজেই হিসাব করে
+#
+#   python precompute.py                          # DATA_SOURCES এর সব মাস
+#   python precompute.py --months "January 2026"
+#   */30 * * * * cd /path/to/app && python precompute.py >> .perf/precompute.log 2>&1
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import analytics
+import data_loader
+import snapshot_store
+import tracking_rules
+
+RESULT_VERSION = 2  # হিসাবের নিয়ম বদলালে বাড়াতে হবে, তাহলে পুরনো ফলাফল আর ব্যবহার হবে না
+TABLES = ["cube", "avgs", "team_sum", "artist_brk"] + tracking_rules.TRACKING_FLAGS
+ROW_COL = "__row"  # ট্র্যাকিং লিস্টে df_raw এর রো পজিশন (ফিল্টার অনুযায়ী স্লাইস করার জন্য)
+
+log = logging.getLogger("precompute")
+
+
+def result_key(sheet_id, name):
+    return f"result-{sheet_id}-{name}"
+
+
+# একটি মাসের সব ফলাফল (ফিল্টার ছাড়া পুরো মাস)
+def compute(df):
+    cube = analytics.build_cube(df)
+    avgs = analytics.man_day_avgs(cube)
+    results = {
+        "cube": cube,
+        "avgs": pd.DataFrame([(p, j, v) for (p, j), v in avgs.items()], columns=['Product', 'Job Type', 'avg']),
+        "team_sum": analytics.team_summary(df),
+        "artist_brk": analytics.artist_breakdown(df),
+    }
+    flags = tracking_rules.evaluate(df)
+    rows = np.arange(len(df))
+    lists = tracking_rules.tracking_lists(df, flags, rows)
+    for flag in tracking_rules.TRACKING_FLAGS:
+        results[flag] = lists[flag].assign(**{ROW_COL: rows[flags[flag]]})
+    return results
+
+
+def write_results(sheet_id, df):
+    meta = {"data_version": data_loader.data_version(df), "result_version": RESULT_VERSION, "computed_at": time.time()}
+    for name, frame in compute(df).items():
+        snapshot_store.write_snapshot(result_key(sheet_id, name), frame, meta)
+    return meta
+
+
+# এই ডাটা ভার্সনের জন্য প্রি-কম্পিউট করা ফলাফল (সব টেবিল থাকলে), নাহলে None
+def load_results(sheet_id, version):
+    results = {}
+    for name in TABLES:
+        snap = snapshot_store.read_snapshot(result_key(sheet_id, name))
+        if snap is None or snap[1].get("data_version") != version or snap[1].get("result_version") != RESULT_VERSION:
+            return None
+        results[name] = snap[0]
+    return results
+
+
+def man_day_avgs(results):
+    return {(p, j): v for p, j, v in results["avgs"].itertuples(index=False, name=None)}
+
+
+# analytics.dashboard_views এর মতো, কিন্তু প্রি-কম্পিউট করা পুরো মাসের কিউব থেকে (get_cube লাগে না)
+# ফিল্টার ছাড়া পুরো মাস হলে গড়ও আগে থেকে হিসাব করা টেবিল থেকে
+def dashboard_views(results, full_range, start_date, end_date, selections):
+    views = analytics.dashboard_views(results["cube"], start_date, end_date, selections)
+    if full_range and all(value == "All" for value in selections.values()):
+        views["avgs"] = man_day_avgs(results)
+    return views
+
+
+# টিম/শিফট ফিল্টার প্রি-কম্পিউট টেবিল থেকে স্লাইস করা যায়; তারিখ/প্রোডাক্ট/এমপ্লয়ি টাইপ ফিল্টার থাকলে None
+def slice_summary(table, full_range, selections):
+    if not full_range or any(selections.get(col, "All") != "All" for col in ('Product', 'Employee Type')):
+        return None
+    mask = np.ones(len(table), dtype=bool)
+    for col in ('Team', 'Shift'):
+        value = selections.get(col, "All")
+        if value != "All":
+            mask &= (table[col] == value).to_numpy()
+    return table[mask].reset_index(drop=True)
+
+
+# ফিল্টার করা রো পজিশনের (rows) ট্র্যাকিং লিস্ট, tracking_rules.tracking_lists এর মতোই
+def slice_tracking(results, rows):
+    lists = {}
+    for flag in tracking_rules.TRACKING_FLAGS:
+        frame = results[flag]
+        frame = frame[np.isin(frame[ROW_COL].to_numpy(), rows)]
+        lists[flag] = frame.drop(columns=ROW_COL).set_axis(pd.Index(frame[ROW_COL].to_numpy()), axis=0)
+    lists["index"] = {flag: tracking_rules.TicketIndex(lists[flag]) for flag in tracking_rules.TRACKING_FLAGS}
+    return lists
+
+
+# সার্ভিস অ্যাকাউন্ট: JSON_KEY এনভায়রনমেন্ট ভ্যারিয়েবল, নাহলে .streamlit/secrets.toml (অ্যাপ যেটা ব্যবহার করে)
+def credentials_info(path=None):
+    if path:
+        with open(path) as f:
+            return json.load(f)
+    if os.environ.get("JSON_KEY"):
+        return json.loads(os.environ["JSON_KEY"])
+    import tomllib
+    secrets = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+    with open(secrets, "rb") as f:
+        return json.loads(tomllib.load(f)["JSON_KEY"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute month-level dashboard and tracking results")
+    parser.add_argument("--months", nargs="+", default=list(data_loader.DATA_SOURCES),
+                        help="month labels from DATA_SOURCES")
+    parser.add_argument("--credentials", help="service account JSON file (default: JSON_KEY env or secrets.toml)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    unknown = [m for m in args.months if m not in data_loader.DATA_SOURCES]
+    if unknown:
+        parser.error(f"unknown month(s): {', '.join(unknown)}")
+
+    import sheets_client
+    client = sheets_client.connect(credentials_info(args.credentials))
+
+    failed = 0
+    for label in args.months:
+        sheet_id = data_loader.DATA_SOURCES[label]
+        start = time.perf_counter()
+        try:
+            df = data_loader.load_data(lambda: client, sheet_id)
+            meta = write_results(sheet_id, df)
+        except Exception:
+            failed += 1
+            log.exception("%s: precompute failed", label)
+            continue
+        log.info("%s: %d rows, version %s, %.1f s", label, len(df), meta["data_version"], time.perf_counter() - start)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
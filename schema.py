@@ -0,0 +1,102 @@
+import logging
+
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+log = logging.getLogger("schema")
+
+# স্কিমা বদলালে এটা বাড়াতে হবে, তাহলে পুরনো স্ন্যাপশট বাদ দিয়ে নতুন করে লোড হবে
+SCHEMA_VERSION = 2
+
+# প্রতিটি শিটের কলাম কোন টাইপে ঢুকবে তার ঘোষণা
+DATA_SCHEMA = {
+    "columns": "strip",
+    "rename": {'Team name': 'Team'},  # জানুয়ারি শিটের "Team name" থাকলে সেটাকে "Team" করা
+    "dates": ['date'],  # খালি/ভুল তারিখের রো মুছে ফেলা হবে
+    "numeric": ['Time', 'SQM'],
+    "integer": ['Ticket ID'],
+    "category": ['Product', 'Job Type', 'Employee Type', 'Team', 'Name', 'Shift'],
+}
+
+SUMMARY_SCHEMA = {
+    "columns": "upper",
+    "rename": {},
+    "dates": [],
+    "numeric": [
+        'DAY', 'FLOORPLAN', 'MEASUREMENT', 'AUTOCAD', 'URBAN ANGLES', 'VANBREEMEDIA', 'RE_WORK',
+        'LIVE ORDER', 'FP TIME', 'MRP TIME', 'CAD TIME', 'URBAN ANGLES TIME', 'RE_WORK TIME',
+        'WORKING TIME', 'AVG TIME', 'FP AVG', 'MRP AVG', 'CAD AVG', 'TUESDAY TO FRIDAY AVG', 'SATURDAY TO MONDAY'
+    ],
+    "integer": [],
+    "category": [],
+}
+
+
+def normalize_columns(columns, style):
+    if style == "upper":
+        # সব বড় হাতের এবং অতিরিক্ত স্পেস রিমুভ
+        return [" ".join(str(c).split()).upper() for c in columns]
+    return [str(c).strip() for c in columns]
+
+
+# তারিখ কলামের ফরম্যাট একবারই ঠিক করা (pandas এর মতো প্রথম ভ্যালু দেখে), যাতে পরের চাঙ্ক/সিঙ্কের রো একই ফরম্যাটে পার্স হয়
+# known এ আগে থেকে থাকা কলাম বদলায় না; অনুমান করা না গেলে "mixed" (প্রতিটি ভ্যালু আলাদা করে, pandas এর fallback এর মতো)
+def guess_date_formats(df, schema, known=None):
+    formats = dict(known or {})
+    names = normalize_columns(df.columns, schema["columns"])
+    source = {schema["rename"].get(name, name): col for name, col in zip(names, df.columns)}
+    for col in schema["dates"]:
+        if col in formats or col not in source:
+            continue
+        for value in df[source[col]]:
+            if isinstance(value, str) and value.strip().lower() not in ("", "nat", "nan", "none", "now", "today"):
+                formats[col] = guess_datetime_format(value) or "mixed"
+                break
+    return formats
+
+
+def apply_schema(df, schema, date_formats=None):
+    df.columns = normalize_columns(df.columns, schema["columns"])
+    if schema["rename"]:
+        df = df.rename(columns={k: v for k, v in schema["rename"].items() if k in df.columns})
+
+    # তারিখ native datetime64 (দিনের শুরু) হিসেবে রাখা, খালি রো (NaT) মুছে ফেলা
+    for col in schema["dates"]:
+        df[col] = pd.to_datetime(df[col], errors='coerce', format=(date_formats or {}).get(col))
+        df = df.dropna(subset=[col])
+        df[col] = df[col].dt.normalize()
+
+    # নিউমেরিক কনভার্সন
+    for col in schema["numeric"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    # পূর্ণসংখ্যা নয় এমন ভ্যালু (টেক্সট, "1234.5") NA, রো থাকে কিন্তু লগে লেখা হয় (Int64 এ ভগ্নাংশ কাস্ট করলে এরর হয়)
+    for col in schema["integer"]:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce')
+            values = values.mask(values.notna() & (values % 1 != 0))
+            invalid = values.isna() & df[col].notna() & df[col].astype(str).str.strip().ne("")
+            if invalid.any():
+                log.warning("%s: %d row(s) are not whole numbers and were set to NA, e.g. %s",
+                            col, invalid.sum(), df.loc[invalid, col].head(5).tolist())
+            df[col] = values.astype('Int64')
+
+    # বারবার রিপিট হওয়া টেক্সট কলামগুলো categorical (মেমরি কম, ফিল্টার দ্রুত)
+    for col in schema["category"]:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip().astype('category')
+    return df
+
+
+# ডেল্টা সিঙ্কে নতুন রো বা একাধিক মাস জোড়া লাগানোর সময় categorical কলামের ক্যাটাগরি মিলিয়ে নেওয়া
+def concat_frames(df, new_df, schema):
+    return concat_all([df, new_df], schema)
+
+
+def concat_all(frames, schema):
+    out = pd.concat(frames, ignore_index=True)
+    for col in schema["category"]:
+        if all(col in f.columns for f in frames):
+            out[col] = pd.api.types.union_categoricals([f[col] for f in frames], ignore_order=True)
+    return out
@@ -0,0 +1,120 @@
+import datetime
+import os
+import queue
+import threading
+import time
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.service_account import Credentials
+from gspread.spreadsheet import Spreadsheet
+from gspread.worksheet import Worksheet
+
+import fetch_scheduler
+
+SCOPES = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+POOL_SIZE = int(os.environ.get("SHEETS_POOL_SIZE", "8"))  # একসাথে সর্বোচ্চ এতগুলো HTTP কানেকশন
+REFRESH_MARGIN = 300  # টোকেনের মেয়াদ শেষ হওয়ার এত সেকেন্ড আগেই নতুন টোকেন নেওয়া হবে
+SHEETS_API = "https://sheets.googleapis.com/"  # এই ঠিকানার GET কলগুলো রিড কোটায় গোনা হয়
+HANDLE_TTL = 3600  # খোলা শিটের মেটাডাটা (ওয়ার্কশিটের লিস্ট) এতক্ষণ পর আবার আনা হবে
+
+
+# requests.Session এর জায়গায় বসে: প্রতিটি রিকোয়েস্ট পুল থেকে আলাদা একটি সেশন নেয়, তাই একাধিক থ্রেড একসাথে চলতে পারে
+class PooledSession:
+    def __init__(self, credentials, size=POOL_SIZE):
+        self.credentials = credentials
+        self.headers = {}
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._refresh_lock = threading.Lock()
+
+    def _expires_in(self):
+        expiry = self.credentials.expiry
+        if expiry is None:
+            return 0
+        if expiry.tzinfo is None:
+            expiry = expiry.replace(tzinfo=datetime.timezone.utc)
+        return (expiry - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+
+    # সব সেশন একই ক্রেডেনশিয়াল শেয়ার করে; একটি থ্রেডই রিফ্রেশ করবে, বাকিরা নতুন টোকেন পাবে
+    def _ensure_token(self):
+        if self.credentials.token and self._expires_in() > REFRESH_MARGIN:
+            return
+        with self._refresh_lock:
+            if not self.credentials.token or self._expires_in() <= REFRESH_MARGIN:
+                self.credentials.refresh(Request())
+
+    def request(self, method, url, **kwargs):
+        # Sheets এর রিড কোটা প্রতিটি GET কলে খরচ হয় (চাঙ্ক, মেটাডাটা, রিট্রাই সব), Drive/রাইট কল আলাদা কোটায়
+        if method.upper() == "GET" and url.startswith(SHEETS_API):
+            fetch_scheduler.SCHEDULER.bucket.acquire()
+        self._ensure_token()
+        with self._slots:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                session = AuthorizedSession(self.credentials)
+            try:
+                return session.request(method, url, **kwargs)
+            finally:
+                self._idle.put(session)
+
+
+# প্রথমবার খোলার সময় পাওয়া মেটাডাটা থেকেই ওয়ার্কশিট হ্যান্ডেল দেওয়া হয়, প্রতি .worksheet() এ আলাদা API কল হয় না
+class CachedSpreadsheet(Spreadsheet):
+    def __init__(self, http_client, properties):
+        self._sheets = {}
+        self._worksheets = {}
+        super().__init__(http_client, properties)
+        self.opened_at = time.time()
+
+    def fetch_sheet_metadata(self, params=None):
+        metadata = super().fetch_sheet_metadata(params)
+        if params is None:
+            self._sheets = {s["properties"]["title"]: s["properties"] for s in metadata.get("sheets", [])}
+        return metadata
+
+    def worksheet(self, title):
+        handle = self._worksheets.get(title)
+        if handle is None:
+            properties = self._sheets.get(title)
+            if properties is None:
+                handle = super().worksheet(title)  # নতুন যোগ হওয়া ওয়ার্কশিট হতে পারে, মেটাডাটা আবার আনা
+            else:
+                handle = Worksheet(self, properties, self.id, self.client)
+            self._worksheets[title] = handle
+        return handle
+
+
+# সব সেশন শেয়ার করে এমন ক্লায়েন্ট: শিট আইডি অনুযায়ী খোলা হ্যান্ডেল ক্যাশ থাকে
+class SheetsClient(gspread.Client):
+    def __init__(self, credentials, pool_size=POOL_SIZE):
+        super().__init__(None, session=PooledSession(credentials, pool_size))
+        self._spreadsheets = {}
+        self._lock = threading.Lock()
+
+    def open_by_key(self, key):
+        with self._lock:
+            handle = self._spreadsheets.get(key)
+        if handle is None or time.time() - handle.opened_at > HANDLE_TTL:
+            try:
+                handle = CachedSpreadsheet(self.http_client, {"id": key})
+            except gspread.exceptions.APIError as ex:
+                if ex.response.status_code == 404:
+                    raise gspread.exceptions.SpreadsheetNotFound(ex.response) from ex
+                raise
+            with self._lock:
+                self._spreadsheets[key] = handle
+        return handle
+
+    def forget(self, key=None):
+        with self._lock:
+            if key is None:
+                self._spreadsheets.clear()
+            else:
+                self._spreadsheets.pop(key, None)
+
+
+def connect(creds_info, pool_size=POOL_SIZE):
+    credentials = Credentials.from_service_account_info(creds_info, scopes=SCOPES)
+    return SheetsClient(credentials, pool_size)
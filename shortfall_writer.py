@@ -0,0 +1,206 @@
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+# প্রতি প্রসেসের নিজস্ব জার্নাল ফাইল; প্রসেস বন্ধ হয়ে গেলে অন্য প্রসেস সেটার বাকি রো নিয়ে নেয়
+JOURNAL_DIR = os.environ.get(
+    "SHORTFALL_JOURNAL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".journal")
+)
+FLUSH_INTERVAL = 2.0
+BATCH_SIZE = 200
+MAX_RETRY_DELAY = 300
+MAX_ATTEMPTS = 10  # এতবার ব্যর্থ হলে রো টি ডেড ফাইলে সরানো হয় (প্রায় ১৩ মিনিট ধরে চেষ্টা)
+DEAD_FILE = "dead-shortfall.jsonl"  # shortfall-*.jsonl এর সাথে মেলে না, তাই কেউ জার্নাল হিসেবে নেয় না
+STALE_AFTER = 60  # এত সেকেন্ড ধরে হার্টবিট না থাকলে জার্নালটি পরিত্যক্ত ধরা হবে
+
+
+# Shortfall শিটে লেখার কিউ: রো গুলো আগে জার্নালে লেখা হয়, তারপর ব্যাকগ্রাউন্ডে append_rows দিয়ে ব্যাচে পাঠানো হয়
+class ShortfallWriter:
+    def __init__(self, get_client, journal_dir=JOURNAL_DIR, flush_interval=FLUSH_INTERVAL):
+        self.get_client = get_client
+        self.journal_dir = journal_dir
+        self.flush_interval = flush_interval
+        self.journal_path = os.path.join(journal_dir, f"shortfall-{os.getpid()}.jsonl")
+        self._pending = {}  # id -> entry (ঢোকানোর ক্রম ঠিক থাকে)
+        self._retry_at = {}  # (sheet_id, worksheet) -> পরের চেষ্টার সময়
+        self._failures = {}
+        self._attempts = {}  # id -> কতবার পাঠাতে ব্যর্থ হয়েছে
+        self.dead_path = os.path.join(journal_dir, DEAD_FILE)
+        self._cond = threading.Condition()
+        self._thread = None
+        self.last_error = None
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self._replay(self.journal_path)
+        claimed = self._claim_stale_journals()
+        # নেওয়া রো গুলো নিজের জার্নালে ডিস্কে (fsync) পৌঁছানোর পরেই পুরনো ফাইল মোছা, মাঝে ক্র্যাশ হলে রো হারায় না
+        self._compact()
+        for path in claimed:
+            os.remove(path)
+
+    # --- জার্নাল ---
+    def _read_journal(self, path):
+        pending = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # অর্ধেক লেখা শেষ লাইন
+                    if record["op"] == "add":
+                        pending[record["id"]] = record
+                    elif record["op"] == "done":
+                        for entry_id in record["ids"]:
+                            pending.pop(entry_id, None)
+        except FileNotFoundError:
+            pass
+        return pending
+
+    def _replay(self, path):
+        self._pending.update(self._read_journal(path))
+
+    # পরিত্যক্ত জার্নাল, আর আগের কোনো প্রসেস নিয়ে কম্প্যাক্ট করার আগেই বন্ধ হয়ে গেলে তার *.claimed-<pid> ফাইল
+    def _claim_stale_journals(self):
+        paths = glob.glob(os.path.join(self.journal_dir, "shortfall-*.jsonl"))
+        paths += glob.glob(os.path.join(self.journal_dir, "shortfall-*.jsonl.claimed-*"))
+        claimed_paths = []
+        for path in paths:
+            if path == self.journal_path:
+                continue
+            try:
+                if time.time() - os.path.getmtime(path) < STALE_AFTER:
+                    continue
+                claimed = f"{path.split('.claimed-')[0]}.claimed-{os.getpid()}"
+                os.rename(path, claimed)  # একটি প্রসেসই rename এ সফল হবে
+                os.utime(claimed)  # নেওয়া ফাইল নতুন দেখাবে, কম্প্যাক্ট শেষ হওয়ার আগে অন্য প্রসেস আবার নেবে না
+            except OSError:
+                continue
+            self._replay(claimed)
+            claimed_paths.append(claimed)
+        return claimed_paths
+
+    def _append_journal(self, records):
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # শুধু বাকি থাকা রো গুলো দিয়ে জার্নাল নতুন করে লেখা, যাতে ফাইল বড় না হয়
+    def _compact(self):
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._pending.values():
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+    # --- পাবলিক ---
+    # একই রো (যেমন দুবার সাবমিট) এখনো কিউতে থাকলে আবার যোগ হয় না
+    def enqueue(self, sheet_id, worksheet_name, rows):
+        with self._cond:
+            queued = {(e["sheet_id"], e["worksheet"], tuple(e["row"])) for e in self._pending.values()}
+            entries = []
+            for row in rows:
+                row = [str(v) for v in row]
+                if (sheet_id, worksheet_name, tuple(row)) in queued:
+                    continue
+                queued.add((sheet_id, worksheet_name, tuple(row)))
+                entries.append({"op": "add", "id": uuid.uuid4().hex, "sheet_id": sheet_id,
+                                "worksheet": worksheet_name, "row": row, "queued_at": time.time()})
+            self._append_journal(entries)
+            for entry in entries:
+                self._pending[entry["id"]] = entry
+            self._cond.notify()
+        return [entry["id"] for entry in entries]
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._pending)
+
+    # যে রো গুলো MAX_ATTEMPTS বার চেষ্টার পরেও লেখা যায়নি (সব প্রসেসের, ফাইল মুছে না ফেলা পর্যন্ত)
+    def dead_count(self):
+        try:
+            with open(self.dead_path, encoding="utf-8") as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="shortfall-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    # --- ব্যাকগ্রাউন্ড ফ্লাশ ---
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait(timeout=self.flush_interval)
+            try:
+                os.utime(self.journal_path)  # হার্টবিট
+            except OSError:
+                pass
+            self.flush()
+
+    def _failed(self, entry_id):
+        self._attempts[entry_id] = self._attempts.get(entry_id, 0) + 1
+        return self._attempts[entry_id] >= MAX_ATTEMPTS
+
+    def _finish(self, entries):
+        with self._cond:
+            self._append_journal([{"op": "done", "ids": [entry["id"] for entry in entries]}])
+            for entry in entries:
+                self._pending.pop(entry["id"], None)
+                self._attempts.pop(entry["id"], None)
+
+    # বারবার ব্যর্থ রো (যেমন ভুল শিট/ওয়ার্কশিট) কিউ থেকে সরিয়ে ডেড ফাইলে, যাতে জার্নাল সীমাহীন না বাড়ে
+    def _bury(self, entries, error):
+        if not entries:
+            return
+        with self._cond:
+            with open(self.dead_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps({**entry, "op": "dead", "error": str(error), "dead_at": time.time()}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        self._finish(entries)
+
+    def flush(self):
+        with self._cond:
+            groups = {}
+            for entry in self._pending.values():
+                groups.setdefault((entry["sheet_id"], entry["worksheet"]), []).append(entry)
+
+        now = time.time()
+        for target, entries in groups.items():
+            if self._retry_at.get(target, 0) > now:
+                continue
+            for start in range(0, len(entries), BATCH_SIZE):
+                batch = entries[start:start + BATCH_SIZE]
+                try:
+                    worksheet = self.get_client().open_by_key(target[0]).worksheet(target[1])
+                    worksheet.append_rows([entry["row"] for entry in batch])
+                except Exception as e:
+                    # কোটা/নেটওয়ার্ক এরর হলে রো জার্নালে থেকে যাবে, পরে আবার চেষ্টা (exponential backoff)
+                    failures = self._failures.get(target, 0) + 1
+                    self._failures[target] = failures
+                    self._retry_at[target] = time.time() + min(MAX_RETRY_DELAY, 2 ** failures)
+                    self.last_error = f"{target[1]}: {e}"
+                    self._bury([entry for entry in batch if self._failed(entry["id"])], e)
+                    break
+
+                self._failures.pop(target, None)
+                self._retry_at.pop(target, None)
+                self._finish(batch)
+
+        with self._cond:
+            if not self._pending:
+                self.last_error = None
+                if os.path.getsize(self.journal_path) > 0:
+                    self._compact()
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+import perf
+
+# সব প্রসেস (Streamlit replica) একই ফোল্ডারের স্ন্যাপশট শেয়ার করবে
+SNAPSHOT_DIR = os.environ.get(
+    "SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots")
+)
+META_KEY = b"snapshot_meta"
+
+# প্রতি প্রসেসে একবারই ম্যাপ করা হবে: key -> (mtime_ns, df, meta, table)
+_mapped = {}
+_lock = threading.Lock()
+
+
+def snapshot_path(key):
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in key)
+    return os.path.join(SNAPSHOT_DIR, f"{safe}.arrow")
+
+
+def arrow_safe(df):
+    # শিটের মিক্সড কলাম (যেমন নাম্বার + খালি স্ট্রিং) Arrow এ লেখা যায় না, তাই স্ট্রিং করা
+    fixed = {}
+    for col in df.columns:
+        if df[col].dtype == object:
+            kind = pd.api.types.infer_dtype(df[col], skipna=True)
+            if kind.startswith("mixed"):
+                fixed[col] = df[col].astype(str)
+    return df.assign(**fixed) if fixed else df
+
+
+def write_snapshot(key, df, meta=None):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    meta = dict(meta or {})
+    meta.setdefault("fetched_at", time.time())
+
+    # এক record batch এ লেখা: কলাম কয়েক টুকরো হলে পড়ার সময় to_pandas প্রতিটি কলাম জোড়া লাগাতে কপি করে
+    table = pa.Table.from_pandas(arrow_safe(df), preserve_index=False).combine_chunks()
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), META_KEY: json.dumps(meta).encode()}
+    )
+
+    # আনকম্প্রেসড IPC ফাইল, যাতে রিড করার সময় memory-map করে zero-copy পড়া যায়
+    path = snapshot_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return meta
+
+
+def _map(key):
+    path = snapshot_path(key)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    with _lock:
+        cached = _mapped.get(key)
+        if cached is None or cached[0] != mtime_ns:
+            with perf.stage("snapshot_read"):
+                table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+                meta = json.loads((table.schema.metadata or {}).get(META_KEY, b"{}"))
+                df = table.to_pandas(split_blocks=True)
+            # ফাইল যতবার নতুন করে লেখা হবে ভার্সন বদলাবে (ইনডেক্স/ক্যাশের কী হিসেবে ব্যবহার হয়)
+            df.attrs["version"] = f"{key}@{mtime_ns}"
+            cached = (mtime_ns, df, meta, table)
+            _mapped[key] = cached
+    return cached
+
+
+def read_snapshot(key, max_age=None):
+    cached = _map(key)
+    if cached is None:
+        return None
+    _, df, meta, _ = cached
+    if max_age is not None and time.time() - meta.get("fetched_at", 0) > max_age:
+        return None
+    return df, meta
+
+
+# একই স্ন্যাপশটের memory-map করা Arrow টেবিল (pandas এ রূপান্তর ছাড়া) ও ফ্রেমের ভার্সন, যেমন DuckDB তে সরাসরি কুয়েরির জন্য
+def read_table(key):
+    cached = _map(key)
+    return None if cached is None else (cached[3], cached[1].attrs["version"])
+
+
+# স্ন্যাপশটের পাশে ছোট JSON ফাইল: শেষ কখন শিট চেক করা হয়েছে ইত্যাদি (পুরো স্ন্যাপশট আবার না লিখেই আপডেট করা যায়)
+def state_path(key):
+    return snapshot_path(key)[:-len(".arrow")] + ".state.json"
+
+
+def read_state(key):
+    try:
+        with open(state_path(key)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_state(key, state):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = state_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def clear_snapshots():
+    with _lock:
+        _mapped.clear()
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return
+    for name in os.listdir(SNAPSHOT_DIR):
+        if name.endswith((".arrow", ".state.json")):
+            try:
+                os.remove(os.path.join(SNAPSHOT_DIR, name))
+            except FileNotFoundError:
+                pass
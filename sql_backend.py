@@ -0,0 +1,156 @@
+import functools
+import logging
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+
+import analytics
+import perf
+import snapshot_store
+
+# Dashboard এর হিসাব কোথায় চলবে: "pandas" (ডিফল্ট) অথবা "duckdb" (মাল্টি-থ্রেড, মেমরির বাইরে স্পিল করতে পারে)
+ANALYTICS_BACKEND = os.environ.get("ANALYTICS_BACKEND", "pandas").strip().lower()
+DUCKDB_THREADS = int(os.environ.get("DUCKDB_THREADS", "0"))  # 0 = সব কোর
+DUCKDB_MEMORY_LIMIT = os.environ.get("DUCKDB_MEMORY_LIMIT", "")  # যেমন "2GB"; এর বেশি লাগলে temp ফোল্ডারে যায়
+DUCKDB_TEMP_DIR = os.environ.get(
+    "DUCKDB_TEMP_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".duckdb_tmp")
+)
+
+log = logging.getLogger("sql_backend")
+_con = None
+_lock = threading.Lock()
+
+
+def _connection():
+    global _con
+    with _lock:
+        if _con is None:
+            import duckdb  # ঐচ্ছিক ডিপেনডেন্সি, শুধু এই ব্যাকএন্ড চালু থাকলে লাগে
+            con = duckdb.connect()
+            if DUCKDB_THREADS:
+                con.execute(f"SET threads = {DUCKDB_THREADS}")
+            if DUCKDB_MEMORY_LIMIT:
+                con.execute(f"SET memory_limit = '{DUCKDB_MEMORY_LIMIT}'")
+            con.execute(f"SET temp_directory = '{DUCKDB_TEMP_DIR}'")
+            _con = con
+    # প্রতিটি থ্রেড/সেশন আলাদা cursor এ কুয়েরি চালায় (একই ডাটাবেস)
+    return _con.cursor()
+
+
+# ডিপ্লয়মেন্টে duckdb বেছে নেওয়া হয়েছে এবং ইনস্টল আছে কিনা; না থাকলে pandas এ চলে
+@functools.lru_cache(maxsize=None)
+def enabled():
+    if ANALYTICS_BACKEND != "duckdb":
+        return False
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        log.warning("ANALYTICS_BACKEND=duckdb but duckdb is not installed, using pandas")
+        return False
+    return True
+
+
+def _quote(col):
+    return '"' + col.replace('"', '""') + '"'
+
+
+# সাইডবারের গ্লোবাল ফিল্টার (analytics.filter_frame এর মতো) SQL WHERE হিসেবে
+def _where(start_date, end_date, selections):
+    clauses = ["date >= ?", "date <= ?"]
+    params = [pd.Timestamp(start_date).to_pydatetime(), pd.Timestamp(end_date).to_pydatetime()]
+    for col, value in selections.items():
+        if value != "All":
+            clauses.append(f"CAST({_quote(col)} AS VARCHAR) = ?")
+            params.append(str(value))
+    return " AND ".join(clauses), params
+
+
+# কুয়েরি কোন টেবিলে: df যে স্ন্যাপশট ফাইল(গুলো) থেকে এসেছে সেগুলোর memory-map করা Arrow টেবিল (কয়েক মাস হলে কপি ছাড়া জোড়া)
+# ফাইল এর মধ্যে নতুন করে লেখা হলে (ভার্সন না মিললে) বা টেবিল জোড়া না গেলে ফ্রেমটাই
+def _source(df, snapshot_keys):
+    tables = [snapshot_store.read_table(key) for key in snapshot_keys or []]
+    version = df.attrs.get("version") or ""
+    if not tables or any(t is None or t[1] not in version for t in tables):
+        return df
+    try:
+        return pa.concat_tables([t[0] for t in tables], promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return df
+
+
+# কুয়েরি চালিয়ে ফলাফলের কী কলামগুলো আসল ফ্রেমের টাইপে ফিরিয়ে pandas এর groupby ক্রমে সাজানো
+def _query(df, sql, params, keys, snapshot_keys=None):
+    cur = _connection()
+    try:
+        cur.register("t", _source(df, snapshot_keys))
+        with perf.stage("duckdb"):
+            out = cur.execute(sql, params).df()
+    finally:
+        cur.close()
+    for col in keys:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            out[col] = pd.Categorical(out[col], dtype=df[col].dtype)
+        else:
+            out[col] = out[col].astype(df[col].dtype)
+    return out.sort_values(keys, kind="stable").reset_index(drop=True)
+
+
+# pandas এ Int64 কলামের size() ও Int64 দেয়, তাই অর্ডার কাউন্ট একই টাইপে
+def _ticket_count(df, out, col):
+    if pd.api.types.is_extension_array_dtype(df['Ticket ID']):
+        out[col] = out[col].astype('Int64')
+    return out
+
+
+def _indicator_sums(cols):
+    sums = ["CAST(sum(CASE WHEN \"Job Type\" = 'Rework' THEN 1 ELSE 0 END) AS BIGINT) AS Rework"]
+    for col in cols:
+        product = analytics.PRODUCT_COUNT_COLS[col].replace("'", "''")
+        sums.append(f"CAST(sum(CASE WHEN CAST(Product AS VARCHAR) = '{product}' THEN 1 ELSE 0 END) AS BIGINT) AS {col}")
+    return ", ".join(sums)
+
+
+# ফিল্টার করা রো থেকে ডেইলি কিউব (analytics.build_cube এর মতো)
+# কাউন্ট ও কী হুবহু pandas এর মতো; Time/SQM এর যোগফল ভিন্ন ক্রমে হয়, তাই শেষের কয়েক বিট আলাদা হতে পারে (প্রায় 1e-12)
+def cube(df, start_date, end_date, selections, snapshot_keys=None):
+    dims = [c for c in analytics.CUBE_DIMS if c in df.columns]
+    where, params = _where(start_date, end_date, selections)
+    group = ", ".join(_quote(c) for c in dims)
+    sql = (f"SELECT {group}, count(*) AS Orders, fsum(Time) AS Time, fsum(SQM) AS SQM "
+           f"FROM t WHERE {where} GROUP BY {group}")
+    return _query(df, sql, params, dims, snapshot_keys)
+
+
+# analytics.dashboard_views এর মতো একই ডিক্ট; ভারী অংশ (পুরো ডাটা স্ক্যান) DuckDB তে, বাকিটা ছোট কিউবে
+def dashboard_views(df, start_date, end_date, selections, snapshot_keys=None):
+    cube_f = cube(df, start_date, end_date, selections, snapshot_keys)
+    return {
+        "cube": cube_f,
+        "avgs": analytics.man_day_avgs(cube_f),
+        "total": analytics.total_orders(cube_f),
+        "by_product": analytics.orders_by(cube_f, 'Product'),
+        "by_name": analytics.orders_by(cube_f, 'Name'),
+        "by_date": analytics.orders_by(cube_f, 'date'),
+        "by_shift": analytics.orders_by(cube_f, 'Shift'),
+    }
+
+
+def team_summary(df, start_date, end_date, selections, snapshot_keys=None):
+    where, params = _where(start_date, end_date, selections)
+    sql = (f'SELECT Team, Shift, count(DISTINCT Name) AS Present, count(*) AS Orders, fsum(Time) AS Time, '
+           f"{_indicator_sums(['FP', 'MRP', 'CAD', 'UA', 'VanBree'])}, fsum(SQM) AS SQM "
+           f"FROM t WHERE {where} AND Team IS NOT NULL AND Shift IS NOT NULL GROUP BY Team, Shift")
+    return _ticket_count(df, _query(df, sql, params, ['Team', 'Shift'], snapshot_keys), 'Orders')
+
+
+def artist_breakdown(df, start_date, end_date, selections, snapshot_keys=None):
+    where, params = _where(start_date, end_date, selections)
+    sql = (f'SELECT Name, Team, Shift, count(*) AS "Order", fsum(Time) AS Time, '
+           f"{_indicator_sums(['FP', 'MRP', 'UA', 'CAD', 'VanBree'])}, fsum(SQM) AS SQM, count(DISTINCT date) AS days "
+           f"FROM t WHERE {where} AND Name IS NOT NULL AND Team IS NOT NULL AND Shift IS NOT NULL "
+           f"GROUP BY Name, Team, Shift")
+    artist_brk = _ticket_count(df, _query(df, sql, params, ['Name', 'Team', 'Shift'], snapshot_keys), 'Order')
+    artist_brk['Idle'] = ((artist_brk['days'] * analytics.IDLE_MINUTES_PER_DAY) - artist_brk['Time']).clip(lower=0)
+    return artist_brk
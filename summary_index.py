@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from schema import SUMMARY_SCHEMA
+
+USER_COL = 'USER NAME ALL'
+RANK_COL = 'LIVE ORDER'
+TOP_N = 10
+
+
+def role_column(df):
+    return 'ARTIST/ QC' if 'ARTIST/ QC' in df.columns else 'ARTIST/QC'
+
+
+def _measures(df):
+    return [c for c in SUMMARY_SCHEMA["numeric"] if c in df.columns]
+
+
+# LIVE ORDER এর যোগফল অনুযায়ী সাজানো (নামের ক্রম আগে, যাতে সমান হলে আগের মতোই ক্রম থাকে)
+def _ordered(totals):
+    return totals.sort_index().sort_values(ascending=False)
+
+
+# র‍্যাঙ্ক: সাজানো ক্রমে নামের পজিশন (১ থেকে)
+def _ranks(totals):
+    order = _ordered(totals)
+    return {name: i + 1 for i, name in enumerate(order.index)}
+
+
+# সামারি লোডের সময় একবার: (ইউজার, মাস, রোল) অনুযায়ী যোগফল, লিডারবোর্ড ও মাসভিত্তিক/সব সময়ের র‍্যাঙ্ক
+def build_index(df):
+    role_col = role_column(df)
+    measures = _measures(df)
+    frame = df[[USER_COL, 'MONTH']].copy()
+    frame['ROLE'] = df[role_col].astype(str).str.strip().str.upper()
+    for col in measures:
+        frame[col] = df[col]
+
+    agg = frame.groupby([USER_COL, 'MONTH', 'ROLE'], sort=False)[measures].sum()
+    by_role_user = agg.groupby(level=['ROLE', USER_COL], sort=False)[RANK_COL].sum()
+    by_month = agg.groupby(level=['MONTH', 'ROLE', USER_COL], sort=False)[RANK_COL].sum()
+
+    roles = by_role_user.index.get_level_values('ROLE').unique()
+    top = {
+        role: _ordered(by_role_user.xs(role, level='ROLE')).head(TOP_N).reset_index()
+        for role in roles
+    }
+    names = {role: sorted(by_role_user.xs(role, level='ROLE').index.tolist()) for role in roles}
+    rank_all = {role: _ranks(by_role_user.xs(role, level='ROLE')) for role in roles}
+    rank_month = {key: _ranks(group.droplevel(['MONTH', 'ROLE']))
+                  for key, group in by_month.groupby(level=['MONTH', 'ROLE'], sort=False)}
+
+    return {
+        "by_user": {user: group.droplevel(USER_COL) for user, group in agg.groupby(level=USER_COL, sort=False)},
+        "rows": {user: np.asarray(pos, dtype=np.intp) for user, pos in df.groupby(USER_COL, sort=False).indices.items()},
+        "months": sorted(df['MONTH'].unique().tolist(), reverse=True),
+        "names": names,
+        "top": top,
+        "rank_all": rank_all,
+        "rank_month": rank_month,
+    }
+
+
+def leaderboard(index, role):
+    return index["top"].get(role, pd.DataFrame({USER_COL: [], RANK_COL: []}))
+
+
+def names_for(index, role):
+    return index["names"].get(role, [])
+
+
+# একজন ইউজারের (ঐচ্ছিকভাবে কিছু মাসের) মোট যোগফল, রোল ও র‍্যাঙ্ক; ডাটা না থাকলে None
+def lookup(index, user, months=None):
+    user_agg = index["by_user"].get(user)
+    if user_agg is None:
+        return None
+    if months:
+        user_agg = user_agg[user_agg.index.get_level_values('MONTH').isin(months)]
+        if user_agg.empty:
+            return None
+    role = user_agg.index.get_level_values('ROLE')[0]
+    # একটি মাস বেছে নিলে সেই মাসের র‍্যাঙ্ক, নাহলে সব মাস মিলিয়ে
+    ranks = index["rank_month"].get((months[0], role), {}) if months and len(months) == 1 else index["rank_all"].get(role, {})
+    return {"totals": user_agg.sum(), "role": role, "rank": ranks.get(user)}
+
+
+# Detailed Monthly Records টেবিলের জন্য ইউজারের আসল রো গুলো (শিটের ক্রমে)
+def records(index, df, user, months=None):
+    rows = df.take(index["rows"].get(user, np.array([], dtype=np.intp)))
+    if months:
+        rows = rows[rows['MONTH'].isin(months)]
+    return rows
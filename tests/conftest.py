@@ -0,0 +1,28 @@
+import pytest
+
+import data_loader
+import month_archive
+import snapshot_store
+from benchmarks import synthetic
+from benchmarks.fake_gspread import FakeClient, FakeSpreadsheet, FakeWorksheet
+
+DATA_SHEET = "test-data"
+
+
+# প্রতিটি টেস্ট নিজের খালি ফোল্ডারে স্ন্যাপশট/আর্কাইভ লেখে
+@pytest.fixture(autouse=True)
+def isolated_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_store, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(month_archive, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(snapshot_store, "_mapped", {})
+    return tmp_path
+
+
+def fake_client(values):
+    return FakeClient({DATA_SHEET: FakeSpreadsheet({"DATA": FakeWorksheet(values)})})
+
+
+@pytest.fixture
+def frame():
+    df, _, _ = data_loader.fetch_data(fake_client(synthetic.data_values(3000)), DATA_SHEET)
+    return df
@@ -0,0 +1,46 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+import exporter
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporter, "EXPORT_DIR", str(tmp_path / "exports"))
+    monkeypatch.setattr(exporter, "_files", {})
+    monkeypatch.setattr(exporter, "_locks", {})
+
+
+def sample():
+    return pd.DataFrame({"Ticket ID": [1, 2], "Name": ["A", "B"]})
+
+
+def test_same_view_reuses_the_file():
+    first = exporter.export(sample(), "team", ("v1",), "CSV")
+    assert exporter.export(sample(), "team", ("v1",), "CSV") == first
+    assert exporter.export_path("team", ("v1",), "CSV") == first
+    assert pd.read_csv(first, encoding="utf-8-sig").equals(sample())
+
+
+def test_file_names_are_random():
+    path = exporter.export(sample(), "team", ("v1",), "CSV")
+    os.remove(path)
+    again = exporter.export(sample(), "team", ("v1",), "CSV")
+    assert os.path.basename(again) != os.path.basename(path)
+    token = os.path.basename(again)[len("team-"):-len(".csv")]
+    assert len(token) >= 32
+
+
+def test_cleanup_prunes_expired_files_and_locks():
+    path = exporter.export(sample(), "team", ("v1",), "CSV")
+    assert len(exporter._locks) == 1
+    old = time.time() - exporter.EXPORT_TTL - 10
+    os.utime(path, (old, old))
+
+    exporter.export(sample(), "artist", ("v1",), "CSV")
+    assert not os.path.exists(path)
+    assert exporter.export_path("team", ("v1",), "CSV") is None
+    assert list(exporter._locks) == [("artist", "v1", "CSV")]
@@ -0,0 +1,103 @@
+import datetime
+import threading
+
+import google.auth.exceptions
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+import fetch_scheduler
+import sheets_client
+
+
+def api_error(status):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b'{"error": {"code": %d, "message": "x", "status": "x"}}' % status
+    return APIError(response)
+
+
+@pytest.mark.parametrize("error, expected", [
+    (api_error(429), True),
+    (api_error(503), True),
+    (api_error(400), False),
+    (api_error(404), False),
+    (requests.exceptions.ConnectionError(), True),
+    (requests.exceptions.ReadTimeout(), True),
+    (google.auth.exceptions.TransportError(), True),
+    (FileNotFoundError(), False),
+    (PermissionError(), False),
+    (ValueError(), False),
+])
+def test_retryable(error, expected):
+    assert fetch_scheduler._retryable(error) is expected
+
+
+def test_cost_above_burst_does_not_hang():
+    bucket = fetch_scheduler.TokenBucket(per_minute=60, burst=2)
+    done = threading.Event()
+    threading.Thread(target=lambda: (bucket.acquire(5), done.set()), daemon=True).start()
+    assert done.wait(2)
+
+
+def test_transient_errors_retry_then_give_up(monkeypatch):
+    monkeypatch.setattr(fetch_scheduler, "BASE_DELAY", 0)
+    scheduler = fetch_scheduler.FetchScheduler(max_attempts=3)
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise api_error(429)
+
+    with pytest.raises(fetch_scheduler.SheetsUnavailable):
+        scheduler.run("k", fail)
+    assert len(calls) == 3
+    assert scheduler.retries == 2
+
+
+def test_permanent_errors_are_not_retried():
+    scheduler = fetch_scheduler.FetchScheduler()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise FileNotFoundError("creds.json")
+
+    with pytest.raises(FileNotFoundError):
+        scheduler.run("k", fail)
+    assert len(calls) == 1
+
+
+class CountingBucket:
+    def __init__(self):
+        self.calls = 0
+
+    def acquire(self, cost=1):
+        self.calls += 1
+
+
+class StubSession:
+    def __init__(self, credentials):
+        pass
+
+    def request(self, method, url, **kwargs):
+        return url
+
+
+class StubCredentials:
+    token = "token"
+    expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+
+
+def test_every_sheets_read_is_charged(monkeypatch):
+    bucket = CountingBucket()
+    monkeypatch.setattr(fetch_scheduler.SCHEDULER, "bucket", bucket)
+    monkeypatch.setattr(sheets_client, "AuthorizedSession", StubSession)
+    session = sheets_client.PooledSession(StubCredentials())
+
+    for _ in range(3):
+        session.request("get", "https://sheets.googleapis.com/v4/spreadsheets/x/values:batchGet")
+    session.request("post", "https://sheets.googleapis.com/v4/spreadsheets/x/values/A1:append")
+    session.request("get", "https://www.googleapis.com/drive/v3/files/x")
+
+    assert bucket.calls == 3
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+import analytics
+import filter_index
+
+CASES = [
+    ("2026-01-01", "2026-01-31", {}),
+    ("2026-01-05", "2026-01-05", {}),
+    ("2026-01-10", "2026-01-20", {"Shift": "Night"}),
+    ("2026-01-01", "2026-01-31", {"Team": "Team 3", "Employee Type": "QC"}),
+    ("2026-01-03", "2026-01-25", {"Team": "Team 1", "Shift": "Morning", "Product": "Floorplan Queue"}),
+    ("2026-01-01", "2026-01-31", {"Team": "No such team"}),
+    ("2026-02-01", "2026-02-28", {"Shift": "All"}),
+]
+
+
+@pytest.mark.parametrize("start, end, selections", CASES)
+def test_positions_match_boolean_mask(frame, start, end, selections):
+    index = filter_index.build_index(frame)
+    selections = {col: "All" for col in filter_index.INDEX_COLS} | selections
+
+    pos = filter_index.filter_positions(index, start, end, selections)
+    expected = np.flatnonzero(frame.index.isin(analytics.filter_frame(frame, start, end, selections).index))
+
+    np.testing.assert_array_equal(pos, expected)
+
+
+def test_catalog_lists_every_value(frame):
+    catalog = filter_index.build_index(frame)["catalog"]
+    assert catalog["values"]["Team"] == sorted(frame['Team'].dropna().astype(str).unique())
+    assert catalog["date_min"] == frame['date'].min()
+    assert catalog["date_max"] == frame['date'].max()
@@ -0,0 +1,63 @@
+import pytest
+
+import data_loader
+import month_archive
+import snapshot_store
+from benchmarks import synthetic
+from benchmarks.fake_gspread import FakeClient, FakeSpreadsheet, FakeWorksheet
+
+LABEL = "December 2025"
+
+
+@pytest.fixture
+def closed_month(monkeypatch):
+    sheet_id = data_loader.DATA_SOURCES[LABEL]
+    assert month_archive.is_closed(LABEL)
+    values = [list(row) for row in synthetic.data_values(2000, month="2025-12")]
+    spreadsheet = FakeSpreadsheet({"DATA": FakeWorksheet(values)})
+    client = FakeClient({sheet_id: spreadsheet})
+    reloads = []
+    reload_data = data_loader._reload_data
+    monkeypatch.setattr(data_loader, "_reload_data", lambda *args: reloads.append(1) or reload_data(*args))
+    df = data_loader.load_data(lambda: client, sheet_id)
+    assert data_loader.is_archived(sheet_id) and len(df) > 0
+    reloads.clear()
+    return sheet_id, client, values, reloads
+
+
+def expire_check(sheet_id):
+    key = data_loader.data_key(sheet_id)
+    state = snapshot_store.read_state(key)
+    snapshot_store.write_state(key, {**state, "checked_at": state["checked_at"] - data_loader.ARCHIVE_CHECK_INTERVAL - 1})
+
+
+def test_archived_month_is_served_without_calls_between_checks(closed_month):
+    sheet_id, client, _, reloads = closed_month
+    calls = client.calls
+    data_loader.load_data(lambda: client, sheet_id)
+    assert client.calls == calls and reloads == []
+
+
+def test_unchanged_sheet_keeps_the_archive(closed_month):
+    sheet_id, client, _, reloads = closed_month
+    expire_check(sheet_id)
+    before = data_loader.load_data(lambda: client, sheet_id)
+    assert reloads == []
+    assert data_loader.load_data(lambda: client, sheet_id) is before
+
+
+def test_edited_sheet_rewrites_snapshot_and_partition(closed_month):
+    sheet_id, client, values, reloads = closed_month
+    values[5][values[0].index('Time')] = "12345"
+    client.spreadsheets[sheet_id].touch()
+
+    # চেকের সময় না হওয়া পর্যন্ত আগের ডাটা
+    assert 12345 not in data_loader.load_data(lambda: client, sheet_id)['Time'].tolist()
+    expire_check(sheet_id)
+    df = data_loader.load_data(lambda: client, sheet_id)
+
+    assert reloads == [1]
+    assert 12345 in df['Time'].tolist()
+    archived, meta = month_archive.read_month(LABEL)
+    assert 12345 in archived['Time'].tolist()
+    assert meta["modified_time"] == client.spreadsheets[sheet_id].modified_time
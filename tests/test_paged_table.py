@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import paged_table
+import schema
+
+
+def combined(first, second):
+    frames = [pd.DataFrame({"Name": pd.Categorical(names), "Time": np.arange(len(names), dtype=float)})
+              for names in (first, second)]
+    return schema.concat_all(frames, {"category": ["Name"]})
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_categorical_sort_does_not_depend_on_month_order(ascending):
+    jan, dec = ["Cara", "Abe", None], ["Bea", "Abe"]
+    one = combined(jan, dec)
+    other = combined(dec, jan)
+    assert list(one["Name"].cat.categories) != list(other["Name"].cat.categories)
+
+    sorted_one = one["Name"].take(paged_table.query_positions(one, sort_col="Name", ascending=ascending)).tolist()
+    sorted_other = other["Name"].take(paged_table.query_positions(other, sort_col="Name", ascending=ascending)).tolist()
+    expected = sorted(["Cara", "Abe", "Bea", "Abe"], reverse=not ascending) + [np.nan]
+    assert sorted_one == sorted_other == expected
+
+
+def test_search_then_sort():
+    df = pd.DataFrame({"Name": pd.Categorical(["b1", "a1", "c2", "a2"]), "Time": [1.0, 5.0, 3.0, 4.0]})
+    pos = paged_table.query_positions(df, search="2", sort_col="Name")
+    assert df["Name"].take(pos).tolist() == ["a2", "c2"]
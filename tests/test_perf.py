@@ -0,0 +1,15 @@
+import perf
+
+
+def test_second_profiler_is_refused_while_one_runs():
+    first = perf.Profiler().start()
+    assert first is not None
+    try:
+        assert perf.Profiler().start() is None
+    finally:
+        text, raw = first.stop()
+    assert "function calls" in text and raw
+
+    again = perf.Profiler().start()
+    assert again is not None
+    again.stop()
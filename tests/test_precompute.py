@@ -0,0 +1,32 @@
+import os
+
+import precompute
+import snapshot_store
+
+
+def test_results_load_for_the_same_data_version(frame):
+    frame.attrs["version"] = "data@1"
+    precompute.write_results("s", frame)
+    results = precompute.load_results("s", "data@1")
+    assert set(results) == set(precompute.TABLES)
+    assert len(results["team_sum"]) > 0
+
+
+def test_other_data_version_is_rejected(frame):
+    frame.attrs["version"] = "data@1"
+    precompute.write_results("s", frame)
+    assert precompute.load_results("s", "data@2") is None
+
+
+def test_old_result_version_is_rejected(frame, monkeypatch):
+    frame.attrs["version"] = "data@1"
+    precompute.write_results("s", frame)
+    monkeypatch.setattr(precompute, "RESULT_VERSION", precompute.RESULT_VERSION + 1)
+    assert precompute.load_results("s", "data@1") is None
+
+
+def test_missing_table_is_rejected(frame):
+    frame.attrs["version"] = "data@1"
+    precompute.write_results("s", frame)
+    os.remove(snapshot_store.snapshot_path(precompute.result_key("s", "hts")))
+    assert precompute.load_results("s", "data@1") is None
@@ -0,0 +1,30 @@
+import logging
+
+import pandas as pd
+
+import schema
+
+
+def ticket_ids(values):
+    df = pd.DataFrame({"date": ["1/2/2026"] * len(values), "Ticket ID": values})
+    return schema.apply_schema(df, schema.DATA_SCHEMA)["Ticket ID"]
+
+
+def test_whole_numbers_are_kept():
+    ids = ticket_ids(["1234", "1235.0", " 1236 "])
+    assert str(ids.dtype) == "Int64"
+    assert ids.tolist() == [1234, 1235, 1236]
+
+
+def test_fractional_and_text_ids_become_na_and_are_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="schema"):
+        ids = ticket_ids(["1234", "1234.5", "abc", ""])
+    assert ids.isna().tolist() == [False, True, True, True]
+    assert "2 row(s)" in caplog.text and "'1234.5'" in caplog.text
+
+
+def test_blank_ids_are_not_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="schema"):
+        ids = ticket_ids(["1", ""])
+    assert ids.isna().tolist() == [False, True]
+    assert caplog.text == ""
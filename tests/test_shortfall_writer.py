@@ -0,0 +1,118 @@
+import json
+import os
+import time
+
+import pytest
+
+import shortfall_writer
+from benchmarks.fake_gspread import FakeClient, FakeSpreadsheet, FakeWorksheet
+
+TARGET = "shortfall"
+
+
+@pytest.fixture
+def sheet():
+    return FakeWorksheet([["Ticket ID", "Name"]])
+
+
+@pytest.fixture
+def client(sheet):
+    return FakeClient({TARGET: FakeSpreadsheet({"Short Inprogress": sheet})})
+
+
+def writer(journal_dir, client):
+    return shortfall_writer.ShortfallWriter(lambda: client, journal_dir=str(journal_dir))
+
+
+def write_journal(path, records, age=0):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    past = time.time() - age
+    os.utime(path, (past, past))
+
+
+def add(entry_id, ticket):
+    return {"op": "add", "id": entry_id, "sheet_id": TARGET, "worksheet": "Short Inprogress",
+            "row": [ticket, "A"], "queued_at": 0}
+
+
+def test_queued_rows_are_flushed_once(tmp_path, client, sheet):
+    w = writer(tmp_path, client)
+    w.enqueue(TARGET, "Short Inprogress", [[1, "A"], [2, "B"]])
+    w.flush()
+    w.flush()
+    assert sheet.appended == [["1", "A"], ["2", "B"]]
+    assert w.pending_count() == 0 and w.last_error is None
+
+
+def test_duplicate_submit_is_suppressed(tmp_path, client, sheet):
+    w = writer(tmp_path, client)
+    first = w.enqueue(TARGET, "Short Inprogress", [[1, "A"]])
+    second = w.enqueue(TARGET, "Short Inprogress", [[1, "A"], [1, "A"], [2, "B"]])
+    assert len(first) == 1 and len(second) == 1
+    w.flush()
+    assert sheet.appended == [["1", "A"], ["2", "B"]]
+
+
+def test_stale_journal_of_a_dead_process_is_claimed(tmp_path, client, sheet):
+    stale = tmp_path / "shortfall-999999.jsonl"
+    write_journal(stale, [add("a", "1"), add("b", "2"), {"op": "done", "ids": ["a"]}, add("c", "3")],
+                  age=shortfall_writer.STALE_AFTER + 5)
+
+    w = writer(tmp_path, client)
+    assert not stale.exists()
+    assert w.pending_count() == 2
+    w.flush()
+    assert sheet.appended == [["2", "A"], ["3", "A"]]
+
+
+def test_live_journal_is_left_alone(tmp_path, client):
+    live = tmp_path / "shortfall-999999.jsonl"
+    write_journal(live, [add("a", "1")])
+    w = writer(tmp_path, client)
+    assert live.exists()
+    assert w.pending_count() == 0
+
+
+def test_crash_after_compact_does_not_duplicate(tmp_path, client, sheet):
+    # আগের প্রসেস নেওয়া ফাইল নিজের জার্নালে লিখেছে কিন্তু মোছার আগেই বন্ধ হয়েছে: একই id দুই ফাইলে
+    claimed = tmp_path / "shortfall-999999.jsonl.claimed-888888"
+    write_journal(claimed, [add("a", "1")], age=shortfall_writer.STALE_AFTER + 5)
+    write_journal(tmp_path / f"shortfall-{os.getpid()}.jsonl", [add("a", "1")])
+
+    w = writer(tmp_path, client)
+    assert not claimed.exists()
+    assert w.pending_count() == 1
+    w.flush()
+    assert sheet.appended == [["1", "A"]]
+
+
+def test_half_written_line_is_skipped(tmp_path, client, sheet):
+    path = tmp_path / f"shortfall-{os.getpid()}.jsonl"
+    write_journal(path, [add("a", "1")])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "id": "b", "sheet')
+    w = writer(tmp_path, client)
+    w.flush()
+    assert sheet.appended == [["1", "A"]]
+
+
+def test_failing_target_is_retried_then_moved_to_dead_file(tmp_path, client, monkeypatch):
+    monkeypatch.setattr(shortfall_writer, "MAX_RETRY_DELAY", 0)
+    w = writer(tmp_path, client)
+    w.enqueue(TARGET, "No such tab", [[1, "A"]])
+
+    for _ in range(1, shortfall_writer.MAX_ATTEMPTS):
+        w.flush()
+        assert w.pending_count() == 1
+        assert w.last_error.startswith("No such tab")
+    w.flush()
+
+    assert w.pending_count() == 0
+    assert w.dead_count() == 1
+    with open(w.dead_path, encoding="utf-8") as f:
+        dead = json.loads(f.readline())
+    assert dead["row"] == ["1", "A"] and dead["worksheet"] == "No such tab"
+    # নতুন প্রসেস ডেড রো আবার কিউতে নেয় না
+    assert writer(tmp_path, client).pending_count() == 0
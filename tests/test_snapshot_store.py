@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+
+import snapshot_store
+
+
+def test_round_trip_keeps_frame_and_meta(frame):
+    meta = snapshot_store.write_snapshot("data-x", frame, {"source_rows": len(frame)})
+    df, read_meta = snapshot_store.read_snapshot("data-x")
+    pd.testing.assert_frame_equal(df, frame.reset_index(drop=True))
+    assert read_meta == meta
+    assert read_meta["source_rows"] == len(frame)
+
+
+def test_missing_and_stale_snapshots_return_none(frame):
+    assert snapshot_store.read_snapshot("data-x") is None
+    snapshot_store.write_snapshot("data-x", frame, {"fetched_at": 0})
+    assert snapshot_store.read_snapshot("data-x", max_age=60) is None
+    assert snapshot_store.read_snapshot("data-x") is not None
+
+
+def test_same_file_is_mapped_once(frame):
+    snapshot_store.write_snapshot("data-x", frame)
+    first, _ = snapshot_store.read_snapshot("data-x")
+    second, _ = snapshot_store.read_snapshot("data-x")
+    assert first is second
+
+
+def test_rewrite_changes_version_and_invalidates_cache(frame):
+    snapshot_store.write_snapshot("data-x", frame)
+    old, _ = snapshot_store.read_snapshot("data-x")
+
+    snapshot_store.write_snapshot("data-x", frame.head(10))
+    path = snapshot_store.snapshot_path("data-x")
+    stat = os.stat(path)
+    # একই সেকেন্ডে দুবার লেখা হলেও mtime আলাদা রাখা, যাতে পরীক্ষাটা ফাইল সিস্টেমের রেজোলিউশনের উপর নির্ভর না করে
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    new, _ = snapshot_store.read_snapshot("data-x")
+
+    assert len(new) == 10
+    assert new.attrs["version"] != old.attrs["version"]
+    assert new.attrs["version"].startswith("data-x@")
+
+
+def test_read_table_matches_frame(frame):
+    snapshot_store.write_snapshot("data-x", frame)
+    table, version = snapshot_store.read_table("data-x")
+    assert table.num_rows == len(frame)
+    assert version == snapshot_store.read_snapshot("data-x")[0].attrs["version"]
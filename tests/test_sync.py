@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+import data_loader
+from benchmarks import synthetic
+from tests.conftest import DATA_SHEET, fake_client
+
+
+@pytest.fixture
+def sheet(monkeypatch):
+    monkeypatch.setattr(data_loader, "BLOCK_ROWS", 500)
+    values = [list(row) for row in synthetic.data_values(3000)]
+    client = fake_client(values)
+    reloads = []
+    reload_data = data_loader._reload_data
+    monkeypatch.setattr(data_loader, "_reload_data", lambda *args: reloads.append(1) or reload_data(*args))
+    data_loader.load_data(lambda: client, DATA_SHEET)
+    reloads.clear()
+    return client, values, reloads
+
+
+def load(client):
+    return data_loader.load_data(lambda: client, DATA_SHEET, sync_interval=0)
+
+
+def edit(client, values, row, value="999"):
+    values[row][values[0].index('Time')] = value
+    client.spreadsheets[DATA_SHEET].touch()
+
+
+def assert_matches_sheet(df, client):
+    full, _, _ = data_loader.fetch_data(client, DATA_SHEET)
+    pd.testing.assert_frame_equal(df.reset_index(drop=True).astype(str), full.reset_index(drop=True).astype(str))
+
+
+def test_append_only_is_synced_without_reload(sheet):
+    client, values, reloads = sheet
+    values.extend(list(row) for row in synthetic.data_values(300, seed=9)[1:])
+    client.spreadsheets[DATA_SHEET].touch()
+
+    df = load(client)
+    assert reloads == []
+    assert len(df) == len(values) - 1 - sum(1 for row in values[1:] if not row[0])
+    assert_matches_sheet(df, client)
+
+
+def test_unchanged_sheet_is_not_fetched(sheet):
+    client, values, reloads = sheet
+    before = load(client)
+    calls = []
+    worksheet = client.spreadsheets[DATA_SHEET].worksheet("DATA")
+    worksheet.batch_get = lambda ranges: calls.append(ranges)
+    assert load(client) is before
+    assert calls == [] and reloads == []
+
+
+def test_tail_edit_reloads(sheet):
+    client, values, reloads = sheet
+    edit(client, values, len(values) - 5)
+
+    df = load(client)
+    assert reloads == [1]
+    assert_matches_sheet(df, client)
+
+
+def test_earlier_edit_is_found_by_the_block_check(sheet):
+    client, values, reloads = sheet
+    blocks = (len(values) - 1) // data_loader.BLOCK_ROWS
+    edit(client, values, 1 + 3 * data_loader.BLOCK_ROWS + 10)  # চতুর্থ ব্লকের ভেতরে
+
+    # শিট আর না বদলালেও পরের সিঙ্কগুলোতে বাকি ব্লক দেখা চলতে থাকে
+    for _ in range(blocks):
+        df = load(client)
+        if reloads:
+            break
+    assert reloads == [1]
+    assert_matches_sheet(df, client)
+
+
+def test_sweep_stops_once_every_block_is_verified(sheet):
+    client, values, reloads = sheet
+    client.spreadsheets[DATA_SHEET].touch()
+    blocks = (len(values) - 1) // data_loader.BLOCK_ROWS
+    for _ in range(blocks):
+        load(client)
+    assert data_loader.snapshot_store.read_state(data_loader.data_key(DATA_SHEET))["unverified"] == 0
+    assert reloads == []
+
+
+def test_row_deletion_reloads(sheet):
+    client, values, reloads = sheet
+    del values[100]
+    client.spreadsheets[DATA_SHEET].touch()
+
+    df = load(client)
+    assert reloads == [1]
+    assert_matches_sheet(df, client)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import tracking_rules
+
+
+# app.py তে আগে হাতে লেখা মাস্ক, নিয়মের টেবিল থেকে একই ফলাফল আসতে হবে
+def old_flags(df):
+    qc = df['Employee Type'] == 'QC'
+    artist = df['Employee Type'] == 'Artist'
+    floorplan = df['Product'] == 'Floorplan Queue'
+    measurement = df['Product'] == 'Measurement Queue'
+    time = df['Time']
+    sip = (qc & (time < 2)) | (artist & ((floorplan & (time <= 15)) | (measurement & (time < 5))))
+    smt = (qc & (time > 20)) | (artist & ((floorplan & (time >= 150)) | (measurement & (time > 40))))
+    hts = (time > (df['SQM'] + 15)) & ~smt
+    return {"sip": sip, "smt": smt, "hts": hts}
+
+
+def test_evaluate_matches_old_masks(frame):
+    flags = tracking_rules.evaluate(frame)
+    for flag, expected in old_flags(frame).items():
+        np.testing.assert_array_equal(flags[flag], expected.fillna(False).to_numpy(dtype=bool), err_msg=flag)
+
+
+@pytest.mark.parametrize("employee, product, time, expected", [
+    ("QC", "Floorplan Queue", 1.9, "sip"),
+    ("QC", "Measurement Queue", 2.0, None),
+    ("QC", "Floorplan Queue", 20.5, "smt"),
+    ("Artist", "Floorplan Queue", 15.0, "sip"),
+    ("Artist", "Floorplan Queue", 150.0, "smt"),
+    ("Artist", "Measurement Queue", 4.9, "sip"),
+    ("Artist", "Measurement Queue", 40.0, "hts"),
+    ("Artist", "Other Queue", 1.0, None),
+])
+def test_boundaries(employee, product, time, expected):
+    df = pd.DataFrame({'Employee Type': [employee], 'Product': [product], 'Time': [time], 'SQM': [10.0]})
+    flags = tracking_rules.evaluate(df)
+    assert [flag for flag in tracking_rules.TRACKING_FLAGS if flags[flag][0]] == ([expected] if expected else [])
+
+
+def test_missing_values_are_never_flagged():
+    df = pd.DataFrame({'Employee Type': [None, "QC"], 'Product': ["Floorplan Queue", None],
+                       'Time': [1.0, np.nan], 'SQM': [np.nan, 0.0]})
+    flags = tracking_rules.evaluate(df)
+    assert not any(flags[flag].any() for flag in tracking_rules.TRACKING_FLAGS)
+
+
+def test_ticket_index_skips_missing_ids():
+    frame = pd.DataFrame({'Ticket ID': pd.array([7, None, 8, 7], dtype="Int64"), 'Name': ["a", "b", "c", "d"]})
+    index = tracking_rules.TicketIndex(frame)
+    assert index.ticket_ids == [7, 8]
+    assert pd.NA not in index
+    assert index.row(7)['Name'] == "a"
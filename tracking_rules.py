@@ -0,0 +1,98 @@
+import operator
+
+import numpy as np
+import pandas as pd
+
+import analytics
+
+# Tracking System এর থ্রেশহোল্ড: নতুন নিয়ম লাগলে শুধু এখানে একটি রো যোগ করলেই হবে
+# employee/product None মানে সব; over থাকলে সীমা = সেই কলাম + limit (যেমন Time > SQM + 15)
+TRACKING_RULES = [
+    {"flag": "sip", "employee": "QC", "product": None, "op": "<", "limit": 2},
+    {"flag": "sip", "employee": "Artist", "product": "Floorplan Queue", "op": "<=", "limit": 15},
+    {"flag": "sip", "employee": "Artist", "product": "Measurement Queue", "op": "<", "limit": 5},
+    {"flag": "smt", "employee": "QC", "product": None, "op": ">", "limit": 20},
+    {"flag": "smt", "employee": "Artist", "product": "Floorplan Queue", "op": ">=", "limit": 150},
+    {"flag": "smt", "employee": "Artist", "product": "Measurement Queue", "op": ">", "limit": 40},
+    {"flag": "hts", "employee": None, "product": None, "op": ">", "limit": 15, "over": "SQM"},
+]
+# যে ফ্ল্যাগ আগে থেকেই অন্য লিস্টে আছে সেটা আবার দেখানো হবে না
+TRACKING_EXCLUDE = {"hts": ["smt"]}
+TRACKING_FLAGS = ["sip", "smt", "hts"]
+
+_OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+# একই ঘরে একাধিক নিয়ম হলে যেটা বেশি রো ধরে সেটাই থাকে
+_LOOSEST = {"<": np.fmax, "<=": np.fmax, ">": np.fmin, ">=": np.fmin}
+
+
+def _codes(col):
+    cat = col.astype('category')
+    codes = cat.cat.codes.to_numpy().astype(np.intp)
+    categories = list(cat.cat.categories)
+    # কোড -1 (খালি) শেষের অতিরিক্ত ঘরে যায়, যেখানে কোনো নিয়ম নেই
+    return np.where(codes < 0, len(categories), codes), categories
+
+
+# নিয়মগুলোকে (Employee Type x Product) লুকআপ টেবিলে রূপান্তর: (flag, op, over) প্রতি একটি টেবিল
+def compile_rules(rules, employees, products):
+    tables = {}
+    for rule in rules:
+        shape = (len(employees) + 1, len(products) + 1)
+        table = tables.setdefault((rule["flag"], rule["op"], rule.get("over")), np.full(shape, np.nan))
+        emp = slice(0, len(employees)) if rule["employee"] is None else (
+            employees.index(rule["employee"]) if rule["employee"] in employees else None)
+        prod = slice(0, len(products)) if rule["product"] is None else (
+            products.index(rule["product"]) if rule["product"] in products else None)
+        if emp is None or prod is None:
+            continue  # এই ডাটায় ওই Employee Type/Product নেই
+        table[emp, prod] = _LOOSEST[rule["op"]](table[emp, prod], rule["limit"])
+    return tables
+
+
+# সব ফ্ল্যাগ এক পাসে: প্রতি রো এর থ্রেশহোল্ড লুকআপ টেবিল থেকে নিয়ে একবারে তুলনা
+def evaluate(df, rules=TRACKING_RULES, exclude=TRACKING_EXCLUDE):
+    emp_codes, employees = _codes(df['Employee Type'])
+    prod_codes, products = _codes(df['Product'])
+    time = df['Time'].to_numpy(dtype=float)
+
+    flags = {rule["flag"]: np.zeros(len(df), dtype=bool) for rule in rules}
+    for (flag, op, over), table in compile_rules(rules, employees, products).items():
+        limit = table[emp_codes, prod_codes]
+        if over is not None:
+            limit = limit + df[over].to_numpy(dtype=float)
+        flags[flag] |= _OPS[op](time, limit)  # NaN সীমা (নিয়ম নেই) সবসময় False
+
+    for flag, others in exclude.items():
+        for other in others:
+            flags[flag] &= ~flags[other]
+    return flags
+
+
+# Ticket ID -> রো পজিশন (হ্যাশ), তাই সাবমিটের সময় বা ডিফল্ট সিলেকশনে লিস্ট স্ক্যান লাগে না
+# খালি/ভুল আইডি (NA) বাদ, সেগুলো ফর্মে সিলেক্ট বা শিটে রিপোর্ট করা যায় না
+class TicketIndex:
+    def __init__(self, frame):
+        self.frame = frame
+        self._pos = {}
+        for pos, ticket_id in enumerate(frame['Ticket ID'].tolist()):
+            if not pd.isna(ticket_id):
+                self._pos.setdefault(ticket_id, pos)
+        self.ticket_ids = list(self._pos)
+
+    def __contains__(self, ticket_id):
+        return ticket_id in self._pos
+
+    def row(self, ticket_id):
+        return self.frame.iloc[self._pos[ticket_id]]
+
+
+# ফিল্টার করা রো পজিশনের (rows) জন্য তিনটি লিস্ট, ফ্ল্যাগ গুলো ডাটা ভার্সন প্রতি একবারই হিসাব হয়
+def tracking_lists(df_raw, flags, rows):
+    lists = {}
+    for flag in TRACKING_FLAGS:
+        pos = rows[flags[flag][rows]]
+        frame = df_raw.take(pos)
+        frame = frame.assign(**{'RT Link': frame['Ticket ID'].map(analytics.rt_link)})
+        lists[flag] = frame
+    lists["index"] = {flag: TicketIndex(lists[flag]) for flag in TRACKING_FLAGS}
+    return lists
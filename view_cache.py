@@ -0,0 +1,52 @@
+import os
+import threading
+from collections import OrderedDict
+
+VIEW_CACHE_SIZE = int(os.environ.get("VIEW_CACHE_SIZE", "64"))
+
+
+# একই ফিল্টার কম্বিনেশন (যেমন "এই মাস, Team X, Night") সব ইউজারের জন্য একবারই হিসাব হবে
+class ViewCache:
+    def __init__(self, max_entries=VIEW_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, name, key, builder):
+        full_key = (name,) + tuple(key)
+        with self._lock:
+            if full_key in self._items:
+                self._items.move_to_end(full_key)
+                self.hits += 1
+                return self._items[full_key]
+            self.misses += 1
+
+        value = builder()
+        with self._lock:
+            self._items[full_key] = value
+            self._items.move_to_end(full_key)
+            # সবচেয়ে পুরনো ব্যবহৃত (LRU) এন্ট্রি বাদ দেওয়া
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return value
+
+    # কোনো শিটের (ভার্সনে token আছে এমন) সব ভিউ বাদ দেওয়া, অন্য শিটের ভিউ থেকে যায়
+    def invalidate(self, token):
+        with self._lock:
+            for full_key in [k for k in self._items if len(k) > 1 and token in str(k[1])]:
+                del self._items[full_key]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+# ফিল্টার সিলেকশনকে একটি স্থির tuple এ রূপান্তর (ক্যাশ কী হিসেবে)
+def normalize_filters(start_date, end_date, selections):
+    return (str(start_date), str(end_date)) + tuple(sorted((k, str(v)) for k, v in selections.items()))
+
+
+def view_key(version, start_date, end_date, selections):
+    return (version,) + normalize_filters(start_date, end_date, selections)